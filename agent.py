@@ -0,0 +1,371 @@
+from pellets import PELLET, POWER, INF
+from weights import DEFAULT_WEIGHTS
+
+# Bu sayıya kadar hayalette düz döngü daha hızlı; fazlasında game.ghost_index
+# (spatial.SpatialHash) ile yakından uzağa arama
+INDEX_MIN_GHOSTS = 24
+
+
+def nearest_ghosts(test_col, test_row, ghost_index, distances, power_mode, weights):
+    """
+    position_utility'nin en yakın tehlikeli / frightened hayalet mesafeleri, indeksle.
+    Kova halkaları yakından uzağa geziliyor; halkanın alt sınırı bulunan en iyi
+    mesafeyi geçince duruluyor (labirent mesafesi >= Manhattan). Skor döngüyle aynı:
+    NORMAL modda frightened mesafesi kullanılmıyor, POWER modda ikisi de sadece
+    yarıçaplarla karşılaştırılıyor, o yüzden yarıçap dışına bakmaya gerek yok.
+    """
+    if power_mode:
+        danger_limit = weights.power_danger_radius
+        fright_limit = weights.fright_radius
+    else:
+        danger_limit = 9999
+        fright_limit = 0
+
+    nearest_danger = nearest_fright = 9999
+    tiles = ghost_index.tiles
+    entities = ghost_index.entities
+    for bound, handles in ghost_index.rings(test_col, test_row):
+        if ((bound >= nearest_danger or bound >= danger_limit)
+                and (bound >= nearest_fright or bound >= fright_limit)):
+            break
+        for h in handles:
+            ghost_col, ghost_row = tiles[h]
+            dist = None
+            if distances is not None:
+                dist = distances.dist(ghost_col, ghost_row, test_col, test_row)
+            if dist is None:
+                dist = abs(ghost_col - test_col) + abs(ghost_row - test_row)
+            if entities[h].state == "frightened":
+                if dist < nearest_fright:
+                    nearest_fright = dist
+            elif dist < nearest_danger:
+                nearest_danger = dist
+    return nearest_danger, nearest_fright
+
+
+def position_utility(test_col, test_row, ghost_tiles, power_mode,
+                     pellet_field, power_field, distances=None, weights=DEFAULT_WEIGHTS,
+                     ghost_index=None):
+    """
+    Bir tile'da durmanın faydası: hayalet mesafeleri + en yakın yem / power.
+    ghost_tiles: [(col, row, frightened), ...]
+    weights: weights.WeightProfile (varsayılan: orijinal sabitler)
+    ghost_index: aynı hayaletlerin spatial.SpatialHash'i; çok hayalette onunla aranıyor
+    agent_choose_direction her aday yön için bunu kullanıyor, arama agent'ı
+    (search_agent.py) da yaprak değerlendirmesi olarak.
+    """
+    score = 0.0
+
+    # 1) Hayalet mesafeleri
+    nearest_danger = 9999  # normal (tehlikeli) hayaletler
+    nearest_fright = 9999  # frightened (yenebilir) hayaletler
+
+    if ghost_index is not None and len(ghost_tiles) > INDEX_MIN_GHOSTS:
+        nearest_danger, nearest_fright = nearest_ghosts(test_col, test_row, ghost_index,
+                                                        distances, power_mode, weights)
+    else:
+        for ghost_col, ghost_row, frightened in ghost_tiles:
+            dist = None
+            if distances is not None:
+                dist = distances.dist(ghost_col, ghost_row, test_col, test_row)
+            if dist is None:
+                dist = abs(ghost_col - test_col) + abs(ghost_row - test_row)
+
+            if frightened:
+                if dist < nearest_fright:
+                    nearest_fright = dist
+            else:
+                if dist < nearest_danger:
+                    nearest_danger = dist
+
+    if nearest_danger == 9999:
+        nearest_danger = 9999.0
+    if nearest_fright == 9999:
+        nearest_fright = 9999.0
+
+    w = weights
+
+    # 1.a) NORMAL mod: hayatta kalma + kaçış
+    if not power_mode:
+        # Hayalet 10 tile'dan yakınsa agresif kaç
+        if nearest_danger < w.danger_radius:
+            # Uzaklık azaldıkça ceza çok büyür
+            score -= w.danger / (nearest_danger + 0.1)
+        # Genel olarak hayaletten uzak olmak iyi, ama aşırı da abartmıyoruz
+        score += nearest_danger * w.ghost_distance
+
+
+    # 1.b) POWER mod: hayalet yeme İKİNCİ planda
+    else:
+        # Sadece çok yakın frightened hayalet varsa bonus ver
+        # (yolun üstündeyse / yakınsa ye, yoksa yemlere odaklan)
+        if nearest_fright < w.fright_radius:
+            score += w.fright / (nearest_fright + 0.1)
+
+        # POWER modda bile çok tehlikeli pozisyonlardan kaçın
+        if nearest_danger < w.power_danger_radius:
+            score -= w.power_danger / (nearest_danger + 0.1)
+
+    # 2) Yem & power pellet utility
+    #    Asıl amaç: tüm pellet'leri hızlı bir şekilde bitirmek
+    # Her durumda pellet toplamak ana hedef:
+    pellet_weight = w.pellet if not power_mode else w.pellet_power_mode
+
+    # Power pellet:
+    # - NORMAL modda: yüksek öncelik (kaçış/saldırı avantajı)
+    # - POWER modda: neredeyse önemsiz (süre zaten çalışıyor)
+    power_weight = w.power if not power_mode else w.power_power_mode
+
+    # En yakın pellet'e göre puan
+    # (labirent mesafesi, yem yendikçe kendini onaran alan → O(1))
+    pellet_dist = pellet_field.dist(test_col, test_row)
+    if pellet_dist != INF:
+        if pellet_dist < 1:
+            pellet_dist = 1
+        score += pellet_weight / pellet_dist
+
+    # En yakın power pellet'e göre puan
+    power_dist = power_field.dist(test_col, test_row)
+    if power_dist != INF:
+        if power_dist < 1:
+            power_dist = 1
+        score += power_weight / power_dist
+
+    return score
+
+
+class LoopHistory:
+    """
+    Son size tile'ı tutan sabit boyutlu halka (loop cezası için).
+    push(tile) en eskisinin yerine yazıyor; `tile in history` sayaç sözlüğünden O(1).
+    """
+
+    __slots__ = ("size", "ring", "pos", "counts")
+
+    def __init__(self, size):
+        self.size = size
+        self.ring = [None] * size
+        self.pos = 0
+        self.counts = {}
+
+    def push(self, tile):
+        counts = self.counts
+        old = self.ring[self.pos]
+        if old is not None:
+            if counts[old] == 1:
+                del counts[old]
+            else:
+                counts[old] -= 1
+        self.ring[self.pos] = tile
+        self.pos = (self.pos + 1) % self.size
+        counts[tile] = counts.get(tile, 0) + 1
+
+    @property
+    def last(self):
+        return self.ring[self.pos - 1]
+
+    def __contains__(self, tile):
+        return tile in self.counts
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+
+class AgentMemory:
+    """
+    Agent'ın Pac-Man başına hafızası (pacman.agent_memory).
+    history: girilen son tile'lar (LoopHistory)
+    key / decision: son kararın durum imzası ve kararın kendisi; imza
+    değişmediği sürece aynı karar tekrar hesaplanmadan kullanılıyor
+    """
+
+    __slots__ = ("history", "key", "decision")
+
+    def __init__(self, history_size):
+        self.history = LoopHistory(history_size)
+        self.key = None
+        self.decision = None
+
+
+def utility_agent(game):
+    #GameState için agent arayüzü: game → (dx, dy)
+    return agent_choose_direction(game.pacman, game.ghosts, game.distances,
+                                  ghost_index=game.ghost_index)
+
+
+def make_utility_agent(weights):
+    #Belirli bir ağırlık profiliyle oynayan utility agent
+    def agent(game):
+        return agent_choose_direction(game.pacman, game.ghosts, game.distances, weights,
+                                      game.ghost_index)
+    return agent
+
+
+# Utility-based Agent
+def agent_choose_direction(pacman, ghosts, distances=None, weights=DEFAULT_WEIGHTS,
+                           ghost_index=None):
+    """
+    Utility-temelli yön seçimi:
+    ANA HEDEFLER:
+    1) Her zaman ÖNCE hayatta kal (NORMAL + POWER modda)
+    2) En kısa ve mantıklı yollardan pellet'leri yiyip oyunu bitirmeye çalış
+    3) Power pellet varsa ve güvenliyse ona yönel
+    4) POWER modda ise hayaletleri yeme eğilimi (yakındaysa + güvenliyse yenir)
+    Ekstra:
+    - Boş ve uzun koridorlara girip zaman kaybetme eğilimini azaltır
+    - Loop history ile aynı bölgede dönüp durmayı azaltır
+    distances: maze_distance.MazeDistances verilirse hayalet mesafesi
+               duvarların etrafından dolaşan gerçek yol uzunluğu olur (yoksa Manhattan)
+    weights: weights.WeightProfile; tüm sabitler buradan (optimize.py ile ayarlanıyor)
+    ghost_index: hayaletlerin güncel spatial.SpatialHash'i (game.ghost_index); çok
+                 hayalette en yakın hayalet araması komşulukla sınırlı kalıyor
+    """
+    w = weights
+
+    grid = pacman.grid
+    tile_size = pacman.tile_size
+    hud_height = pacman.hud_height
+    grid_height = len(grid)
+    grid_width = len(grid[0])
+
+    # Pac-Man'in merkez koordinatları (piksel cinsinden)
+    px = pacman.x + pacman.size / 2
+    py = pacman.y + pacman.size / 2
+
+    # Grid (satır/sütun) koordinatı
+    col = int(px // tile_size)
+    row = int((py - hud_height) // tile_size)
+
+    cur_dx, cur_dy = pacman.dir_x, pacman.dir_y
+    cur_dir = (cur_dx, cur_dy)
+    reverse_dir = (-cur_dx, -cur_dy)
+
+    # Ekran dışı durum
+    if not (0 <= row < grid_height and 0 <= col < grid_width):
+        return cur_dir
+
+    # LOOP HISTORY (dönüp durmayı engellemek için)
+    memory = getattr(pacman, "agent_memory", None)
+    if memory is None or memory.history.size != w.loop_history:
+        memory = pacman.agent_memory = AgentMemory(w.loop_history)
+    history = memory.history
+
+    # Son girilen tile'ları saklıyoruz (loop'ları görebilmesi icin); sadece yeni tile'a girişte.
+    # Eskiden her frame ekleniyordu (20 frame = 40 px ≈ 1.7 tile); sadece komşu tile'lar
+    # sorulduğu için varsayılan 3 tile da aynı kararları veriyor
+    if history.last != (col, row):
+        history.push((col, row))
+
+    # Tile merkezine çok uzaksa, önce merkeze yaklaş (yumuşak bir kilit)
+    center_x = col * tile_size + tile_size / 2
+    center_y = hud_height + row * tile_size + tile_size / 2
+    dist_to_center = ((px - center_x) ** 2 + (py - center_y) ** 2) ** 0.5
+    if dist_to_center > 3 and cur_dir != (0, 0):
+        # Şu anki yön fena değil, merkezlenme bitmeden yön değiştirme
+        return cur_dir
+
+    # Hayaletlerin bulunduğu tile'lar (her aday yön için aynı)
+    ghost_tiles = []
+    for g in ghosts:
+        gx = g.x + g.size / 2
+        gy = g.y + g.size / 2
+        ghost_tiles.append((int(gx // tile_size), int((gy - hud_height) // tile_size),
+                            g.state == "frightened"))
+
+    # Karar hafızası: tile merkezinde birkaç frame geçiyor; bu arada Pac-Man'in tile'ı,
+    # yönü, hayaletlerin tile / durumu, power modu ve yemler (indeks sürümü) aynıysa
+    # sonuç da aynı → tekrar hesaplama (loop history de sadece tile değişince değişiyor)
+    index = pacman.pellet_index
+    key = (col, row, cur_dir, tuple(ghost_tiles), pacman.power_mode, index.version, w)
+    if key == memory.key:
+        return memory.decision
+
+    # Olası yönler ve legal yönler
+    all_dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+    legal_dirs = []
+
+    for dx, dy in all_dirs:
+        test_col = col + dx
+        test_row = row + dy
+
+        # Grid sınırı
+        if not (0 <= test_row < grid_height and 0 <= test_col < grid_width):
+            continue
+        # Duvarsa geçersiz
+        if grid[test_row][test_col] == '#':
+            continue
+        # Pac-Man fiziksel olarak o yöne adım atabiliyor mu kontrol ediyoruz
+        if not pacman.can_move(dx, dy):
+            continue
+
+        legal_dirs.append((dx, dy))
+
+    if not legal_dirs:
+        # Hiçbir yere gidemiyorsa şu anki yönü koru
+        memory.key, memory.decision = key, cur_dir
+        return cur_dir
+
+    # 180° ani geri dönüşleri mümkünse engelliyoruz aynı yönü gidip gelmemesi icin
+    candidate_dirs = [d for d in legal_dirs if d != reverse_dir]
+    if not candidate_dirs:
+        candidate_dirs = legal_dirs
+
+    best_dir = candidate_dirs[0]
+    best_score = -1e9
+
+    # Haritadaki pellet & power pellet'ler: en yakın yeme mesafe alanları
+    pellet_field = index.field(PELLET)
+    power_field = index.field(POWER)
+
+    # Yardımcı: bir yönde ileriye bakıp
+    #           kaç adım içinde kaç yem/power var?
+    def pellets_ahead(start_c, start_r, dx, dy, steps=6):
+        p_count = 0
+        pow_count = 0
+        c, r = start_c, start_r
+        for _ in range(steps):
+            c += dx
+            r += dy
+            if not (0 <= r < grid_height and 0 <= c < grid_width):
+                break
+            if grid[r][c] == '#':
+                break
+            if grid[r][c] == '.':
+                p_count += 1
+            elif grid[r][c] == 'o':
+                pow_count += 1
+        return p_count, pow_count
+
+    # Her aday yönde utility fayda hesabı
+    for dx, dy in candidate_dirs:
+        test_col = col + dx
+        test_row = row + dy
+
+        # 1) Hayalet mesafeleri + 2) yem & power pellet utility
+        score = position_utility(test_col, test_row, ghost_tiles, pacman.power_mode,
+                                 pellet_field, power_field, distances, w, ghost_index)
+
+        # 3) Koridor boşluğu (tamamen boş yollardan kaçınma)
+        p_ahead, pow_ahead = pellets_ahead(col, row, dx, dy, steps=w.lookahead_steps)
+
+        # İleride hiç yem yok, power da yoksa → zaman kaybı gibi davran
+        if p_ahead == 0 and pow_ahead == 0:
+            score -= w.empty_corridor
+
+        # 4) Aynı yönde devam etme bonusu
+        #    (gereksiz zigzag'ları azaltır)
+        if (dx, dy) == cur_dir:
+            score += w.same_dir
+
+        # 5) LOOP CEZASI (aynı bölgede
+        #    dönüp durmayı azaltmak için)
+        if (test_col, test_row) in history:
+            score -= w.loop
+
+        # En iyi yönü güncelle
+        if score > best_score:
+            best_score = score
+            best_dir = (dx, dy)
+
+    memory.key, memory.decision = key, best_dir
+    return best_dir
@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+
+import pygame
+
+# Sprite ön işleme hattı.
+# Kaynak PNG'lerden tile boyutuna göre hazır (blit'e hazır) sprite'lar üretip
+# .cache/assets/ altına kaydediyoruz. Anahtar: kaynak dosyanın hash'i +
+# tile boyutu + işlem parametreleri. Sonraki açılışlarda direkt yükleniyor.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "assets")
+
+PACMAN_SPRITE = "assets/pacman_right.png"
+GHOST_SPRITE = "assets/ghost.png"
+
+PIPELINE_VERSION = 1   # işlem kodu değişirse artır → eski cache kullanılmaz
+
+# Son yüklemelerin cache istatistiği (başlangıç raporu için)
+stats = {"hits": 0, "misses": 0}
+
+
+def _cache_base(kind, source, tile_size, params):
+    with open(source, "rb") as f:
+        h = hashlib.sha1(f.read())
+    meta = {"kind": kind, "tile_size": tile_size, "params": params, "v": PIPELINE_VERSION}
+    h.update(json.dumps(meta, sort_keys=True).encode("utf-8"))
+    return os.path.join(CACHE_DIR, f"{kind}_{tile_size}_{h.hexdigest()[:16]}")
+
+
+def _load(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        return pygame.image.load(path).convert_alpha()
+    except pygame.error:
+        return None   # bozuk dosya → yeniden üret
+
+
+def _save(surface, path):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.png"
+        pygame.image.save(surface, tmp)
+        os.replace(tmp, path)
+    except (OSError, pygame.error):
+        pass  # cache yazılamazsa sadece bir dahakine yine üretiriz
+
+
+def load_pacman_images(tile_size, source=PACMAN_SPRITE):
+    """
+    Pac-Man'in dört yön sprite'ı: ölçekle + çevir / döndür.
+    {"RIGHT": ..., "LEFT": ..., "UP": ..., "DOWN": ...}
+    """
+    size = tile_size - 4
+    base = _cache_base("pacman", source, tile_size, {"size": size, "scale": "scale"})
+    names = ("RIGHT", "LEFT", "UP", "DOWN")
+
+    images = {name: _load(f"{base}_{name}.png") for name in names}
+    if all(img is not None for img in images.values()):
+        stats["hits"] += 1
+        return images
+
+    stats["misses"] += 1
+    base_img = pygame.image.load(source).convert_alpha()
+    base_img = pygame.transform.scale(base_img, (size, size))
+    images = {
+        "RIGHT": base_img,
+        "LEFT": pygame.transform.flip(base_img, True, False),
+        "UP": pygame.transform.rotate(base_img, 90),
+        "DOWN": pygame.transform.rotate(base_img, -90),
+    }
+    for name, img in images.items():
+        _save(img, f"{base}_{name}.png")
+    return images
+
+
+def load_ghost_sprite(tile_size, source=GHOST_SPRITE, white_threshold=230):
+    """
+    Ghost base sprite'ı: beyaz arka planı şeffaf yap + tile boyutuna smoothscale.
+    Renklendirme (tint) ghost.py'de, bu sadece ortak taban.
+    """
+    size = tile_size - 4
+    path = _cache_base("ghost", source, tile_size,
+                       {"size": size, "white_threshold": white_threshold,
+                        "scale": "smoothscale"}) + ".png"
+
+    img = _load(path)
+    if img is not None:
+        stats["hits"] += 1
+        return img
+
+    stats["misses"] += 1
+    gimg = pygame.image.load(source).convert_alpha()
+
+    # PNG'nin arka planını şeffaf yapıyoruz (r, g, b hepsi eşikten büyükse alpha = 0)
+    rgb = pygame.surfarray.pixels3d(gimg)
+    white = (rgb > white_threshold).all(axis=2)
+    del rgb
+    alpha = pygame.surfarray.pixels_alpha(gimg)
+    alpha[white] = 0
+    del alpha   # surface kilidini bırak
+
+    # Labirentteki tile boyutuna göre ölçekle
+    gimg = pygame.transform.smoothscale(gimg, (size, size))
+    _save(gimg, path)
+    return gimg
@@ -0,0 +1,62 @@
+import time
+
+import pygame
+from pygame import mixer
+
+from events import PelletEaten, PowerStarted, GhostEaten, PacmanDied
+
+# Ses katmanı: event bus'a abone olarak çalışıyor.
+# Mixer sadece bu sınıf oluşturulunca açılıyor; ekransız / toplu
+# simülasyonlar hiç ses cihazına dokunmuyor.
+
+SOUND_DIR = "assets/sounds"
+
+# Chomp her yemde baştan başlamasın; bu aralıktan sık gelenler birleştiriliyor
+CHOMP_MIN_INTERVAL = 0.15
+
+
+class Audio:
+    def __init__(self, sound_dir=SOUND_DIR):
+        self.enabled = False
+        self._last_chomp = 0.0
+        try:
+            if not mixer.get_init():
+                mixer.init()
+
+            # SES DOSYALARI
+            self.chomp_sound     = mixer.Sound(f"{sound_dir}/chomp.wav")       # küçük nokta
+            self.power_sound     = mixer.Sound(f"{sound_dir}/power.wav")       # büyük nokta
+            self.eat_ghost_sound = mixer.Sound(f"{sound_dir}/eat_ghost.wav")   # hayalet yeme
+            self.death_sound     = mixer.Sound(f"{sound_dir}/death.wav")       # ölüm
+            self.start_sound     = mixer.Sound(f"{sound_dir}/start.wav")       # yeni oyun
+        except (pygame.error, FileNotFoundError) as e:
+            print("Ses açılamadı, sessiz devam ediliyor:", e)
+            return
+
+        # Ses seviyeleri
+        self.chomp_sound.set_volume(0.4)
+        self.power_sound.set_volume(0.5)
+        self.eat_ghost_sound.set_volume(0.7)
+        self.death_sound.set_volume(0.7)
+        self.start_sound.set_volume(0.6)
+        self.enabled = True
+
+    def attach(self, bus):
+        #Oyunun event bus'ına abone ol (ses kapalıysa hiç abone olmuyoruz)
+        if not self.enabled:
+            return
+        bus.subscribe(PelletEaten, self.on_pellet)
+        bus.subscribe(PowerStarted, lambda ev: self.power_sound.play())
+        bus.subscribe(GhostEaten, lambda ev: self.eat_ghost_sound.play())
+        bus.subscribe(PacmanDied, lambda ev: self.death_sound.play())
+
+    def on_pellet(self, ev):
+        now = time.perf_counter()
+        if now - self._last_chomp < CHOMP_MIN_INTERVAL:
+            return
+        self._last_chomp = now
+        self.chomp_sound.play()
+
+    def play_start(self):
+        if self.enabled:
+            self.start_sound.play()
@@ -0,0 +1,480 @@
+import numpy as np
+from game import LEVEL_MAP, TILE_SIZE, HUD_HEIGHT, POWER_DURATION, as_level
+from maze_distance import get_maze_distances, UNREACHABLE
+from weights import DEFAULT_WEIGHTS
+
+# N tane bağımsız oyunu aynı anda (lockstep) ilerleten NumPy simülatörü.
+# Kurallar pacman.py / ghost.py / game.GameState.step ile birebir aynı:
+# piksel koordinatları, pygame.Rect gibi int'e kesilen çarpışma kutuları,
+# tile merkezine 3 px yakınken yön seçimi, ghost house kuralları...
+# Tek fark hayaletlerin rastgele seçimi: rng.GameRng yerine NumPy RNG.
+
+# Grid tensöründeki tile kodları
+EMPTY = 0
+WALL = 1
+PELLET = 2
+POWER = 3
+DOOR = 4   # '-' (duvar sayılmıyor, geçilebilir)
+
+TILE_CODES = {' ': EMPTY, '#': WALL, '.': PELLET, 'o': POWER, '-': DOOR}
+
+# Yön kodları: 0..3 → DIRS, STOP → (0, 0), KEEP → next_dir'e dokunma
+DIRS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.int64)
+STOP = 4
+KEEP = -1
+
+# pacman.py / ghost.py'deki hızlar (piksel / saniye)
+PACMAN_SPEED = 120
+GHOST_SPEED_NORMAL = 90
+GHOST_SPEED_FRIGHTENED = 60
+
+# Ghost state kodları
+NORMAL = 0
+FRIGHTENED = 1
+
+def encode_level(level_map):
+    #LEVEL_MAP string listesini uint8 tile kodlarına çevirir.
+    return np.array([[TILE_CODES[t] for t in row] for row in level_map], dtype=np.uint8)
+
+
+class BatchSim:
+    """
+    N oyunu dizilerde tutar:
+    - grid: (N, H, W) uint8 tile tensörü
+    - Pac-Man: (N,) konum / yön / skor / power dizileri
+    - Hayaletler: (N, G) konum / yön / state dizileri
+    step() tüm oyunları tek seferde dt kadar ilerletir.
+    """
+
+    def __init__(self, n_games, level_map=LEVEL_MAP,
+                 tile_size=TILE_SIZE, hud_height=HUD_HEIGHT, seed=None, weights=DEFAULT_WEIGHTS):
+        self.n = n_games
+        self.weights = weights
+        self.tile_size = tile_size
+        self.hud_height = hud_height
+        self.size = tile_size - 4
+        self.rng = np.random.default_rng(seed)
+
+        # Başlangıç tile'ları ve ghost house haritadan (maps.LevelMap)
+        level_map = as_level(level_map)
+        self.pacman_spawn = level_map.pacman_spawn
+        house = level_map.house_rows
+        self.house_rows = house if house is not None else (1, -1)   # evsiz harita: boş aralık
+        self.level = encode_level(level_map)
+        self.height, self.width = self.level.shape
+
+        # Duvar maskesi hiç değişmiyor; grid dışı için 1 tile'lık False çerçeve
+        self.walls = np.zeros((self.height + 2, self.width + 2), dtype=bool)
+        self.walls[1:-1, 1:-1] = self.level == WALL
+
+        # Yem olabilecek hücrelerin koordinatları (agent'ın en yakın yem araması için)
+        rows, cols = np.nonzero((self.level == PELLET) | (self.level == POWER))
+        self.food_rows = rows
+        self.food_cols = cols
+        self.food_total = rows.size
+
+        # Agent'ın hayalet mesafeleri için labirent mesafe tablosu
+        self.distances = get_maze_distances(level_map)
+        self.node_of = np.array(self.distances.node_of, dtype=np.int64)
+        self.dist_matrix = np.asarray(self.distances.matrix)
+        self.food_nodes = self.node_of[self.food_rows, self.food_cols]
+
+        # Hayaletlerin ev konumları (to_home için)
+        spawns = level_map.ghost_spawns
+        self.home_x = np.array([c * tile_size for c, r in spawns], dtype=np.float64)
+        self.home_y = np.array([hud_height + r * tile_size for c, r in spawns], dtype=np.float64)
+        self.n_ghosts = len(spawns)
+
+        self.reset()
+
+    def reset(self):
+        #Tüm oyunları başlangıç durumuna getirir.
+        n, g = self.n, self.n_ghosts
+        self.grid = np.repeat(self.level[None], n, axis=0)
+
+        col, row = self.pacman_spawn
+        self.pac_x = np.full(n, float(col * self.tile_size))
+        self.pac_y = np.full(n, float(self.hud_height + row * self.tile_size))
+        self.pac_dx = np.zeros(n, dtype=np.int64)
+        self.pac_dy = np.zeros(n, dtype=np.int64)
+        self.pac_ndx = np.zeros(n, dtype=np.int64)
+        self.pac_ndy = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.alive = np.ones(n, dtype=bool)
+        self.cleared = np.zeros(n, dtype=bool)
+        self.food_left = np.full(n, self.food_total, dtype=np.int64)
+        self.power_mode = np.zeros(n, dtype=bool)
+        self.power_timer = np.zeros(n, dtype=np.float64)
+
+        self.ghost_x = np.repeat(self.home_x[None], n, axis=0)
+        self.ghost_y = np.repeat(self.home_y[None], n, axis=0)
+        start = self.rng.integers(0, 4, size=(n, g))
+        self.ghost_dx = DIRS[start, 0]
+        self.ghost_dy = DIRS[start, 1]
+        self.ghost_state = np.zeros((n, g), dtype=np.uint8)
+
+        self.elapsed = np.zeros(n, dtype=np.float64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.ghosts_eaten = np.zeros(n, dtype=np.int64)
+
+        # Agent'ın loop history'si (halka tampon; üyelik kontrolünde sıra önemsiz)
+        self.history = np.full((n, self.weights.loop_history, 2), -1, dtype=np.int64)
+        self.history_pos = np.zeros(n, dtype=np.int64)
+
+    @property
+    def game_over(self):
+        return ~self.alive | self.cleared
+
+    def pellets_left(self):
+        #Her oyunda kalan yem + power pellet sayısı (grid taranmıyor, sayaç)
+        return self.food_left
+
+    # Çarpışma yardımcıları
+    def hits_wall(self, x, y):
+        """
+        (x, y) sol-üst köşeli size x size kutu bir duvara çarpıyor mu?
+        pygame.Rect gibi koordinatları int'e kesip, kutunun kapladığı
+        en fazla 4 tile'a bakıyoruz (size < tile_size).
+        """
+        t = self.tile_size
+        ix = np.trunc(x).astype(np.int64)
+        iy = np.trunc(y).astype(np.int64) - self.hud_height
+        c0 = np.clip(ix // t + 1, 0, self.width + 1)
+        c1 = np.clip((ix + self.size - 1) // t + 1, 0, self.width + 1)
+        r0 = np.clip(iy // t + 1, 0, self.height + 1)
+        r1 = np.clip((iy + self.size - 1) // t + 1, 0, self.height + 1)
+        w = self.walls
+        return w[r0, c0] | w[r0, c1] | w[r1, c0] | w[r1, c1]
+
+    def _tile_of_center(self, x, y):
+        t = self.tile_size
+        col = ((x + self.size / 2) // t).astype(np.int64)
+        row = (((y + self.size / 2) - self.hud_height) // t).astype(np.int64)
+        return col, row
+
+    # Pac-Man
+    def _apply_actions(self, actions):
+        if actions is None:
+            return
+        actions = np.asarray(actions)
+        act = ~self.game_over & (actions != KEEP)
+        stop = act & (actions == STOP)
+        move = act & (actions >= 0) & (actions < 4)
+        code = np.where(move, actions, 0)
+        self.pac_ndx = np.where(move, DIRS[code, 0], np.where(stop, 0, self.pac_ndx))
+        self.pac_ndy = np.where(move, DIRS[code, 1], np.where(stop, 0, self.pac_ndy))
+
+    def _update_pacman(self, dt, active):
+        half = self.tile_size / 2
+
+        # 1) Yeni yön duvara çarpmıyorsa, o yöne dön
+        has_next = (self.pac_ndx != 0) | (self.pac_ndy != 0)
+        can_turn = has_next & ~self.hits_wall(self.pac_x + self.pac_ndx * half,
+                                              self.pac_y + self.pac_ndy * half)
+        turn = active & can_turn
+        self.pac_dx = np.where(turn, self.pac_ndx, self.pac_dx)
+        self.pac_dy = np.where(turn, self.pac_ndy, self.pac_dy)
+
+        # 2) Mevcut yönde ilerle, duvara çarparsa eski yere dön ve merkeze hizala
+        nx = self.pac_x + self.pac_dx * PACMAN_SPEED * dt
+        ny = self.pac_y + self.pac_dy * PACMAN_SPEED * dt
+        blocked = self.hits_wall(nx, ny)
+        col, row = self._tile_of_center(self.pac_x, self.pac_y)
+        t = self.tile_size
+        cx = col * t + (t - self.size) / 2
+        cy = self.hud_height + row * t + (t - self.size) / 2
+        nx = np.where(blocked, cx, nx)
+        ny = np.where(blocked, cy, ny)
+        self.pac_x = np.where(active, nx, self.pac_x)
+        self.pac_y = np.where(active, ny, self.pac_y)
+
+        # 3) Bulunduğu tile'da yem/power pellet var mı?
+        col, row = self._tile_of_center(self.pac_x, self.pac_y)
+        inside = active & (row >= 0) & (row < self.height) & (col >= 0) & (col < self.width)
+        games = np.nonzero(inside)[0]
+        r, c = row[games], col[games]
+        tiles = self.grid[games, r, c]
+        ate_pellet = np.zeros(self.n, dtype=bool)
+        ate_power = np.zeros(self.n, dtype=bool)
+        ate_pellet[games] = tiles == PELLET
+        ate_power[games] = tiles == POWER
+        eaten = (tiles == PELLET) | (tiles == POWER)
+        self.grid[games[eaten], r[eaten], c[eaten]] = EMPTY
+        self.food_left[games[eaten]] -= 1
+        self.score += ate_pellet * 10 + ate_power * 50
+
+        # 4) Power mod aktifse zamanını geri say
+        ticking = active & self.power_mode
+        self.power_timer = np.where(ticking, self.power_timer - dt, self.power_timer)
+        self.power_mode &= ~(ticking & (self.power_timer <= 0))
+
+        return ate_pellet, ate_power
+
+    # Hayaletler
+    def _possible_dirs(self, inside_house17):
+        """
+        Ghost.possible_dirs'in vektör hali: (N, G, 4) legal yön maskesi.
+        Tile merkezinden 3 px'den uzak olan hayaletlerde maske tamamen False.
+        """
+        t = self.tile_size
+        x, y = self.ghost_x, self.ghost_y
+        col = (x // t).astype(np.int64)
+        row = ((y - self.hud_height) // t).astype(np.int64)
+        center_x = col * t + t / 2
+        center_y = self.hud_height + row * t + t / 2
+        dist = ((x + self.size / 2 - center_x) ** 2 +
+                (y + self.size / 2 - center_y) ** 2) ** 0.5
+        near = dist <= 3
+
+        legal = np.empty(x.shape + (4,), dtype=bool)
+        for k, (dx, dy) in enumerate(DIRS):
+            reverse = (dx == -self.ghost_dx) & (dy == -self.ghost_dy)
+            free = ~self.hits_wall(x + dx * (t / 2), y + dy * (t / 2))
+            legal[..., k] = near & free & (inside_house17 | ~reverse)
+        return legal
+
+    def _pick(self, legal):
+        #Her (oyun, hayalet) için legal yönlerden birini eşit olasılıkla seçer.
+        counts = legal.sum(axis=-1)
+        k = np.floor(self.rng.random(counts.shape) * counts).astype(np.int64)
+        idx = np.argmax(legal.cumsum(axis=-1) > k[..., None], axis=-1)
+        return counts > 0, idx
+
+    def _update_ghosts(self, dt, active):
+        t = self.tile_size
+        speed = np.where(self.ghost_state == NORMAL, GHOST_SPEED_NORMAL, GHOST_SPEED_FRIGHTENED)
+        act = active[:, None]
+
+        row_top = ((self.ghost_y - self.hud_height) // t).astype(np.int64)
+        r0, r1 = self.house_rows
+        inside_house = (row_top >= r0) & (row_top <= r1)
+
+        # 1) Ghost house içindeysek kapıdan yukarı çıkmaya çalışsın
+        up_free = ~self.hits_wall(self.ghost_x, self.ghost_y - speed * dt)
+        go_up = act & inside_house & up_free
+
+        # 2) Diğer durumlarda possible_dirs içinden rastgele seçim
+        legal = self._possible_dirs((row_top >= r0) & (row_top <= r1 + 1))
+        has_dirs, idx = self._pick(legal)
+        choose = act & ~go_up & has_dirs
+
+        self.ghost_dx = np.where(go_up, 0, np.where(choose, DIRS[idx, 0], self.ghost_dx))
+        self.ghost_dy = np.where(go_up, -1, np.where(choose, DIRS[idx, 1], self.ghost_dy))
+
+        # 3) Pozisyonu güncelle, duvara çarparsa geri dön ve yönü ters çevir
+        nx = self.ghost_x + self.ghost_dx * speed * dt
+        ny = self.ghost_y + self.ghost_dy * speed * dt
+        blocked = self.hits_wall(nx, ny)
+        moved = act & ~blocked
+        bounced = act & blocked
+        self.ghost_x = np.where(moved, nx, self.ghost_x)
+        self.ghost_y = np.where(moved, ny, self.ghost_y)
+        self.ghost_dx = np.where(bounced, -self.ghost_dx, self.ghost_dx)
+        self.ghost_dy = np.where(bounced, -self.ghost_dy, self.ghost_dy)
+
+    def _collide(self, active):
+        """
+        Pac-Man – ghost çarpışması. Nesne döngüsündeki gibi
+        sadece sıradaki İLK çarpışan hayalet dikkate alınıyor.
+        """
+        px = np.trunc(self.pac_x).astype(np.int64)[:, None]
+        py = np.trunc(self.pac_y).astype(np.int64)[:, None]
+        gx = np.trunc(self.ghost_x).astype(np.int64)
+        gy = np.trunc(self.ghost_y).astype(np.int64)
+        hit = (np.abs(px - gx) < self.size) & (np.abs(py - gy) < self.size)
+        hit &= active[:, None]
+
+        any_hit = hit.any(axis=1)
+        first = np.argmax(hit, axis=1)
+        games = np.nonzero(any_hit)[0]
+        g = first[games]
+
+        eat = self.power_mode[games] & (self.ghost_state[games, g] == FRIGHTENED)
+        eg, gi = games[eat], g[eat]
+        self.score[eg] += 200
+        self.ghosts_eaten[eg] += 1
+        self.ghost_x[eg, gi] = self.home_x[gi]
+        self.ghost_y[eg, gi] = self.home_y[gi]
+        self.ghost_state[eg, gi] = NORMAL
+
+        died = games[~eat]
+        self.alive[died] = False
+        return eg, died
+
+    def step(self, actions=None, dt=1 / 60):
+        """
+        Tüm oyunları dt kadar ilerletir.
+        actions: (N,) yön kodları (0..3 → DIRS, STOP, KEEP) ya da None.
+        Bu tick'te olanları dizi olarak döndürür.
+        """
+        active = ~self.game_over
+        self._apply_actions(actions)
+
+        ate_pellet, ate_power = self._update_pacman(dt, active)
+
+        # Power pellet yendiyse hayaletler frightened
+        self.power_mode |= ate_power
+        self.power_timer = np.where(ate_power, POWER_DURATION, self.power_timer)
+        self.ghost_state[ate_power] = FRIGHTENED
+
+        # Tüm yemler bitti → bölüm temizlendi, bu oyunda tick burada biter
+        cleared = active & (self.food_left == 0)
+        self.cleared |= cleared
+        playing = active & ~cleared
+
+        # Power süresi bittiğinde hayaletler normale dönsün
+        self.ghost_state[playing & ~self.power_mode] = NORMAL
+
+        self._update_ghosts(dt, playing)
+        ghost_eaten_games, died = self._collide(playing)
+
+        self.elapsed[active] += dt
+        self.ticks[active] += 1
+        return {
+            "pellet": ate_pellet,
+            "power": ate_power,
+            "ghost_eaten": ghost_eaten_games,
+            "death": died,
+            "level_cleared": np.nonzero(cleared)[0],
+        }
+
+    def _nodes(self, col, row):
+        #Tile'ların mesafe tablosundaki düğüm numarası (duvar / harita dışı → -1)
+        ok = (row >= 0) & (row < self.height) & (col >= 0) & (col < self.width)
+        nodes = self.node_of[np.clip(row, 0, self.height - 1), np.clip(col, 0, self.width - 1)]
+        return np.where(ok, nodes, -1)
+
+    # Utility agent'ın vektör hali
+    def utility_actions(self):
+        """
+        agent.agent_choose_direction'ın N oyun için vektörize edilmiş hali.
+        Aynı skorlama terimleri ve ağırlıklar (self.weights); (N,) yön kodu döndürür.
+        """
+        n, t = self.n, self.tile_size
+        w = self.weights
+        games = np.arange(n)
+        col, row = self._tile_of_center(self.pac_x, self.pac_y)
+        cur_code = _dir_code(self.pac_dx, self.pac_dy)
+        actions = cur_code.copy()
+
+        # Ekran dışı durum
+        in_grid = (row >= 0) & (row < self.height) & (col >= 0) & (col < self.width)
+
+        # LOOP HISTORY (sadece yeni tile'a girişte, agent.LoopHistory gibi)
+        hist_games = np.nonzero(in_grid & ~self.game_over)[0]
+        last = self.history[hist_games, (self.history_pos[hist_games] - 1) % w.loop_history]
+        entered = (last[:, 0] != col[hist_games]) | (last[:, 1] != row[hist_games])
+        hist_games = hist_games[entered]
+        slot = self.history_pos[hist_games] % w.loop_history
+        self.history[hist_games, slot, 0] = col[hist_games]
+        self.history[hist_games, slot, 1] = row[hist_games]
+        self.history_pos[hist_games] += 1
+
+        # Tile merkezine çok uzaksa mevcut yönü koru
+        px = self.pac_x + self.size / 2
+        py = self.pac_y + self.size / 2
+        center_x = col * t + t / 2
+        center_y = self.hud_height + row * t + t / 2
+        dist_to_center = ((px - center_x) ** 2 + (py - center_y) ** 2) ** 0.5
+        moving = (self.pac_dx != 0) | (self.pac_dy != 0)
+        deciding = in_grid & ~((dist_to_center > 3) & moving)
+
+        # Olası yönler ve legal yönler
+        test_col = col[:, None] + DIRS[None, :, 0]
+        test_row = row[:, None] + DIRS[None, :, 1]
+        in_bounds = (test_row >= 0) & (test_row < self.height) & \
+                    (test_col >= 0) & (test_col < self.width)
+        tiles = self.grid[games[:, None],
+                          np.clip(test_row, 0, self.height - 1),
+                          np.clip(test_col, 0, self.width - 1)]
+        legal = in_bounds & (tiles != WALL)
+        for k, (dx, dy) in enumerate(DIRS):
+            legal[:, k] &= ~self.hits_wall(self.pac_x + dx * t / 2, self.pac_y + dy * t / 2)
+
+        reverse = (DIRS[None, :, 0] == -self.pac_dx[:, None]) & \
+                  (DIRS[None, :, 1] == -self.pac_dy[:, None])
+        candidates = legal & ~reverse
+        candidates = np.where(candidates.any(axis=1)[:, None], candidates, legal)
+
+        # Skorlamayı sadece bu tick'te gerçekten karar veren oyunlar için yapıyoruz
+        sel = np.nonzero(deciding & legal.any(axis=1))[0]
+        if sel.size == 0:
+            return actions
+        col, row = col[sel], row[sel]
+        test_col, test_row = test_col[sel], test_row[sel]
+        grid = self.grid[sel]
+        m = sel.size
+
+        power = self.power_mode[sel][:, None]
+        score = np.zeros((m, 4))
+
+        # 1) Hayalet mesafeleri (labirent mesafesi; tile duvarsa Manhattan)
+        gcol, grow = self._tile_of_center(self.ghost_x[sel], self.ghost_y[sel])
+        gdist = np.abs(gcol[:, None, :] - test_col[:, :, None]) + \
+            np.abs(grow[:, None, :] - test_row[:, :, None])
+        test_nodes = self._nodes(test_col, test_row)
+        test_node = test_nodes[:, :, None]
+        ghost_node = self._nodes(gcol, grow)[:, None, :]
+        known = (test_node >= 0) & (ghost_node >= 0)
+        maze = self.dist_matrix[np.maximum(test_node, 0), np.maximum(ghost_node, 0)]
+        known &= maze != UNREACHABLE
+        gdist = np.where(known, maze, gdist)
+        fright = (self.ghost_state[sel] == FRIGHTENED)[:, None, :]
+        nearest_danger = np.where(fright, 9999, gdist).min(axis=2).astype(np.float64)
+        nearest_fright = np.where(fright, gdist, 9999).min(axis=2).astype(np.float64)
+
+        # 1.a) NORMAL mod: hayatta kalma + kaçış
+        danger = ~power & (nearest_danger < w.danger_radius)
+        score -= np.where(danger, w.danger / (nearest_danger + 0.1), 0.0)
+        score += np.where(~power, nearest_danger * w.ghost_distance, 0.0)
+
+        # 1.b) POWER mod
+        score += np.where(power & (nearest_fright < w.fright_radius),
+                          w.fright / (nearest_fright + 0.1), 0.0)
+        score -= np.where(power & (nearest_danger < w.power_danger_radius),
+                          w.power_danger / (nearest_danger + 0.1), 0.0)
+
+        # 2) Yem & power pellet utility (en yakın yeme labirent mesafesi)
+        pellet_weight = np.where(power, w.pellet_power_mode, w.pellet)
+        power_weight = np.where(power, w.power_power_mode, w.power)
+        food = grid[:, self.food_rows, self.food_cols]
+        fdist = self.dist_matrix[np.maximum(test_nodes, 0)][:, :, self.food_nodes]
+        for code, weight in ((PELLET, pellet_weight), (POWER, power_weight)):
+            mask = (food == code)[:, None, :]
+            d = np.where(mask, fdist, UNREACHABLE).min(axis=2)
+            has = d != UNREACHABLE
+            d = np.maximum(d, 1)
+            score += np.where(has, weight / d, 0.0)
+
+        # 3) Koridor boşluğu (lookahead_steps adım ileri bak)
+        rows_idx = np.arange(m)[:, None]
+        ahead = np.zeros((m, 4), dtype=np.int64)
+        open_ray = np.ones((m, 4), dtype=bool)
+        for step in range(1, w.lookahead_steps + 1):
+            c = col[:, None] + DIRS[None, :, 0] * step
+            r = row[:, None] + DIRS[None, :, 1] * step
+            ok = (r >= 0) & (r < self.height) & (c >= 0) & (c < self.width)
+            tile = grid[rows_idx, np.clip(r, 0, self.height - 1), np.clip(c, 0, self.width - 1)]
+            open_ray &= ok & (tile != WALL)
+            ahead += open_ray & ((tile == PELLET) | (tile == POWER))
+        score -= np.where(ahead == 0, w.empty_corridor, 0.0)
+
+        # 4) Aynı yönde devam etme bonusu
+        score += np.where(np.arange(4)[None, :] == cur_code[sel][:, None], w.same_dir, 0.0)
+
+        # 5) LOOP CEZASI
+        history = self.history[sel]
+        seen = ((history[:, None, :, 0] == test_col[:, :, None]) &
+                (history[:, None, :, 1] == test_row[:, :, None])).any(axis=2)
+        score -= np.where(seen, w.loop, 0.0)
+
+        actions[sel] = np.argmax(np.where(candidates[sel], score, -np.inf), axis=1)
+        return actions
+
+
+def _dir_code(dx, dy):
+    #(dx, dy) dizilerini yön koduna çevirir; (0, 0) → STOP
+    code = np.full(dx.shape, STOP, dtype=np.int64)
+    for k, (ddx, ddy) in enumerate(DIRS):
+        code[(dx == ddx) & (dy == ddy)] = k
+    return code
@@ -0,0 +1,484 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+# Ekran açmadan çizim / sprite benchmark'ları için
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import io
+import sys
+import json
+import time
+import fnmatch
+import platform
+import argparse
+import statistics
+import contextlib
+import subprocess
+
+import pygame
+
+from game import GameState, TICK_DT, TILE_SIZE, HUD_HEIGHT, GRID_WIDTH, GRID_HEIGHT
+from agent import agent_choose_direction
+from ghost import tint_image
+from maps import generate_map
+import env
+from rng import GameRng
+
+# Sıcak yolların benchmark'ları.
+#   micro: tek çağrının süresi (µs, düşük iyi) — döngü sayısı her ölçüm en az
+#          MIN_TIME sürecek şekilde ayarlanıyor, REPEATS ölçümün medyanı raporlanıyor
+#   macro: saniyede simüle edilen tick (yüksek iyi) ve soğuk başlangıç süresi (ms)
+# Sonuçlar JSON'a yazılıyor ve repodaki referans dosyayla (bench_baseline.json,
+# ya da --baseline ile verilen önceki bir sonuç dosyasıyla) karşılaştırılıp eşiği
+# aşan yavaşlamalar raporlanıyor (çıkış kodu 1). Mutlak süreler makineye bağlı:
+# baseline başka bir makinede (HOST_KEYS farklı) ölçülmüşse karşılaştırma uyarıyla atlanıyor.
+#   python bench.py
+#   python bench.py --out bench_before.json --no-baseline
+#   python bench.py --baseline bench_before.json --threshold 0.10 --limit "startup.*=0.3"
+#   python bench.py --update-baseline      # referansı bu makinedeki ölçümle yenile
+
+MIN_TIME = 0.05        # micro: bir ölçümün en az süresi (sn)
+REPEATS = 7            # micro: kaç ölçüm (medyan raporlanıyor)
+SIM_SECONDS = 3.0      # macro: tick/sn ölçümü için oyun süresi (gerçek sn)
+STARTUP_RUNS = 5       # macro: soğuk başlangıç kaç kere ölçülüyor
+DEFAULT_THRESHOLD = 0.10
+# Repoda saklanan referans sonuçlar (varsayılan --baseline)
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+# machine_info()'nun aynı makine / ortam sayılması için eşleşmesi gereken alanları
+HOST_KEYS = ("python", "implementation", "platform", "machine", "cpu_count", "pygame")
+
+# Pellet yoğunlukları (agent benchmark'ı): kalan yem oranı
+DENSITIES = {"early": 1.0, "mid": 0.5, "late": 0.1}
+
+# ghosts.tick benchmark'larındaki hayalet sayıları
+GHOST_COUNTS = (4, 16, 64)
+
+# Varsayılan eşik dışındakiler (fnmatch kalıbı → oran); soğuk başlangıç disk / OS'e bağlı, gürültülü
+THRESHOLDS = {"startup.*": 0.25}
+
+BENCHMARKS = {}   # isim → (tür, birim, yüksek mi iyi, kurulum fonksiyonu)
+
+
+def benchmark(name, kind="micro", unit="us", higher_is_better=False):
+    """
+    Benchmark kaydı. micro: kurulum fonksiyonu ölçülecek sıfır argümanlı
+    fonksiyonu döndürür. macro: kurulum fonksiyonu ölçümü kendi yapıp değeri döndürür.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (kind, unit, higher_is_better, setup)
+        return setup
+    return register
+
+
+# Ortak kurulum
+_display = None
+
+
+def _ensure_display():
+    # convert_alpha() / font için bir display gerekiyor (dummy sürücüde görünmez)
+    global _display
+    if _display is None:
+        pygame.display.init()
+        pygame.font.init()
+        _display = pygame.display.set_mode((GRID_WIDTH * TILE_SIZE, HUD_HEIGHT + GRID_HEIGHT * TILE_SIZE))
+    return _display
+
+
+def _place(entity, col, row):
+    #Entity'yi tile merkezine koy (karar verilen konum)
+    t = entity.tile_size
+    entity.x = entity.prev_x = col * t + (t - entity.size) / 2
+    entity.y = entity.prev_y = entity.hud_height + row * t + (t - entity.size) / 2
+
+
+def make_game(density=1.0, seed=0, n_ghosts=None):
+    """
+    Sabit bir oyun durumu: yemlerin density kadarı duruyor (hangilerinin kaldığı
+    seed'den), Pac-Man bir kavşakta, hayaletlerden biri yakında.
+    """
+    game = GameState("agent", seed=seed, n_ghosts=n_ghosts)
+    if density < 1.0:
+        rng = GameRng(seed)
+        snap = game.snapshot()
+        keep = 0
+        for i in range(len(game.food)):
+            if rng.random() < density:
+                keep |= 1 << i
+        snap["pellets"] = keep
+        game.restore(snap)
+    _place(game.pacman, 6, 5)
+    game.pacman.dir_x, game.pacman.dir_y = 1, 0
+    _place(game.ghosts[0], 12, 8)
+    game.ghosts[0].dir_x, game.ghosts[0].dir_y = -1, 0
+    game.ghost_index.move_all()
+    return game
+
+
+def make_crowd(n_ghosts, seed=0):
+    """
+    make_game gibi ama n_ghosts hayalet yol tile'larına dağılmış (seed'li), hepsi
+    Pac-Man'e en az 3 tile uzakta → çarpışma yok, ölçüm durumu değiştirmiyor.
+    """
+    game = make_game(DENSITIES["mid"], seed, n_ghosts)
+    rng = GameRng(seed)
+    level = game.level_map
+    tiles = [(c, r) for r in range(level.height) for c in range(level.width)
+             if level.walkable(c, r) and abs(c - 6) + abs(r - 5) > 2]
+    for g in game.ghosts:
+        _place(g, *rng.choice(tiles))
+    game.ghost_index.move_all()
+    return game
+
+
+# Micro benchmark'lar
+def _agent_bench(density, cached=False):
+    def setup():
+        game = make_game(density)
+        pacman, ghosts, distances = game.pacman, game.ghosts, game.distances
+        agent_choose_direction(pacman, ghosts, distances)
+        memory = pacman.agent_memory
+        if cached:
+            # Aynı durum: karar hafızasından
+            return lambda: agent_choose_direction(pacman, ghosts, distances)
+
+        def decide():
+            memory.key = None    # her çağrıda tam değerlendirme
+            return agent_choose_direction(pacman, ghosts, distances)
+        return decide
+    return setup
+
+
+for _name, _density in DENSITIES.items():
+    benchmark(f"agent.choose_direction.{_name}")(_agent_bench(_density))
+benchmark("agent.choose_direction.cached")(_agent_bench(DENSITIES["mid"], cached=True))
+
+
+def _crowd_agent_bench(n_ghosts):
+    # Çok hayalette tam değerlendirme; en yakın hayalet araması game.ghost_index ile
+    def setup():
+        game = make_crowd(n_ghosts)
+        pacman, ghosts, distances = game.pacman, game.ghosts, game.distances
+        index = game.ghost_index
+        agent_choose_direction(pacman, ghosts, distances, ghost_index=index)
+        memory = pacman.agent_memory
+
+        def decide():
+            memory.key = None
+            return agent_choose_direction(pacman, ghosts, distances, ghost_index=index)
+        return decide
+    return setup
+
+
+def _collision_bench(n_ghosts):
+    # Pac-Man / hayalet çarpışma kontrolü (çarpışma yok); maliyet komşulukla sınırlı kalmalı
+    def setup():
+        game = make_crowd(n_ghosts)
+        events = []
+        return lambda: game.check_collisions(events)
+    return setup
+
+
+for _count in GHOST_COUNTS:
+    benchmark(f"agent.choose_direction.ghosts.{_count}")(_crowd_agent_bench(_count))
+    benchmark(f"collision.check.{_count}")(_collision_bench(_count))
+
+
+@benchmark("pacman.can_move")
+def _can_move():
+    pacman = make_game().pacman
+    can_move = pacman.can_move
+    return lambda: can_move(1, 0)
+
+
+@benchmark("ghost.possible_dirs")
+def _possible_dirs():
+    ghost = make_game().ghosts[0]
+    return ghost.possible_dirs
+
+
+def _ghosts_bench(ghost_ai, n_ghosts):
+    # Bir tick'te tüm hayaletlerin hareketi; hayalet başına maliyet sayıdan bağımsız kalmalı
+    def setup():
+        game = GameState("agent", seed=0, ghost_ai=ghost_ai, n_ghosts=n_ghosts)
+        game.elapsed = 100.0    # classic: sonsuz chase bölümü (hedef hesabı en pahalı mod)
+        if game.ghost_ai is not None:
+            game.ghost_ai.sync(game)
+        return lambda: game.update_ghosts(TICK_DT)
+    return setup
+
+
+for _count in GHOST_COUNTS:
+    benchmark(f"ghosts.tick.classic.{_count}")(_ghosts_bench("classic", _count))
+benchmark("ghosts.tick.random.4")(_ghosts_bench("random", 4))
+
+
+@benchmark("ghost.tint_image")
+def _tint_image():
+    _ensure_display()
+    import assets
+    sprite = assets.load_ghost_sprite(TILE_SIZE)
+    if sprite is None:
+        sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    return lambda: tint_image(sprite, (255, 105, 180))
+
+
+@benchmark("render.draw_grid")
+def _draw_grid():
+    # main.draw_grid'in kendisi, ekran dışı bir surface'e
+    _ensure_display()
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+    main.game = make_game(DENSITIES["mid"])
+    surface = pygame.Surface(main.screen.get_size())
+    return lambda: main.draw_grid(surface)
+
+
+@benchmark("game.step")
+def _step():
+    game = make_game()
+    start = game.snapshot()
+
+    def tick():
+        if game.game_over:
+            game.restore(start)
+        game.step(None, TICK_DT)
+    return tick
+
+
+# Macro benchmark'lar
+@benchmark("sim.ticks_per_sec", kind="macro", unit="tick/s", higher_is_better=True)
+def _ticks_per_sec(quick=False):
+    # Seed'li oyunlar ardışık oynanıyor (agent + kurallar, ekran yok)
+    ticks = 0
+    seed = 0
+    start = time.perf_counter()
+    deadline = start + (SIM_SECONDS / 3 if quick else SIM_SECONDS)
+    while time.perf_counter() < deadline:
+        game = GameState("agent", seed=seed)
+        seed += 1
+        while not game.game_over and time.perf_counter() < deadline:
+            for _ in range(60):
+                game.step(None, TICK_DT)
+                if game.game_over:
+                    break
+        ticks += game.ticks
+    return ticks / (time.perf_counter() - start)
+
+
+@benchmark("map.prepare.200x200", kind="macro", unit="ms")
+def _map_prepare(quick=False):
+    # Labirent üretimi + oyunun kurulumu (duvar, yem indeksi, mesafe tablosu, next-hop);
+    # her ölçümde yeni seed → cache'lerde olmayan, soğuk bir harita
+    times = []
+    for seed in range(1 if quick else 3):
+        start = time.perf_counter()
+        level = generate_map(200, 200, seed)
+        GameState("agent", level_map=level, seed=seed, ghost_ai="classic")
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+@benchmark("sim.ticks_per_sec.200x200", kind="macro", unit="tick/s", higher_is_better=True)
+def _ticks_per_sec_large(quick=False):
+    # Büyük üretilmiş harita, hedefli hayaletler (mesafe satırları istendikçe hesaplanıyor)
+    game = GameState("agent", level_map=generate_map(200, 200, 0), seed=0, ghost_ai="classic")
+    start = time.perf_counter()
+    deadline = start + (SIM_SECONDS / 3 if quick else SIM_SECONDS)
+    while not game.game_over and time.perf_counter() < deadline:
+        game.step(None, TICK_DT)
+    return game.ticks / (time.perf_counter() - start)
+
+
+def _env_steps(n_envs):
+    # Gym tarzı ortam, rastgele aksiyonlar, zero-copy gözlemler (tek çekirdek)
+    def measure(quick=False):
+        return env.measure(n_envs, SIM_SECONDS / 3 if quick else SIM_SECONDS)
+    return measure
+
+
+benchmark("env.steps_per_sec", kind="macro", unit="step/s", higher_is_better=True)(_env_steps(1))
+benchmark("env.steps_per_sec.vec16", kind="macro", unit="step/s",
+          higher_is_better=True)(_env_steps(16))
+
+
+@benchmark("startup.main_import", kind="macro", unit="ms")
+def _startup(quick=False):
+    # Yeni bir process'te main'in import'u: pygame, sprite / mesafe cache'leri, pencere
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    here = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(2 if quick else STARTUP_RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import main"], cwd=here, env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+# Ölçüm
+def time_micro(fn, repeats=REPEATS, min_time=MIN_TIME):
+    #Çağrı başına süre (µs): medyan, en iyi ve yayılım (çeyrekler arası / medyan)
+    fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed < min_time / 4 else 1 + int(min_time / max(elapsed, 1e-9))
+
+    samples = [elapsed / loops * 1e6]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops * 1e6)
+    samples.sort()
+    median = statistics.median(samples)
+    q = statistics.quantiles(samples, n=4) if len(samples) > 1 else [median, median, median]
+    return {"value": median, "best": samples[0], "spread": (q[2] - q[0]) / median if median else 0.0,
+            "loops": loops, "repeats": repeats}
+
+
+def run(names, repeats=REPEATS, quick=False, log=None):
+    results = {}
+    for name in names:
+        kind, unit, higher, setup = BENCHMARKS[name]
+        if kind == "micro":
+            res = time_micro(setup(), repeats, MIN_TIME / 5 if quick else MIN_TIME)
+        else:
+            res = {"value": setup(quick)}
+        res.update(kind=kind, unit=unit, higher_is_better=higher)
+        results[name] = res
+        if log is not None:
+            log(name, res)
+    return results
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "pygame": pygame.version.ver,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def host_mismatch(baseline_machine, machine):
+    #Baseline'ın ölçüldüğü makineden farklı alanlar: [(alan, baseline, şimdiki), ...]
+    return [(k, baseline_machine.get(k), machine.get(k)) for k in HOST_KEYS
+            if baseline_machine.get(k) != machine.get(k)]
+
+
+def threshold_for(name, default, overrides):
+    # Sonra verilen kalıp öncekileri eziyor (komut satırı THRESHOLDS'tan sonra)
+    limit = default
+    for pattern, value in overrides:
+        if fnmatch.fnmatchcase(name, pattern):
+            limit = value
+    return limit
+
+
+def compare(results, baseline, default=DEFAULT_THRESHOLD, overrides=()):
+    """
+    Baseline'a göre değişim. change > 0 her zaman "daha kötü" demek
+    (süre arttı ya da tick/sn düştü); change > eşik → regression.
+    Micro benchmark'larda en iyi ölçüm karşılaştırılıyor (medyandan daha az gürültülü).
+    """
+    rows = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        key = "best" if "best" in res and base is not None and "best" in base else "value"
+        if base is None or not base[key]:
+            continue
+        ratio = res[key] / base[key]
+        change = (1 / ratio - 1) if res["higher_is_better"] else ratio - 1
+        limit = threshold_for(name, default, overrides)
+        rows.append({"name": name, "base": base[key], "value": res[key],
+                     "change": change, "threshold": limit, "regression": change > limit})
+    return rows
+
+
+def parse_limit(text):
+    pattern, _, value = text.partition("=")
+    if not value:
+        raise argparse.ArgumentTypeError("KALIP=ORAN biçiminde olmalı (örn. startup.*=0.3)")
+    return pattern, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pac-Man sıcak yol benchmark'ları")
+    parser.add_argument("--out", default="bench_results.json", help="sonuçların yazılacağı JSON")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="karşılaştırılacak önceki sonuç dosyası (varsayılan: repodaki referans)")
+    parser.add_argument("--no-baseline", action="store_true", help="karşılaştırma yapma")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="sonuçları --baseline dosyasına yaz (karşılaştırmadan)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="varsayılan regression eşiği (0.10 = %%10 daha kötü)")
+    parser.add_argument("--limit", type=parse_limit, action="append", default=[], metavar="KALIP=ORAN",
+                        help="benchmark'a özel eşik, fnmatch kalıbıyla (tekrarlanabilir)")
+    parser.add_argument("--filter", default="*", help="çalıştırılacak benchmark'lar (fnmatch kalıbı)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="micro: ölçüm sayısı")
+    parser.add_argument("--quick", action="store_true", help="kısa ölçümler (gürültülü, duman testi için)")
+    parser.add_argument("--list", action="store_true", help="benchmark'ları listele")
+    args = parser.parse_args(argv)
+
+    # Baseline sonuçlar yazılmadan önce okunuyor; aynı dosyaya yazmak karşılaştırmayı
+    # kendisiyle yapmak olurdu (referansı yenilemek için --update-baseline)
+    baseline = None
+    if args.update_baseline:
+        args.out = args.baseline
+    elif not (args.no_baseline or args.list):
+        if os.path.realpath(args.out) == os.path.realpath(args.baseline):
+            parser.error("--out ile --baseline aynı dosya; referansı yenilemek için --update-baseline")
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except OSError as e:
+            parser.error(f"baseline okunamadı: {e}")
+
+    names = [n for n in BENCHMARKS if fnmatch.fnmatchcase(n, args.filter)]
+    if args.list:
+        for n in names:
+            kind, unit, _, _ = BENCHMARKS[n]
+            print(f"{n:36} {kind:5} {unit}")
+        return 0
+
+    def log(name, res):
+        extra = f"  ±{res['spread'] * 100:.1f}%" if "spread" in res else ""
+        print(f"{name:36} {res['value']:12.2f} {res['unit']}{extra}")
+
+    results = run(names, args.repeats, args.quick, log)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"machine": machine_info(), "results": results}, f, indent=2)
+    print(f"Sonuçlar: {args.out}")
+
+    if baseline is None:
+        return 0
+    diff = host_mismatch(baseline.get("machine", {}), machine_info())
+    if diff:
+        print(f"\nUyarı: {args.baseline} başka bir makinede ölçülmüş, karşılaştırma atlandı "
+              f"(yenilemek için --update-baseline):", file=sys.stderr)
+        for key, base, now in diff:
+            print(f"  {key}: {base} → {now}", file=sys.stderr)
+        return 0
+    rows = compare(results, baseline["results"], args.threshold, list(THRESHOLDS.items()) + args.limit)
+    print(f"\nBaseline: {args.baseline} (yüzde: + daha iyi, - daha kötü)")
+    for r in rows:
+        mark = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['name']:36} {r['base']:12.2f} → {r['value']:12.2f}  "
+              f"{-r['change'] * 100:+6.1f}% (eşik {r['threshold'] * 100:.0f}%){mark}")
+    failed = [r["name"] for r in rows if r["regression"]]
+    if failed:
+        print(f"\n{len(failed)} regression: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
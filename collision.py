@@ -0,0 +1,45 @@
+# Duvar çarpışması için tile doluluk tablosu.
+# Eskiden her kontrol ~500 duvar rect'ini tek tek geziyordu; artık bir kutunun
+# kapladığı en fazla 4 tile'a bakmak yetiyor (kutular tile'dan küçük).
+# Pac-Man, hayaletler ve agent'ın yön kontrolleri hepsi bunu kullanıyor.
+
+
+class WallGrid:
+    """
+    occupied[row][col]: o tile duvar mı?
+    hits(x, y, w, h): piksel kutusu bir duvarla kesişiyor mu?
+    Sonuç pygame.Rect.colliderect ile aynı: koordinatlar int'e kesiliyor,
+    sadece kenarların değmesi çarpışma sayılmıyor.
+    """
+
+    def __init__(self, grid, tile_size, hud_height):
+        self.tile_size = tile_size
+        self.hud_height = hud_height
+        self.height = len(grid)
+        self.width = len(grid[0])
+        self.occupied = [[t == '#' for t in row] for row in grid]
+
+    def is_wall(self, col, row):
+        #Harita dışında duvar rect'i yok → False
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.occupied[row][col]
+        return False
+
+    def hits(self, x, y, w, h):
+        t = self.tile_size
+        ix = int(x)
+        iy = int(y) - self.hud_height
+
+        c0 = ix // t
+        c1 = (ix + w - 1) // t
+        r0 = iy // t
+        r1 = (iy + h - 1) // t
+
+        for r in range(r0, r1 + 1):
+            if not (0 <= r < self.height):
+                continue
+            row = self.occupied[r]
+            for c in range(c0, c1 + 1):
+                if 0 <= c < self.width and row[c]:
+                    return True
+        return False
@@ -0,0 +1,286 @@
+from game import POWER_DURATION
+from pellets import PELLET, POWER, INF
+from maze_distance import map_key, DIRS
+
+# İleriye bakan planlayıcılar için küçük, kopyalaması ucuz oyun durumu.
+# GameState piksel seviyesinde ve grid / sprite / indeks referansları taşıyor;
+# burada ise her şey tile seviyesinde birkaç int:
+#   - pellet'ler ve power pellet'ler 28x31 harita üzerinde Python int bitboard
+#     (bit = row * width + col)
+#   - Pac-Man / hayaletler: hücre numarası + yön, hayalet hızı tam sayı "ilerleme" sayacı
+# Bir ply = Pac-Man'in bir tile gitmesi (120 px/sn'de 0.2 sn). Hayaletler aynı
+# sürede 90 px/sn → 18 px, frightened 60 px/sn → 12 px ilerliyor; 24 px dolunca
+# bir tile atlıyorlar. apply() / undo() ve clone() mikro saniyeler sürüyor.
+
+NO_DIR = -1
+
+UP = DIRS.index((0, -1))
+REVERSE = [DIRS.index((-dx, -dy)) for dx, dy in DIRS]
+
+
+class Board:
+    """
+    Haritanın değişmeyen kısmı; tüm CompactState'ler aynı nesneyi paylaşıyor.
+    step[cell][d]: d yönündeki komşu hücre (duvarsa -1)
+    """
+
+    def __init__(self, level_map, homes, tile_size, pac_speed, ghost_speed, fright_speed,
+                 power_duration=POWER_DURATION, house_rows=(13, 16)):
+        self.height = len(level_map)
+        self.width = len(level_map[0])
+        w, h = self.width, self.height
+
+        self.walkable = [level_map[r][c] != '#' for r in range(h) for c in range(w)]
+        self.step = []
+        for cell in range(w * h):
+            c, r = cell % w, cell // w
+            nbrs = []
+            for dx, dy in DIRS:
+                nc, nr = c + dx, r + dy
+                ok = 0 <= nc < w and 0 <= nr < h and self.walkable[nr * w + nc]
+                nbrs.append(nr * w + nc if ok else -1)
+            self.step.append(tuple(nbrs))
+
+        # Ghost house satırları (ghost.py ile aynı: r0..r1+1 U-dönüş serbest, r0..r1 önce yukarı)
+        r0, r1 = house_rows if house_rows is not None else (h, h - 1)
+        self.in_house = [r0 <= r <= r1 + 1 for r in range(h) for c in range(w)]
+        self.house_exit = [r0 <= r <= r1 for r in range(h) for c in range(w)]
+        self.homes = tuple(homes)
+
+        # Hızlar piksel / ply cinsinden; tile_size px dolunca hayalet bir tile gidiyor
+        self.tile = tile_size
+        ply_time = tile_size / pac_speed
+        self.ghost_speed = round(ghost_speed * ply_time)
+        self.fright_speed = round(fright_speed * ply_time)
+        self.power_plies = round(power_duration / ply_time)
+        self.ply_time = ply_time
+
+    def cell(self, col, row):
+        return row * self.width + col
+
+    def col_row(self, cell):
+        return cell % self.width, cell // self.width
+
+    def ghost_options(self, cell, d):
+        #Hayaletin bu hücrede seçebileceği yönler (ghost.py kuralları, tile seviyesinde)
+        nbrs = self.step[cell]
+        if self.house_exit[cell] and nbrs[UP] >= 0:
+            return (UP,)
+        back = REVERSE[d] if d >= 0 and not self.in_house[cell] else NO_DIR
+        opts = tuple(k for k in range(4) if nbrs[k] >= 0 and k != back)
+        return opts or ((back,) if back >= 0 else ())
+
+    def food_distances(self, cell, pellets, powers):
+        """
+        cell'den bitboard'lardaki en yakın yeme ve power pellet'e labirent mesafesi
+        (yoksa INF). BFS ikisi de bulununca duruyor.
+        """
+        pellet_d = INF if not pellets else None
+        power_d = INF if not powers else None
+        step = self.step
+        seen = {cell}
+        frontier = [cell]
+        d = 0
+        while frontier:
+            for c in frontier:
+                bit = 1 << c
+                if pellet_d is None and pellets & bit:
+                    pellet_d = d
+                if power_d is None and powers & bit:
+                    power_d = d
+            if pellet_d is not None and power_d is not None:
+                return pellet_d, power_d
+            nxt = []
+            for c in frontier:
+                for n in step[c]:
+                    if n >= 0 and n not in seen:
+                        seen.add(n)
+                        nxt.append(n)
+            frontier = nxt
+            d += 1
+        # Ulaşılamayan yemler (PelletDistanceField'daki gibi) INF
+        return (INF if pellet_d is None else pellet_d, INF if power_d is None else power_d)
+
+
+# Aynı harita / hız için Board bir kere kuruluyor
+_boards = {}
+
+
+def get_board(game):
+    p = game.pacman
+    g0 = game.ghosts[0]
+    t = game.tile_size
+    homes = tuple((g.home_y - game.hud_height) // t * len(game.level_map[0]) + g.home_x // t
+                  for g in game.ghosts)
+    house = g0.house_rows
+    key = (map_key(game.level_map), homes, t, p.speed, g0.speed_normal, g0.speed_frightened, house)
+    board = _boards.get(key)
+    if board is None:
+        board = Board(game.level_map, homes, t, p.speed, g0.speed_normal, g0.speed_frightened,
+                      house_rows=house)
+        _boards[key] = board
+    return board
+
+
+class CompactState:
+    """
+    ghosts: her hayalet için (cell, dir, frightened, progress) tuple'ı
+    apply(action, ghost_dirs) bir ply ilerletir ve undo bilgisini döndürür;
+    undo(u) aynı nesneyi eski haline getirir. key() hash'lenebilir durum anahtarı.
+    """
+
+    __slots__ = ("board", "pac", "pac_dir", "ghosts", "pellets", "powers",
+                 "power_left", "score", "dead", "ply")
+
+    def __init__(self, board, pac, pac_dir, ghosts, pellets, powers,
+                 power_left=0, score=0, dead=False, ply=0):
+        self.board = board
+        self.pac = pac
+        self.pac_dir = pac_dir
+        self.ghosts = ghosts
+        self.pellets = pellets
+        self.powers = powers
+        self.power_left = power_left
+        self.score = score
+        self.dead = dead
+        self.ply = ply
+
+    @classmethod
+    def from_game(cls, game):
+        #Canlı GameState'ten tile seviyesinde kopya (merkezlerin düştüğü hücreler)
+        board = get_board(game)
+        t = game.tile_size
+        top = game.hud_height
+
+        def cell_of(e):
+            return board.cell(int((e.x + e.size / 2) // t), int((e.y + e.size / 2 - top) // t))
+
+        def dir_of(dx, dy):
+            return DIRS.index((dx, dy)) if (dx, dy) in DIRS else NO_DIR
+
+        def progress_of(g):
+            # Hücre merkezinden hareket yönünde kaç px ileride; merkezden yarım tile
+            # geçince bir sonraki hücreye atlıyor → ilerleme = yarım tile + bu fark
+            cx = g.x + g.size / 2
+            cy = g.y + g.size / 2 - top
+            offset = (cx - (cx // t * t + t / 2)) * g.dir_x + (cy - (cy // t * t + t / 2)) * g.dir_y
+            return min(t - 1, max(0, int(t / 2 + offset)))
+
+        pellets = powers = 0
+        for r, row in enumerate(game.grid):
+            for c, tile in enumerate(row):
+                if tile == PELLET:
+                    pellets |= 1 << board.cell(c, r)
+                elif tile == POWER:
+                    powers |= 1 << board.cell(c, r)
+
+        p = game.pacman
+        ghosts = tuple((cell_of(g), dir_of(g.dir_x, g.dir_y), g.state == "frightened",
+                        progress_of(g)) for g in game.ghosts)
+        power_left = 0
+        if p.power_mode:
+            power_left = max(1, round(p.power_timer / board.ply_time))
+        return cls(board, cell_of(p), dir_of(p.dir_x, p.dir_y), ghosts, pellets, powers,
+                   power_left, p.score, not p.alive)
+
+    def clone(self):
+        return CompactState(self.board, self.pac, self.pac_dir, self.ghosts, self.pellets,
+                            self.powers, self.power_left, self.score, self.dead, self.ply)
+
+    def key(self):
+        return (self.pac, self.pac_dir, self.ghosts, self.pellets, self.powers,
+                self.power_left, self.dead)
+
+    @property
+    def food_left(self):
+        return self.pellets | self.powers
+
+    def is_terminal(self):
+        return self.dead or not (self.pellets | self.powers)
+
+    def legal_actions(self):
+        nbrs = self.board.step[self.pac]
+        return [d for d in range(4) if nbrs[d] >= 0]
+
+    def ghost_options(self, i):
+        """
+        Bu ply'da i. hayalet bir tile atlayacaksa seçebileceği yönler,
+        atlamayacaksa boş tuple (şans düğümü değil).
+        """
+        cell, d, frightened, progress = self.ghosts[i]
+        b = self.board
+        if progress + (b.fright_speed if frightened else b.ghost_speed) < b.tile:
+            return ()
+        return b.ghost_options(cell, d)
+
+    def apply(self, action, ghost_dirs=None):
+        """
+        Bir ply: Pac-Man action yönüne döner (duvarsa eski yönde devam eder),
+        bir tile gider, yer; sonra hayaletler. ghost_dirs[i] None ya da verilmezse
+        hayalet mümkünse aynı yönde devam ediyor.
+        """
+        undo = (self.pac, self.pac_dir, self.ghosts, self.pellets, self.powers,
+                self.power_left, self.score, self.dead, self.ply)
+        if self.dead:
+            return undo
+        b = self.board
+        step = b.step
+
+        # 1) Pac-Man
+        pac = old_pac = self.pac
+        nbrs = step[pac]
+        if action is not None and action >= 0 and nbrs[action] >= 0:
+            self.pac_dir = action
+        if self.pac_dir >= 0 and nbrs[self.pac_dir] >= 0:
+            pac = nbrs[self.pac_dir]
+            self.pac = pac
+
+        ghosts = self.ghosts
+        bit = 1 << pac
+        if self.pellets & bit:
+            self.pellets ^= bit
+            self.score += 10
+        elif self.powers & bit:
+            self.powers ^= bit
+            self.score += 50
+            self.power_left = b.power_plies
+            ghosts = tuple((c, d, True, p) for c, d, _, p in ghosts)
+        elif self.power_left:
+            self.power_left -= 1
+            if not self.power_left:
+                ghosts = tuple((c, d, False, p) for c, d, _, p in ghosts)
+
+        # 2) Hayaletler
+        moved = []
+        for i, (cell, d, frightened, progress) in enumerate(ghosts):
+            prev = cell
+            progress += b.fright_speed if frightened else b.ghost_speed
+            if progress >= b.tile:
+                progress -= b.tile
+                opts = b.ghost_options(cell, d)
+                choice = ghost_dirs[i] if ghost_dirs is not None else None
+                if choice is None or choice not in opts:
+                    choice = d if d in opts else (opts[0] if opts else NO_DIR)
+                if choice >= 0:
+                    d = choice
+                    cell = step[cell][d]
+            moved.append([cell, d, frightened, progress, prev])
+
+        # 3) Çarpışma: aynı hücre ya da yer değiştirme (karşılıklı geçme)
+        for i, g in enumerate(moved):
+            cell, prev = g[0], g[4]
+            if cell == pac or (cell == old_pac and prev == pac):
+                if g[2]:
+                    # Frightened → yenir, eve döner
+                    g[0], g[1], g[2], g[3] = b.homes[i], NO_DIR, False, 0
+                    self.score += 200
+                else:
+                    self.dead = True
+
+        self.ghosts = tuple((c, d, f, p) for c, d, f, p, _ in moved)
+        self.ply += 1
+        return undo
+
+    def undo(self, undo):
+        (self.pac, self.pac_dir, self.ghosts, self.pellets, self.powers,
+         self.power_left, self.score, self.dead, self.ply) = undo
@@ -0,0 +1,240 @@
+import argparse
+import time
+
+import numpy as np
+
+from game import GameState, TICK_DT, LEVEL_MAP, as_level
+from pellets import POWER
+from maps import load_map
+from tournament import MAX_GAME_TIME
+
+# Öğrenen politikalar için Gym tarzı ortam (reset(seed) / step(action)).
+# Kurallar game.GameState'in kendisi; ortam sadece aksiyonu Pac-Man'in yönüne
+# çeviriyor ve gözlemi önceden ayrılmış uint8 düzlemlere yazıyor:
+#   - duvarlar ve başlangıç yemleri reset'te hazır düzlemlerden kopyalanıyor,
+#   - yenen yemler PelletIndex dinleyicisiyle tek tek siliniyor,
+#   - hayalet / Pac-Man düzlemleri her adımda sıfırlanıp game.ghost_index'in
+#     tile'larından yeniden yazılıyor.
+# Adım başına yeni dizi üretilmiyor; zero_copy=True ile aynı tampon döndürülüyor.
+# gym / gymnasium'a bağımlı değil, API'si (5'li step sonucu) onlarla aynı.
+
+# Gözlem kanalları (C, H, W); değerler 0 / 1
+WALLS = 0
+PELLETS = 1
+POWERS = 2
+DANGER = 3       # normal (tehlikeli) hayaletler
+FRIGHT = 4       # frightened (yenebilir) hayaletler
+PACMAN = 5
+CHANNELS = ("walls", "pellets", "powers", "danger", "fright", "pacman")
+
+# Aksiyonlar: batch_sim.DIRS sırası + dur
+ACTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (0, 0))
+
+FRAME_SKIP = 4   # bir step() kaç simülasyon tick'i (aynı aksiyonla); 4 tick ≈ 1/3 tile
+
+
+def start_planes(level_map):
+    #Haritanın duvar / yem / power düzlemleri (reset'te kopyalanan başlangıç hali)
+    planes = np.zeros((len(CHANNELS), level_map.height, level_map.width), dtype=np.uint8)
+    for r, row in enumerate(level_map):
+        for c, t in enumerate(row):
+            if t == '#':
+                planes[WALLS, r, c] = 1
+            elif t == '.':
+                planes[PELLETS, r, c] = 1
+            elif t == 'o':
+                planes[POWERS, r, c] = 1
+    return planes
+
+
+class PacmanEnv:
+    """
+    Tek oyunluk ortam.
+    reset(seed=None) → (obs, info); step(action) → (obs, reward, terminated, truncated, info)
+    action: ACTIONS indeksi (0..4); reward: bu adımdaki skor artışı
+    terminated: oyun bitti (yakalandı / temizlendi), truncated: max_time doldu
+    seed None ise bir önceki seed + seed_stride (ilk reset'te rastgele) → bölümler tekrarlanabilir
+    zero_copy: True → her seferinde aynı gözlem tamponu döner (bir sonraki step'te üzerine yazılır),
+               False → kopyası
+    out: gözlemin yazılacağı (C, H, W) uint8 tampon (VecPacmanEnv kendi dizisinin dilimlerini veriyor)
+    ghost_ai / n_ghosts / level_map: GameState parametreleri
+    """
+
+    def __init__(self, level_map=LEVEL_MAP, ghost_ai="random", n_ghosts=None,
+                 frame_skip=FRAME_SKIP, max_time=MAX_GAME_TIME, zero_copy=False,
+                 out=None, seed_stride=1):
+        self.level_map = as_level(level_map)
+        self.ghost_ai = ghost_ai
+        self.n_ghosts = n_ghosts
+        self.frame_skip = frame_skip
+        self.max_time = max_time
+        self.zero_copy = zero_copy
+        self.seed_stride = seed_stride
+
+        self.action_count = len(ACTIONS)
+        self.observation_shape = (len(CHANNELS), self.level_map.height, self.level_map.width)
+        self.start = start_planes(self.level_map)
+        self.obs = np.zeros(self.observation_shape, dtype=np.uint8) if out is None else out
+        self.dynamic = self.obs[DANGER:]   # her adımda baştan yazılan düzlemler (view)
+
+        self.game = None
+        self.next_seed = None
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = self.next_seed
+        game = GameState("human", seed=seed, level_map=self.level_map,
+                         ghost_ai=self.ghost_ai, n_ghosts=self.n_ghosts)
+        self.next_seed = game.seed + self.seed_stride
+        game.pellet_index.listeners.append(self._on_pellet_removed)
+        self.game = game
+
+        np.copyto(self.obs, self.start)
+        self._observe()
+        return self._result(), {"seed": game.seed}
+
+    def step(self, action):
+        game = self.game
+        pacman = game.pacman
+        score = pacman.score
+        # Yön bir kere veriliyor; sonraki tick'lerde Pac-Man'in next_dir'i aynı kalıyor
+        game.step(ACTIONS[action], TICK_DT)
+        for _ in range(self.frame_skip - 1):
+            if game.game_over:
+                break
+            game.step(None, TICK_DT)
+
+        terminated = game.game_over
+        truncated = not terminated and game.elapsed >= self.max_time
+        self._observe()
+        info = {"score": pacman.score, "elapsed": game.elapsed, "cause": game.cause}
+        return self._result(), pacman.score - score, terminated, truncated, info
+
+    def _on_pellet_removed(self, col, row, kind):
+        self.obs[POWERS if kind == POWER else PELLETS, row, col] = 0
+
+    def _observe(self):
+        #Hayalet ve Pac-Man düzlemleri (duvar / yem düzlemleri zaten güncel)
+        game = self.game
+        obs = self.obs
+        self.dynamic.fill(0)
+        height, width = self.observation_shape[1:]
+
+        index = game.ghost_index
+        entities = index.entities
+        for h, (col, row) in enumerate(index.tiles):
+            if 0 <= row < height and 0 <= col < width:
+                obs[FRIGHT if entities[h].state == "frightened" else DANGER, row, col] = 1
+
+        p = game.pacman
+        t = game.tile_size
+        col = int((p.x + p.size / 2) // t)
+        row = int((p.y + p.size / 2 - game.hud_height) // t)
+        if 0 <= row < height and 0 <= col < width:
+            obs[PACMAN, row, col] = 1
+
+    def _result(self):
+        return self.obs if self.zero_copy else self.obs.copy()
+
+
+class VecPacmanEnv:
+    """
+    n_envs ortamı sırayla adımlayan vektör ortam (gym SyncVectorEnv gibi).
+    Gözlemler tek bir (N, C, H, W) uint8 dizide; her ortam kendi dilimine yazıyor.
+    step(actions) → (obs, rewards, terminated, truncated, infos); biten ortam
+    hemen reset'leniyor (dönen gözlem yeni bölümün ilki), bitiş gözlemi
+    final_obs[i]'ye kopyalanıp infos[i]["final_observation"] olarak veriliyor.
+    reset(seed): i. ortam seed + i; sonraki bölümler seed + i + k * n_envs.
+    zero_copy: True → obs / rewards / terminated / truncated her seferinde aynı diziler
+    """
+
+    def __init__(self, n_envs, zero_copy=False, **kwargs):
+        self.n = n_envs
+        self.zero_copy = zero_copy
+        first = PacmanEnv(**kwargs)
+        self.action_count = first.action_count
+        self.observation_shape = first.observation_shape
+
+        shape = (n_envs,) + self.observation_shape
+        self.obs = np.zeros(shape, dtype=np.uint8)
+        self.final_obs = np.zeros(shape, dtype=np.uint8)
+        self.rewards = np.zeros(n_envs, dtype=np.int64)
+        self.terminated = np.zeros(n_envs, dtype=bool)
+        self.truncated = np.zeros(n_envs, dtype=bool)
+        self.envs = [PacmanEnv(zero_copy=True, out=self.obs[i], seed_stride=n_envs, **kwargs)
+                     for i in range(n_envs)]
+
+    def reset(self, seed=None):
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, info = env.reset(None if seed is None else seed + i)
+            infos.append(info)
+        return self._result(self.obs), infos
+
+    def step(self, actions):
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, reward, terminated, truncated, info = env.step(int(actions[i]))
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            if terminated or truncated:
+                np.copyto(self.final_obs[i], env.obs)
+                info["final_observation"] = self.final_obs[i]
+                env.reset()
+            infos.append(info)
+        return (self._result(self.obs), self._result(self.rewards),
+                self._result(self.terminated), self._result(self.truncated), infos)
+
+    def _result(self, array):
+        return array if self.zero_copy else array.copy()
+
+
+def measure(n_envs=1, seconds=5.0, zero_copy=True, seed=0, **kwargs):
+    """
+    Rastgele aksiyonlarla adım hızı (step / saniye, tek çekirdek).
+    n_envs == 1 → PacmanEnv, fazlası → VecPacmanEnv (ortam adımı sayılıyor).
+    """
+    rng = np.random.default_rng(seed)
+    if n_envs == 1:
+        env = PacmanEnv(zero_copy=zero_copy, **kwargs)
+    else:
+        env = VecPacmanEnv(n_envs, zero_copy=zero_copy, **kwargs)
+    env.reset(seed)
+    actions = rng.integers(0, len(ACTIONS), size=(4096, n_envs))
+
+    steps = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for a in actions[steps % 4096: steps % 4096 + 64]:
+            if n_envs == 1:
+                _, _, terminated, truncated, _ = env.step(a[0])
+                if terminated or truncated:
+                    env.reset()
+            else:
+                env.step(a)
+        steps += 64
+    return steps * n_envs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gym tarzı ortamın adım hızı (rastgele politika)")
+    parser.add_argument("--envs", type=int, default=1, help="ortam sayısı (>1 → VecPacmanEnv)")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--frame-skip", type=int, default=FRAME_SKIP)
+    parser.add_argument("--copy", action="store_true", help="zero-copy yerine her adımda kopya")
+    parser.add_argument("--ghost-ai", default="random")
+    parser.add_argument("--ghosts", type=int, default=None)
+    parser.add_argument("--map", default=None, help="harita dosyası (maps.py)")
+    args = parser.parse_args()
+
+    level_map = load_map(args.map) if args.map else LEVEL_MAP
+    rate = measure(args.envs, args.seconds, zero_copy=not args.copy,
+                   level_map=level_map, ghost_ai=args.ghost_ai, n_ghosts=args.ghosts,
+                   frame_skip=args.frame_skip)
+    print(f"{args.envs} ortam: {rate:.0f} step/s ({rate * args.frame_skip:.0f} tick/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Simülasyonun yaydığı olaylar ve basit bir dağıtıcı (event bus).
+# Ses, HUD, istatistik, log gibi her şey isteğe bağlı abone;
+# toplu simülasyonlarda hiç abone yoksa emit() bir dict bakışından ibaret.
+
+
+class Event:
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class PelletEaten(Event):
+    #Küçük nokta yendi
+    __slots__ = ("col", "row")
+
+    def __init__(self, col, row):
+        self.col = col
+        self.row = row
+
+
+class PowerStarted(Event):
+    #Power pellet yendi, hayaletler frightened
+    __slots__ = ("col", "row")
+
+    def __init__(self, col, row):
+        self.col = col
+        self.row = row
+
+
+class PowerEnded(Event):
+    #Power süresi bitti
+    __slots__ = ()
+
+
+class GhostEaten(Event):
+    #Frightened hayalet yendi (ghost: game.ghosts içindeki sırası)
+    __slots__ = ("ghost",)
+
+    def __init__(self, ghost):
+        self.ghost = ghost
+
+
+class PacmanDied(Event):
+    #Pac-Man normal bir hayalete çarptı
+    __slots__ = ("ghost",)
+
+    def __init__(self, ghost):
+        self.ghost = ghost
+
+
+class LevelCleared(Event):
+    #Haritada yem kalmadı
+    __slots__ = ()
+
+
+class EventBus:
+    """
+    subscribe(EventType, handler): sadece o tipteki olaylar
+    subscribe_all(handler): tüm olaylar (log vb.)
+    emit(event): aboneleri sırayla çağırır
+    """
+
+    __slots__ = ("_handlers", "_any")
+
+    def __init__(self):
+        self._handlers = {}
+        self._any = []
+
+    def subscribe(self, event_type, handler):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        handlers = self._handlers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self._handlers[event_type]
+
+    def subscribe_all(self, handler):
+        self._any.append(handler)
+
+    def has_subscribers(self, event_type):
+        return bool(self._any) or event_type in self._handlers
+
+    def emit(self, event):
+        handlers = self._handlers.get(type(event))
+        if handlers:
+            for h in handlers:
+                h(event)
+        if self._any:
+            for h in self._any:
+                h(event)
@@ -0,0 +1,454 @@
+from pacman import Pacman
+from ghost import Ghost
+from ghost_ai import GhostAI, GHOST_AI_NAMES
+from agent import utility_agent, make_utility_agent
+from pellets import PelletIndex, PELLET, POWER
+from collision import WallGrid
+from maze_distance import get_maze_distances
+from maps import LevelMap
+from spatial import SpatialHash
+from rng import GameRng, new_seed
+from weights import WeightProfile, DEFAULT_WEIGHTS
+from events import (EventBus, PelletEaten, PowerStarted, PowerEnded,
+                    GhostEaten, PacmanDied, LevelCleared)
+
+# Oyun kuralları burada, ekran/ses yok.
+# main.py sadece bu çekirdeğin üstünde çizim + klavye katmanı olarak çalışıyor,
+# böylece oyunu pencere açmadan (sunucuda) binlerce tick simüle edebiliyoruz.
+
+# GENEL AYARLAR
+TILE_SIZE = 24
+GRID_WIDTH = 28
+GRID_HEIGHT = 31
+
+HUD_HEIGHT = 40  # üstte skor / süre barı
+
+POWER_DURATION = 7.0  # power pellet süresi saniye cinsinden
+
+# Sabit simülasyon adımı: ekran kaç FPS çizerse çizsin oyun hep bu hızda tick'liyor
+TICK_RATE = 60
+TICK_DT = 1 / TICK_RATE
+
+# Oyun içi renkler (hayaletlerin rengi sprite tint'i için lazım)
+YELLOW = (255, 255, 0)
+RED = (220, 0, 0)
+PINK = (255, 105, 180)
+CYAN = (0, 200, 200)
+ORANGE = (255, 165, 0)
+FRIGHT_BLUE = (0, 0, 255)
+
+# LEVEL MAP (pac-man haritasi)
+LEVEL_MAP = [
+    "############################",
+    "#............##............#",
+    "#.####.#####.##.#####.####.#",
+    "#o####.#####.##.#####.####o#",
+    "#.####.#####.##.#####.####.#",
+    "#..........................#",
+    "#.####.##.########.##.####.#",
+    "#.####.##.########.##.####.#",
+    "#......##....##....##......#",
+    "######.#####.##.#####.######",
+    "######.#####.##.#####.######",
+    "######.##..........##.######",
+    "######.##.###--###.##.######",
+    "######.##.#      #.##.######",
+    "######.##.#      #.##.######",
+    "######.##.#      #.##.######",
+    "######.##.#      #.##.######",
+    "######.##.########.##.######",
+    "######.##..........##.######",
+    "#............##............#",
+    "#.####.#####.##.#####.####.#",
+    "#.####.#####.##.#####.####.#",
+    "#o..##................##..o#",
+    "###.##.##.########.##.##.###",
+    "#......##....##....##......#",
+    "#.##########.##.##########.#",
+    "#..........................#",
+    "#.##########.##.##########.#",
+    "#..........................#",
+    "#o########################o#",
+    "############################"
+]
+
+# Pac-Man ve hayaletlerin başlangıç tile'ları (col, row)
+PACMAN_SPAWN = (1, 1)
+GHOST_SPAWNS = [
+    (13, 15, RED),
+    (14, 15, CYAN),
+    (13, 16, PINK),
+    (14, 16, ORANGE),
+]
+GHOST_COLORS = [color for _, _, color in GHOST_SPAWNS]
+
+# Klasik haritanın ghost house iç bölgesi (c0, r0, c1, r1)
+CLASSIC_HOUSE = (11, 13, 16, 16)
+CLASSIC_MAP = LevelMap(LEVEL_MAP, PACMAN_SPAWN, [(c, r) for c, r, _ in GHOST_SPAWNS],
+                       CLASSIC_HOUSE, name="classic")
+
+# Snapshot'larda bitiş nedeni ve sprite yönü için küçük kodlar
+CAUSES = [None, "ghost", "cleared"]
+DIR_NAME_LIST = ["RIGHT", "LEFT", "UP", "DOWN"]
+
+
+def as_level(level_map):
+    #Düz satır listesi (eski LEVEL_MAP biçimi) → klasik başlangıç tile'ları ve ghost house ile LevelMap
+    # maps.py doğrudan çalıştırılınca sınıfı __main__.LevelMap oluyor; alana bakıyoruz
+    if isinstance(level_map, LevelMap) or hasattr(level_map, "ghost_spawns"):
+        return level_map
+    if list(level_map) == LEVEL_MAP:
+        return CLASSIC_MAP
+    return LevelMap(level_map, PACMAN_SPAWN, CLASSIC_MAP.ghost_spawns, CLASSIC_HOUSE)
+
+
+def food_cells(level_map):
+    #Haritadaki tüm (col, row, kind) yem tile'ları, satır sırasıyla (snapshot bit sırası)
+    return [(c, r, t) for r, row in enumerate(level_map)
+            for c, t in enumerate(row) if t in (PELLET, POWER)]
+
+
+# Agent yönü → sprite yön ismi
+DIR_NAMES = {
+    (1, 0): "RIGHT",
+    (-1, 0): "LEFT",
+    (0, -1): "UP",
+    (0, 1): "DOWN",
+}
+
+
+class GameState:
+    """
+    Tek bir oyunun tüm durumu (harita, Pac-Man, hayaletler, süre).
+    Ekran açmadan çalışır; her step() çağrısı bir simülasyon tick'i.
+    mode: "human" → yön dışarıdan (klavye) gelir,
+          "agent" → yön verilmezse utility agent seçer
+    seed: hayaletlerin rastgele seçimleri için; aynı seed + aynı girdiler → aynı oyun
+          (None ise rastgele bir seed seçilip self.seed'e yazılıyor)
+    agent: agent modunda yönü seçen fonksiyon, agent(game) → (dx, dy)
+           (varsayılan: utility agent; bkz. make_agent)
+    ghost_ai: "random" → her kavşakta rastgele (orijinal davranış),
+              "classic" → hedefli Blinky / Pinky / Inky / Clyde (ghost_ai.py)
+    n_ghosts: hayalet sayısı (None → haritadaki başlangıç sayısı); fazlasında
+              başlangıç tile'ları ve renkler tekrar ediyor
+    level_map: maps.LevelMap ya da düz satır listesi (klasik başlangıçlarla)
+    """
+
+    def __init__(self, mode="agent",
+                 level_map=LEVEL_MAP,
+                 tile_size=TILE_SIZE,
+                 hud_height=HUD_HEIGHT,
+                 pacman_images=None,
+                 ghost_sprite=None,
+                 seed=None,
+                 agent=None,
+                 ghost_ai="random",
+                 n_ghosts=None):
+
+        self.mode = mode
+        self.agent = agent if agent is not None else utility_agent
+        self.seed = new_seed() if seed is None else seed
+        self.rng = GameRng(self.seed)
+        self.tile_size = tile_size
+        self.hud_height = hud_height
+
+        # Haritayı sıfırla (tüm pellet'ler geri gelsin)
+        level_map = as_level(level_map)
+        self.level_map = level_map
+        self.grid = [list(row) for row in level_map]
+        self.walls = WallGrid(self.grid, tile_size, hud_height)  # duvar çarpışmaları
+        self.pellet_index = PelletIndex(self.grid)
+        self.food = food_cells(level_map)   # snapshot'taki yem bitlerinin sırası
+        self.distances = get_maze_distances(level_map)  # gerçek labirent mesafeleri
+
+        # Pac-Man başlangıç konumu
+        col, row = level_map.pacman_spawn
+        self.pacman = Pacman(col, row, tile_size, hud_height, self.grid, self.walls,
+                             pacman_images=pacman_images, color=YELLOW,
+                             pellet_index=self.pellet_index)
+
+        # Ghost'lar ghost house içinde başlıyor
+        spawns = level_map.ghost_spawns
+        if n_ghosts is None:
+            n_ghosts = len(spawns)
+        self.ghosts = [
+            Ghost(*spawns[i % len(spawns)], GHOST_COLORS[i % len(GHOST_COLORS)],
+                  tile_size, hud_height, self.walls, FRIGHT_BLUE,
+                  base_sprite=ghost_sprite, rng=self.rng, house_rows=level_map.house_rows)
+            for i in range(n_ghosts)
+        ]
+        # Hayaletlerin grid indeksi (spatial.py): handle = self.ghosts'taki indeks.
+        # Hayaletler her hareket ettiğinde (update_ghosts, to_home, restore) güncelleniyor
+        self.ghost_index = SpatialHash(level_map.width, level_map.height, tile_size, hud_height)
+        for g in self.ghosts:
+            self.ghost_index.insert(g)
+
+        self.elapsed = 0.0        # simülasyon süresi (saniye)
+        self.ticks = 0
+
+        # Hayalet yapay zekası: None → her hayaletin kendi update'i (rastgele)
+        if ghost_ai not in GHOST_AI_NAMES:
+            raise ValueError(f"Bilinmeyen hayalet AI: {ghost_ai}")
+        self.ghost_ai_name = ghost_ai
+        self.ghost_ai = GhostAI(self) if ghost_ai == "classic" else None
+        self.game_over = False
+        self.ghosts_eaten = 0
+        self.cause = None         # oyun neden bitti? ("ghost" / "cleared")
+
+        # Olaylar (events.py): ses / HUD / istatistik buraya abone oluyor
+        self.bus = EventBus()
+        self._eaten = []          # bu tick'te yenen tile'lar (col, row, kind)
+        self.pellet_index.listeners.append(self._on_pellet_removed)
+
+        # Replay kaydı (replay.Recorder): her tick'in yönü buna bildiriliyor
+        self.recorder = None
+
+    def _on_pellet_removed(self, col, row, kind):
+        self._eaten.append((col, row, kind))
+
+    def _emit(self, events, event):
+        events.append(event)
+        self.bus.emit(event)
+
+    def apply_action(self, action):
+        #Dışarıdan gelen yönü Pac-Man'in bir SONRAKİ yönü olarak ayarlar.
+        dx, dy = action
+        self.pacman.next_dir_x = dx
+        self.pacman.next_dir_y = dy
+
+        # Agent için sprite yönünü güncelle
+        if (dx, dy) in DIR_NAMES:
+            self.pacman.dir_name = DIR_NAMES[(dx, dy)]
+
+    def step(self, action=None, dt=TICK_DT):
+        """
+        Oyunu dt saniye ilerletir ve bu tick'te olan olayların listesini döndürür.
+        Olaylar aynı zamanda self.bus abonelerine de gönderiliyor.
+        action: (dx, dy) ya da None.
+                None ise agent modunda utility agent karar verir,
+                human modunda Pac-Man'in mevcut next_dir'i kullanılır.
+        """
+        events = []
+        if self.game_over:
+            return events
+
+        pacman = self.pacman
+        ghosts = self.ghosts
+
+        #1) Kontrol (human veya agent)
+        if action is None and self.mode == "agent":
+            action = self.agent(self)
+        if action is not None:
+            self.apply_action(action)
+        if self.recorder is not None:
+            self.recorder.on_tick(self)
+
+        # 2) Pac-Man update
+        was_power = pacman.power_mode
+        eaten = self._eaten
+        eaten.clear()
+        pacman.update(dt)
+
+        # Power süresi bu tick'te dolduysa
+        if was_power and not pacman.power_mode:
+            self._emit(events, PowerEnded())
+
+        # Power pellet yendiyse
+        if pacman.just_ate_power:
+            pacman.power_mode = True
+            pacman.power_timer = POWER_DURATION
+            for g in ghosts:
+                g.set_frightened()
+
+        for col, row, kind in eaten:
+            if kind == POWER:
+                self._emit(events, PowerStarted(col, row))
+            else:
+                self._emit(events, PelletEaten(col, row))
+
+        # Tüm yemler bitti → bölüm temizlendi (sayaç indekste, grid taranmıyor)
+        if self.pellet_index.remaining == 0:
+            self.game_over = True
+            self.cause = "cleared"
+            self.elapsed += dt
+            self.ticks += 1
+            self._emit(events, LevelCleared())
+            return events
+
+        # Power süresi bittiğinde hayaletler normale dönsün
+        if not pacman.power_mode:
+            for g in ghosts:
+                if g.state != "normal":
+                    g.set_normal()
+
+        #3) Ghost update
+        self.update_ghosts(dt)
+
+        #4) Pac-Man – Ghost çarpışma kontrolü
+        self.check_collisions(events)
+
+        self.elapsed += dt
+        self.ticks += 1
+        return events
+
+    # step() fazları ayrı metotlar (profiler.Profiler.instrument bunları sarıyor)
+    def update_ghosts(self, dt):
+        if self.ghost_ai is not None:
+            self.ghost_ai.update(self, dt)
+        else:
+            for g in self.ghosts:
+                g.update(dt)
+        self.ghost_index.move_all()
+
+    def check_collisions(self, events):
+        # Sadece Pac-Man'in yakınındaki kovalardaki hayaletler (Rect üretmeden,
+        # colliderect kuralıyla); tek çarpışma yeterli → en küçük indeksli hayalet
+        pacman = self.pacman
+        hits = self.ghost_index.overlapping(pacman.x, pacman.y, pacman.size, pacman.size)
+        if not hits:
+            return
+        i = hits[0]
+        g = self.ghosts[i]
+
+        # Power modunda → hayalet yenir
+        if pacman.power_mode and g.state == "frightened":
+            pacman.score += 200
+            g.to_home()
+            self.ghost_index.move(i)
+            self.ghosts_eaten += 1
+            self._emit(events, GhostEaten(i))
+
+        # Normal mod → Pac-Man ölür
+        else:
+            pacman.alive = False
+            self.game_over = True
+            self.cause = "ghost"
+            self._emit(events, PacmanDied(i))
+
+    def snapshot(self):
+        """
+        Oyunun tam durumu, sade değerlerle (replay keyframe'leri için).
+        pellets: self.food sırasında, hâlâ duran yemlerin bit maskesi.
+        Çizimde kullanılan ara konumlar (prev_x/y) dahil değil.
+        """
+        p = self.pacman
+        pellets = 0
+        for i, (c, r, _) in enumerate(self.food):
+            if self.grid[r][c] != ' ':
+                pellets |= 1 << i
+        return {
+            "ticks": self.ticks,
+            "elapsed": self.elapsed,
+            "rng": self.rng.getstate(),
+            "ghosts_eaten": self.ghosts_eaten,
+            "game_over": self.game_over,
+            "cause": CAUSES.index(self.cause),
+            "pacman": (p.x, p.y, p.dir_x, p.dir_y, p.next_dir_x, p.next_dir_y,
+                       DIR_NAME_LIST.index(p.dir_name), p.score, p.alive,
+                       p.power_mode, p.power_timer, p.just_ate_power),
+            "ghosts": [(g.x, g.y, g.dir_x, g.dir_y, g.state == "frightened")
+                       for g in self.ghosts],
+            "pellets": pellets,
+        }
+
+    def restore(self, snap):
+        #snapshot() ile alınmış duruma geri döner (aynı harita / aynı hayalet sayısı)
+        self.ticks = snap["ticks"]
+        self.elapsed = snap["elapsed"]
+        self.rng.setstate(snap["rng"])
+        self.ghosts_eaten = snap["ghosts_eaten"]
+        self.game_over = snap["game_over"]
+        self.cause = CAUSES[snap["cause"]]
+
+        # Yemler: grid'i maskeden kur, indeksi baştan üret (dinleyiciler korunuyor)
+        pellets = snap["pellets"]
+        for i, (c, r, kind) in enumerate(self.food):
+            self.grid[r][c] = kind if pellets >> i & 1 else ' '
+        listeners = self.pellet_index.listeners
+        self.pellet_index = PelletIndex(self.grid)
+        self.pellet_index.listeners = listeners
+
+        p = self.pacman
+        (p.x, p.y, p.dir_x, p.dir_y, p.next_dir_x, p.next_dir_y, name, p.score,
+         p.alive, p.power_mode, p.power_timer, p.just_ate_power) = snap["pacman"]
+        p.dir_name = DIR_NAME_LIST[name]
+        p.prev_x, p.prev_y = p.x, p.y
+        p.pellet_index = self.pellet_index
+
+        for g, (x, y, dx, dy, frightened) in zip(self.ghosts, snap["ghosts"]):
+            g.x, g.y, g.dir_x, g.dir_y = x, y, dx, dy
+            g.prev_x, g.prev_y = x, y
+            if frightened:
+                g.set_frightened()
+            else:
+                g.set_normal()
+        self.ghost_index.move_all()
+        if self.ghost_ai is not None:
+            self.ghost_ai.sync(self)
+
+    def pellets_left(self):
+        #Haritada kalan yem + power pellet sayısı
+        return self.pellet_index.remaining
+
+
+AGENT_NAMES = ("utility", "search")
+
+
+def make_agent(name="utility", search_ms=None, search_depth=None, weights=None):
+    """
+    İsimden agent üretir (CLI'lar için).
+    "utility": tek adımlık utility agent
+    "search":  süre bütçeli expectimax (search_agent.py); search_ms karar başına
+               süre (0 → sadece derinlik sınırı, deterministik), search_depth en fazla ply
+    weights: weights.WeightProfile ya da JSON dosya yolu (None → orijinal sabitler)
+    """
+    if isinstance(weights, str):
+        weights = WeightProfile.load(weights)
+    if name == "utility":
+        return utility_agent if weights is None else make_utility_agent(weights)
+    if name == "search":
+        from search_agent import SearchAgent, SEARCH_BUDGET_MS, SEARCH_MAX_DEPTH
+        return SearchAgent(SEARCH_BUDGET_MS if search_ms is None else search_ms,
+                           SEARCH_MAX_DEPTH if search_depth is None else search_depth,
+                           weights or DEFAULT_WEIGHTS)
+    raise ValueError(f"Bilinmeyen agent: {name}")
+
+
+def record_result(results, mode, score, elapsed_sec):
+    """
+    Human / agent sonucunu last_results sözlüğüne yazar
+    ve iki mod da oynandıysa kazananı belirler.
+    """
+    # Sonuçları kaydet (human / agent)
+    if mode == "human":
+        results["human_score"] = score
+        results["human_time"] = elapsed_sec
+    elif mode == "agent":
+        results["agent_score"] = score
+        results["agent_time"] = elapsed_sec
+
+    # Kazananı belirle (iki mod da oynandıysa)
+    human_score = results["human_score"]
+    agent_score = results["agent_score"]
+    human_time = results["human_time"]
+    agent_time = results["agent_time"]
+
+    if human_score is not None and agent_score is not None:
+        if human_score > agent_score:
+            results["winner"] = "Human"
+        elif agent_score > human_score:
+            results["winner"] = "Agent"
+        else:
+            # Skor eşitse süreye bak
+            if human_time is not None and agent_time is not None:
+                if 0 < human_time < agent_time:
+                    results["winner"] = "Human"
+                elif 0 < agent_time < human_time:
+                    results["winner"] = "Agent"
+                else:
+                    results["winner"] = "Berabere"
+            else:
+                results["winner"] = "Berabere"
+    else:
+        # Yalnızca tek taraf oynadıysa kazanan göstermiyoruz
+        results["winner"] = ""
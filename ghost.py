@@ -1,23 +1,31 @@
 import pygame
-import random
+from rng import GameRng
 
 def tint_image(image, color):
-    base = image.convert_alpha()
-    w, h = base.get_size()
-
+    # Piksel piksel get_at/set_at yerine iki blend fill:
+    # önce RGB sıfırlanıyor (alpha korunuyor), sonra istenen renk ekleniyor.
+    # Sonuç: ghost şeklinin olduğu yerde renk = color, alpha = orijinal alpha.
+    tinted = image.convert_alpha()
     r, g, b = color
-    tinted = pygame.Surface((w, h), pygame.SRCALPHA)
+    tinted.fill((0, 0, 0, 255), special_flags=pygame.BLEND_RGBA_MULT)
+    tinted.fill((r, g, b, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    return tinted
 
-    for x in range(w):
-        for y in range(h):
-            pr, pg, pb, pa = base.get_at((x, y))
-            if pa == 0:
-                # Tam şeffaf piksel → ghost yok, dokunma
-                continue
-            # Ghost şeklinin olduğu yerde rengi değiştir, alpha'yı koru
-            tinted.set_at((x, y), (r, g, b, pa))
 
-    return tinted
+# (base sprite, renk, boyut) → tint'lenmiş sprite
+# Normal / frightened sprite'lar process boyunca bir kere üretilip
+# tüm hayaletler ve yeni oyunlar arasında paylaşılıyor.
+_tint_cache = {}
+
+
+def get_tinted(image, color):
+    key = (id(image), tuple(color), image.get_size())
+    entry = _tint_cache.get(key)
+    # id() tekrar kullanılabilir diye base sprite'ı da saklayıp aynı nesne mi bakıyoruz
+    if entry is None or entry[0] is not image:
+        entry = (image, tint_image(image, color))
+        _tint_cache[key] = entry
+    return entry[1]
 
 
 class Ghost:
@@ -29,19 +37,28 @@ class Ghost:
     def __init__(self, col, row, color,
                  tile_size,
                  hud_height,
-                 wall_rects,
+                 walls,
                  frightened_color=(0, 0, 255),
-                 base_sprite=None):
+                 base_sprite=None,
+                 rng=None,
+                 house_rows=(13, 16)):
 
         self.tile_size = tile_size
         self.hud_height = hud_height
-        self.wall_rects = wall_rects
+        self.walls = walls   # collision.WallGrid
+        # Ghost house'un iç satırları (r0, r1) haritadan geliyor (maps.LevelMap.house_rows);
+        # None → haritada ev yok
+        self.house_rows = house_rows
+        # Oyunun seed'li üreteci (rng.GameRng); verilmezse kendine bir tane açar
+        self.rng = rng if rng is not None else GameRng()
 
         # Tile koordinatından piksel koordinatına dönüşüm
         self.x = col * tile_size
         self.y = hud_height + row * tile_size
         self.home_x = self.x    # yenildiğinde döneceği konum
         self.home_y = self.y
+        self.prev_x = self.x    # önceki tick'teki konum (çizimde ara değer için)
+        self.prev_y = self.y
 
         self.size = tile_size - 4
         self.base_color = color
@@ -53,7 +70,7 @@ class Ghost:
         self.speed_frightened = 60
 
         # Başlangıç yönü rastgele
-        self.dir_x, self.dir_y = random.choice(
+        self.dir_x, self.dir_y = self.rng.choice(
             [(1, 0), (-1, 0), (0, 1), (0, -1)]
         )
 
@@ -64,9 +81,9 @@ class Ghost:
 
         if base_sprite is not None:
             # Normal renkli sprite
-            self.sprite_normal = tint_image(base_sprite, self.base_color)
+            self.sprite_normal = get_tinted(base_sprite, self.base_color)
             # Power modunda mavi sprite
-            self.sprite_fright = tint_image(base_sprite, self.frightened_color)
+            self.sprite_fright = get_tinted(base_sprite, self.frightened_color)
             self.sprite_current = self.sprite_normal
 
     # Çarpışma yardımcı fonksiyonları
@@ -81,8 +98,7 @@ class Ghost:
         if y is None:
             y = self.y
 
-        r = pygame.Rect(x, y, self.size, self.size)
-        return any(r.colliderect(w) for w in self.wall_rects)
+        return self.walls.hits(x, y, self.size, self.size)
 
     def possible_dirs(self):
         """
@@ -103,7 +119,9 @@ class Ghost:
             return []
 
         dirs = []
-        inside_house = (13 <= row <= 17)
+        # Evin alt duvar satırı da dahil (orada da U-dönüş serbest)
+        house = self.house_rows
+        inside_house = house is not None and house[0] <= row <= house[1] + 1
 
         for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
             # Ghost house dışındayken U-dönüşe izin vermeyelim
@@ -124,11 +142,13 @@ class Ghost:
         Ghost'un konumunu günceller.
         Ghost house içindeyken öncelik yukarı çıkıp labirente dağılmak olmalıdır buna göre yazdık.
         """
+        self.prev_x, self.prev_y = self.x, self.y
         speed = self.speed_normal if self.state == "normal" else self.speed_frightened
 
         # Satır hesabı (ghost house tespiti için)
         row = int((self.y - self.hud_height) // self.tile_size)
-        inside_house = (13 <= row <= 16)
+        house = self.house_rows
+        inside_house = house is not None and house[0] <= row <= house[1]
 
         # 1) Ghost house içindeysek kapıdan yukarı çıkmaya çalışsın
         if inside_house:
@@ -141,12 +161,12 @@ class Ghost:
                 # Kapalıysa normal yön seçimi
                 dirs = self.possible_dirs()
                 if dirs:
-                    self.dir_x, self.dir_y = random.choice(dirs)
+                    self.dir_x, self.dir_y = self.rng.choice(dirs)
         else:
             # 2) Labirent içinde normal random hareket
             dirs = self.possible_dirs()
             if dirs:
-                self.dir_x, self.dir_y = random.choice(dirs)
+                self.dir_x, self.dir_y = self.rng.choice(dirs)
 
         # 3) Pozisyonu güncelleme kısmı
         old_x, old_y = self.x, self.y
@@ -173,17 +193,26 @@ class Ghost:
     def to_home(self):
         #Hayalet yenildiğinde ghost house'a geri gönderilsin.
         self.x, self.y = self.home_x, self.home_y
+        self.prev_x, self.prev_y = self.x, self.y   # ışınlanma, ara değer yok
         self.set_normal()
 
     # ÇİZİM
-    def draw(self, surf):
+    def render_pos(self, alpha=1.0):
+        #Önceki tick ile şimdiki arasında ara konum (alpha: 0..1)
+        if alpha >= 1.0:
+            return self.x, self.y
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def draw(self, surf, alpha=1.0):
         #Ghost'u ekrana çizer.
+        x, y = self.render_pos(alpha)
         if self.sprite_current is not None:
-            surf.blit(self.sprite_current, (int(self.x), int(self.y)))
+            surf.blit(self.sprite_current, (int(x), int(y)))
         else:
             # Sprite yoksa basit renkli daire ile göster
             pygame.draw.circle(
                 surf, self.base_color,
-                (int(self.x + self.size / 2), int(self.y + self.size / 2)),
+                (int(x + self.size / 2), int(y + self.size / 2)),
                 self.size // 2
             )
@@ -0,0 +1,285 @@
+import numpy as np
+
+from maze_distance import get_maze_distances, map_key, DIRS, UNREACHABLE
+
+# Hedefli hayalet yapay zekası (klasik Pac-Man: Blinky / Pinky / Inky / Clyde).
+# Varsayılan hayaletler (ghost.py) her kavşakta rastgele yön seçiyor; burada ise
+# her hayaletin bir hedef tile'ı var ve kavşakta o hedefe giden en kısa yolun
+# ilk adımını seçiyor. Bu ilk adım harita başına bir kere hesaplanan next-hop
+# tablosundan okunuyor (maze_distance'ın mesafe matrisinden), yani karar O(1):
+# ne sqrt ne duvar taraması. Hayaletler tile merkezlerinden geçen çizgiler
+# üzerinde hareket ediyor; merkezi geçtikleri tick'te karar verip dönüyorlar.
+#
+# Modlar (süre oyunun elapsed'ından, durum tutulmuyor):
+#   scatter: her hayalet kendi köşesine
+#   chase:   Blinky → Pac-Man, Pinky → Pac-Man'in 4 önü,
+#            Inky → Blinky'den (Pac-Man'in 2 önü)'ne vektörün iki katı,
+#            Clyde → 8 tile'dan uzaksa Pac-Man, yakınsa kendi köşesi
+#   frightened: kavşakta rastgele (oyunun RNG'si), daha yavaş
+# 4'ten fazla hayalette kişilikler sırayla tekrar ediyor (i % 4); Inky kendi
+# dörtlüsünün Blinky'sini kullanıyor.
+
+GHOST_AI_NAMES = ("random", "classic")
+
+PERSONALITIES = ("blinky", "pinky", "inky", "clyde")
+
+# (süre sn, mod); son mod sonsuza kadar sürüyor (arcade 1. bölüm)
+SCHEDULE = [(7, "scatter"), (20, "chase"), (7, "scatter"), (20, "chase"),
+            (5, "scatter"), (20, "chase"), (5, "scatter"), (None, "chase")]
+
+CLYDE_RADIUS = 8
+ROW_LIMIT = 1024         # bellekte tutulan en fazla hedef satırı (küçük haritalarda hepsi sığıyor)
+NO_DIR = 4                                   # yön indeksi: henüz yön yok
+REVERSE = [DIRS.index((-dx, -dy)) for dx, dy in DIRS] + [NO_DIR]
+DIR_INDEX = {d: i for i, d in enumerate(DIRS)}
+
+
+def mode_at(elapsed):
+    #Oyun süresine göre scatter / chase
+    t = elapsed
+    for duration, mode in SCHEDULE:
+        if duration is None or t < duration:
+            return mode
+        t -= duration
+    return SCHEDULE[-1][1]
+
+
+class NavTable:
+    """
+    Harita başına navigasyon verisi.
+    nbr[node][d]: d yönündeki komşu düğüm (-1: duvar)
+    options[node][d_in]: d_in yönüyle gelen hayaletin seçebileceği yönler
+                         (geri dönüş yok; çıkmaz sokakta tek seçenek geri)
+    next_hop(node, d_in, target): target'a en kısa yolun ilk yönü (geri dönüşsüz);
+                                  hedef başına satır ilk kullanımda numpy ile
+                                  kuruluyor, sonra O(1) okuma. Büyük haritalarda
+                                  (mesafe satırları istendikçe hesaplanıyorsa) tüm
+                                  satırı kurmak yerine sadece o düğümün komşularına
+                                  bakılıyor; hedef satırları ROW_LIMIT ile sınırlı
+    snap[row][col]: her grid hücresi için en yakın yürünebilir düğüm (hedef duvara düşerse)
+    """
+
+    def __init__(self, level_map, distances=None):
+        self.distances = distances if distances is not None else get_maze_distances(level_map)
+        d = self.distances
+        self.width, self.height = d.width, d.height
+        n = len(d.cells)
+
+        nbr = np.full((n, 4), -1, dtype=np.int64)
+        for i, (c, r) in enumerate(d.cells):
+            for k, (dx, dy) in enumerate(DIRS):
+                nbr[i, k] = d.node(c + dx, r + dy)
+        self.nbr_array = nbr
+        self.nbr = nbr.tolist()
+
+        self.options = []
+        for i in range(n):
+            open_dirs = [k for k in range(4) if self.nbr[i][k] >= 0]
+            per_in = []
+            for d_in in range(5):
+                back = REVERSE[d_in]
+                opts = tuple(k for k in open_dirs if k != back)
+                per_in.append(opts or ((back,) if back != NO_DIR else ()))
+            self.options.append(per_in)
+
+        # Hedef satırları: rows[target][node * 5 + d_in] → yön (en fazla ROW_LIMIT tanesi)
+        self.rows = {}
+        self.dense = self.distances.dense
+        # Geri dönüş yasağı maskesi: (5, 4), d_in'e göre yasak yön
+        self._reverse_mask = np.zeros((5, 4), dtype=bool)
+        for d_in in range(4):
+            self._reverse_mask[d_in, REVERSE[d_in]] = True
+
+        self.snap = self._build_snap()
+
+    def _build_snap(self):
+        # Yürünebilir tüm düğümlerden çok kaynaklı BFS (duvarların içinden de)
+        d = self.distances
+        w, h = self.width, self.height
+        snap = [[-1] * w for _ in range(h)]
+        frontier = []
+        for i, (c, r) in enumerate(d.cells):
+            snap[r][c] = i
+            frontier.append((c, r))
+        while frontier:
+            nxt = []
+            for c, r in frontier:
+                for dx, dy in DIRS:
+                    nc, nr = c + dx, r + dy
+                    if 0 <= nc < w and 0 <= nr < h and snap[nr][nc] < 0:
+                        snap[nr][nc] = snap[r][c]
+                        nxt.append((nc, nr))
+            frontier = nxt
+        return snap
+
+    def _build_row(self, target):
+        # Her düğüm için komşuların hedefe mesafesi → en küçüğü (eşitlikte DIRS sırası)
+        dist = np.asarray(self.distances.matrix[target], dtype=np.int64)
+        nbr = self.nbr_array
+        cost = np.where(nbr >= 0, dist[np.maximum(nbr, 0)], UNREACHABLE + 1)   # (n, 4)
+        big = UNREACHABLE + 2
+        masked = np.where(self._reverse_mask[None, :, :], big, cost[:, None, :])   # (n, 5, 4)
+        best = masked.argmin(axis=2)
+        # Geri dönüş dışında çıkış yoksa (çıkmaz sokak) yasaksız en iyi yön, yani geri
+        stuck = masked.min(axis=2) > UNREACHABLE
+        best = np.where(stuck, cost.argmin(axis=1)[:, None], best)
+        row = best.astype(np.uint8).ravel().tolist()
+        if len(self.rows) >= ROW_LIMIT:
+            del self.rows[next(iter(self.rows))]   # en eski satır
+        self.rows[target] = row
+        return row
+
+    def next_hop(self, node, d_in, target):
+        row = self.rows.get(target)
+        if row is not None:
+            return row[node * 5 + d_in]
+        if self.dense:
+            return self._build_row(target)[node * 5 + d_in]
+        # Büyük harita: hedefin mesafe satırından sadece bu düğümün seçenekleri
+        dist = self.distances.matrix[target]
+        nbr = self.nbr[node]
+        back = REVERSE[d_in]
+        best, best_d = NO_DIR, UNREACHABLE + 1
+        for k in range(4):
+            v = nbr[k]
+            if v >= 0 and k != back and dist[v] < best_d:
+                best, best_d = k, dist[v]
+        if best == NO_DIR:
+            best = back     # çıkmaz sokak
+        return best
+
+    def target_node(self, col, row):
+        #Herhangi bir (harita dışı olabilir) tile hedefini en yakın düğüme oturt
+        col = min(max(col, 0), self.width - 1)
+        row = min(max(row, 0), self.height - 1)
+        return self.snap[row][col]
+
+
+_tables = {}
+
+
+def get_nav_table(level_map):
+    key = map_key(level_map)
+    table = _tables.get(key)
+    if table is None:
+        table = NavTable(level_map)
+        _tables[key] = table
+    return table
+
+
+class GhostAI:
+    """
+    GameState'in hayaletlerini hedefli olarak hareket ettirir
+    (GameState.update_ghosts bunu çağırıyor). Hayalet nesneleri (ghost.Ghost)
+    konum / yön / durum / çizim için aynen kullanılıyor; sadece update yerine bu.
+    """
+
+    def __init__(self, game):
+        self.nav = get_nav_table(game.level_map)
+        self.tile = game.tile_size
+        self.top = game.hud_height
+        self.rng = game.rng
+        w, h = self.nav.width, self.nav.height
+        # Köşeler (harita dışında; snap ile en yakın koridora oturuyor)
+        corners = {"blinky": (w - 3, -4), "pinky": (2, -4),
+                   "inky": (w - 1, h + 1), "clyde": (0, h + 1)}
+        self.personality = [PERSONALITIES[i % 4] for i in range(len(game.ghosts))]
+        self.scatter = [self.nav.target_node(*corners[p]) for p in self.personality]
+        self.mode = mode_at(game.elapsed)
+
+    def sync(self, game):
+        #restore() sonrası: mod süreden yeniden (sahte bir mod değişimi / geri dönüş olmasın)
+        self.mode = mode_at(game.elapsed)
+
+    def update(self, game, dt):
+        mode = mode_at(game.elapsed)
+        reverse = mode != self.mode
+        self.mode = mode
+
+        pacman = game.pacman
+        t = self.tile
+        half = pacman.size / 2
+        pac = ((pacman.x + half) // t, (pacman.y + half - self.top) // t)
+        for i, g in enumerate(game.ghosts):
+            if reverse and g.state == "normal":
+                # Mod değişiminde normal hayaletler geri döner (arcade kuralı)
+                g.dir_x, g.dir_y = -g.dir_x, -g.dir_y
+            self._move(game, i, g, dt, mode, pac)
+
+    def _target(self, game, i, mode, pac):
+        nav = self.nav
+        if mode == "scatter":
+            return self.scatter[i]
+        personality = self.personality[i]
+        pc, pr = int(pac[0]), int(pac[1])
+        p = game.pacman
+        if personality == "blinky":
+            return nav.target_node(pc, pr)
+        if personality == "pinky":
+            return nav.target_node(pc + 4 * p.dir_x, pr + 4 * p.dir_y)
+        if personality == "inky":
+            b = game.ghosts[i - 2]   # dörtlünün Blinky'si (i % 4 == 2)
+            half = b.size / 2
+            bc = int((b.x + half) // self.tile)
+            br = int((b.y + half - self.top) // self.tile)
+            ac, ar = pc + 2 * p.dir_x, pr + 2 * p.dir_y
+            return nav.target_node(2 * ac - bc, 2 * ar - br)
+        # clyde: uzaktaysa kovala, yakındaysa köşesine
+        g = game.ghosts[i]
+        half = g.size / 2
+        gc = int((g.x + half) // self.tile)
+        gr = int((g.y + half - self.top) // self.tile)
+        if (gc - pc) ** 2 + (gr - pr) ** 2 > CLYDE_RADIUS ** 2:
+            return nav.target_node(pc, pr)
+        return self.scatter[i]
+
+    def _move(self, game, i, g, dt, mode, pac):
+        """
+        Merkez çizgisi üzerinde hareket: bu tick'te tile merkezine varıyor ya da
+        geçiyorsa merkeze oturup yeni yönü seçer, kalan yolu yeni yönde gider.
+        """
+        nav = self.nav
+        t = self.tile
+        g.prev_x, g.prev_y = g.x, g.y
+        speed = g.speed_normal if g.state == "normal" else g.speed_frightened
+        step = speed * dt
+
+        half = g.size / 2
+        cx = g.x + half
+        cy = g.y + half - self.top
+        col = int(cx // t)
+        row = int(cy // t)
+        node = nav.distances.node(col, row)
+        if node < 0:
+            # Harita dışı / duvar içi (olmamalı): eski hareket
+            g.x += g.dir_x * step
+            g.y += g.dir_y * step
+            return
+
+        d_in = DIR_INDEX.get((g.dir_x, g.dir_y), NO_DIR)
+        center_x = col * t + t / 2
+        center_y = row * t + t / 2
+        ahead = (center_x - cx) * g.dir_x + (center_y - cy) * g.dir_y
+
+        # Merkez arkada kaldıysa sıradaki tile'a gidiyoruz; o tile duvarsa hemen karar ver
+        blocked = d_in == NO_DIR or (ahead < 0 and nav.nbr[node][d_in] < 0)
+        if not blocked and not (0 <= ahead <= step):
+            g.x += g.dir_x * step
+            g.y += g.dir_y * step
+            return
+
+        # Karar noktası: merkeze otur, yön seç, kalan yolu git
+        rest = step - ahead if not blocked else step
+        if g.state == "frightened":
+            opts = nav.options[node][d_in]
+            d = self.rng.choice(opts) if opts else NO_DIR
+        else:
+            d = nav.next_hop(node, d_in, self._target(game, i, mode, pac))
+
+        g.x = center_x - half
+        g.y = self.top + center_y - half
+        if d == NO_DIR:
+            return
+        g.dir_x, g.dir_y = DIRS[d]
+        g.x += g.dir_x * rest
+        g.y += g.dir_y * rest
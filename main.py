@@ -1,20 +1,27 @@
+import time
+_startup_begin = time.perf_counter()
+
+import os
 import pygame
 import sys
-import random
-from pygame import mixer
-from pacman import Pacman
-from ghost import Ghost
-
-pygame.init()
-mixer.init()
-
-# GENEL AYARLAR
-TILE_SIZE = 24
-GRID_WIDTH = 28
-GRID_HEIGHT = 31
-
-HUD_HEIGHT = 40  # üstte skor / süre barı
-
+import argparse
+import assets
+from game import (GameState, record_result, make_agent, AGENT_NAMES, GHOST_AI_NAMES,
+                  LEVEL_MAP, TILE_SIZE, GRID_WIDTH, GRID_HEIGHT, HUD_HEIGHT, TICK_DT, TICK_RATE)
+from maps import load_map
+from events import PacmanDied, LevelCleared
+from render import MazeLayer, DirtyRenderer, draw_pellets
+from audio import Audio
+from rng import GameRng
+from weights import WeightProfile
+from profiler import Profiler, ProfilerOverlay
+import replay
+
+# Mixer burada açılmıyor; ses istenirse Audio() ilk oluşturulunca açılıyor
+pygame.display.init()
+pygame.font.init()
+
+# GENEL AYARLAR (harita boyutları game.py'de; --map ile pencere haritaya göre yeniden açılıyor)
 SCREEN_WIDTH = GRID_WIDTH * TILE_SIZE
 SCREEN_HEIGHT = HUD_HEIGHT + GRID_HEIGHT * TILE_SIZE
 
@@ -22,18 +29,19 @@ screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Pac-Man (Utility Agent)")
 
 clock = pygame.time.Clock()
+FPS = 60
+
+# Makine takılırsa (pencere sürükleme vb.) tek frame'de en fazla bu kadar simülasyon telafi edilir
+MAX_FRAME_TIME = 0.25
+
+# Hızlı ileri sarma: gerçek zamanın kaç katı simüle edilsin (0 = sınırsız, çizim yine FPS'te)
+SPEED_STEPS = [1, 2, 4, 8, 16, 0]
+# Sınırsız modda frame başına simülasyona ayrılan gerçek süre (kalan kısım çizim için)
+UNCAPPED_BUDGET = 0.8 / FPS
 
 # Renkler
-BLACK = (0, 0, 0)
-BLUE = (50, 100, 255)
-YELLOW = (255, 255, 0)
 WHITE = (240, 240, 240)
 GREY = (40, 40, 40)
-RED = (220, 0, 0)
-PINK = (255, 105, 180)
-CYAN = (0, 200, 200)
-ORANGE = (255, 165, 0)
-FRIGHT_BLUE = (0, 0, 255)
 
 # Yazı tipleri
 font = pygame.font.SysFont(None, 24)
@@ -44,354 +52,74 @@ menu_title_font = pygame.font.SysFont(None, 64)  # başlık
 menu_sub_font   = pygame.font.SysFont(None, 32)  # alt başlık
 menu_opt_font   = pygame.font.SysFont(None, 28)  # seçenekler, info
 
-POWER_DURATION = 7.0  # power pellet süresi saniye cinsinden
-
+small_font = pygame.font.SysFont(None, 20)      # profiler tablosu
 
-# SES DOSYALARI
-chomp_sound      = mixer.Sound("assets/sounds/chomp.wav")       # küçük nokta
-power_sound      = mixer.Sound("assets/sounds/power.wav")       # büyük nokta
-eat_ghost_sound  = mixer.Sound("assets/sounds/eat_ghost.wav")   # hayalet yeme
-death_sound      = mixer.Sound("assets/sounds/death.wav")       # ölüm
-start_sound      = mixer.Sound("assets/sounds/start.wav")       # yeni oyun
 
-# Ses seviyeleri
-chomp_sound.set_volume(0.4)
-power_sound.set_volume(0.5)
-eat_ghost_sound.set_volume(0.7)
-death_sound.set_volume(0.7)
-start_sound.set_volume(0.6)
+# SPRITE YÜKLEME (ön işlenmiş sprite'lar .cache/assets/ altından, yoksa üretiliyor)
+_assets_begin = time.perf_counter()
 
-
-# PAC-MAN SPRITE YÜKLEME
 pacman_images = None
 try:
-    base_img = pygame.image.load("assets/pacman_right.png").convert_alpha()
-    base_img = pygame.transform.scale(base_img, (TILE_SIZE - 4, TILE_SIZE - 4))
-    pacman_images = {
-        "RIGHT": base_img,
-        "LEFT": pygame.transform.flip(base_img, True, False),
-        "UP": pygame.transform.rotate(base_img, 90),
-        "DOWN": pygame.transform.rotate(base_img, -90),
-    }
+    pacman_images = assets.load_pacman_images(TILE_SIZE)
 except Exception as e:
     pacman_images = None
 
-
-# GHOST SPRITE YÜKLEME
 ghost_base_sprite = None
 try:
-    gimg = pygame.image.load("assets/ghost.png").convert_alpha()
-
-    # PNG'nin arka planını şeffaf yapıyoruz
-    w, h = gimg.get_size()
-    for x in range(w):
-        for y in range(h):
-            r, g, b, a = gimg.get_at((x, y))
-            if r > 230 and g > 230 and b > 230: 
-                gimg.set_at((x, y), (r, g, b, 0))
-
-    # Labirentteki tile boyutuna göre ölçekle
-    gimg = pygame.transform.smoothscale(gimg, (TILE_SIZE - 4, TILE_SIZE - 4))
-    ghost_base_sprite = gimg
+    ghost_base_sprite = assets.load_ghost_sprite(TILE_SIZE)
 except Exception as e:
     print("Ghost sprite yüklenemedi, daire kullanılacak:", e)
 
-# LEVEL MAP (pac-man haritasi)
-LEVEL_MAP = [
-    "############################",
-    "#............##............#",
-    "#.####.#####.##.#####.####.#",
-    "#o####.#####.##.#####.####o#",
-    "#.####.#####.##.#####.####.#",
-    "#..........................#",
-    "#.####.##.########.##.####.#",
-    "#.####.##.########.##.####.#",
-    "#......##....##....##......#",
-    "######.#####.##.#####.######",
-    "######.#####.##.#####.######",
-    "######.##..........##.######",
-    "######.##.###--###.##.######",
-    "######.##.#      #.##.######",
-    "######.##.#      #.##.######",
-    "######.##.#      #.##.######",
-    "######.##.#      #.##.######",
-    "######.##.########.##.######",
-    "######.##..........##.######",
-    "#............##............#",
-    "#.####.#####.##.#####.####.#",
-    "#.####.#####.##.#####.####.#",
-    "#o..##................##..o#",
-    "###.##.##.########.##.##.###",
-    "#......##....##....##......#",
-    "#.##########.##.##########.#",
-    "#..........................#",
-    "#.##########.##.##########.#",
-    "#..........................#",
-    "#o########################o#",
-    "############################"
-]
-
-# grid = 2D list formu
-grid = [list(row) for row in LEVEL_MAP]
-
-# Duvarların rect listesi (çarpışma için)
-wall_rects = []
-for r, row in enumerate(grid):
-    for c, t in enumerate(row):
-        if t == "#":
-            wall_rects.append(
-                pygame.Rect(c * TILE_SIZE, HUD_HEIGHT + r * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            )
-
-
-def draw_wall(surface, row, col):
-    #Labirentteki duvar çizimi
-    x = col * TILE_SIZE
-    y = HUD_HEIGHT + row * TILE_SIZE
-
-    inset = 4
-    thick = 3
-
-    up = (row > 0 and grid[row - 1][col] == '#')
-    down = (row < GRID_HEIGHT - 1 and grid[row + 1][col] == '#')
-    left = (col > 0 and grid[row][col - 1] == '#')
-    right = (col < GRID_WIDTH - 1 and grid[row][col + 1] == '#')
-
-    if not up:
-        pygame.draw.line(surface, BLUE, (x, y + inset), (x + TILE_SIZE, y + inset), thick)
-    if not down:
-        pygame.draw.line(surface, BLUE, (x, y + TILE_SIZE - inset), (x + TILE_SIZE, y + TILE_SIZE - inset), thick)
-    if not left:
-        pygame.draw.line(surface, BLUE, (x + inset, y), (x + inset, y + TILE_SIZE), thick)
-    if not right:
-        pygame.draw.line(surface, BLUE, (x + TILE_SIZE - inset, y), (x + TILE_SIZE - inset, y + TILE_SIZE), thick)
-
-
-# Utility-based Agent
-def agent_choose_direction(pacman, ghosts):
-    """
-    Utility-temelli yön seçimi:
-    ANA HEDEFLER:
-    1) Her zaman ÖNCE hayatta kal (NORMAL + POWER modda)
-    2) En kısa ve mantıklı yollardan pellet'leri yiyip oyunu bitirmeye çalış
-    3) Power pellet varsa ve güvenliyse ona yönel
-    4) POWER modda ise hayaletleri yeme eğilimi (yakındaysa + güvenliyse yenir)
-    Ekstra:
-    - Boş ve uzun koridorlara girip zaman kaybetme eğilimini azaltır
-    - Loop history ile aynı bölgede dönüp durmayı azaltır
-    """
-
-    # Pac-Man'in merkez koordinatları (piksel cinsinden)
-    px = pacman.x + pacman.size / 2
-    py = pacman.y + pacman.size / 2
-
-    # Grid (satır/sütun) koordinatı
-    col = int(px // TILE_SIZE)
-    row = int((py - HUD_HEIGHT) // TILE_SIZE)
-
-    cur_dx, cur_dy = pacman.dir_x, pacman.dir_y
-    cur_dir = (cur_dx, cur_dy)
-    reverse_dir = (-cur_dx, -cur_dy)
-
-    # Ekran dışı durum
-    if not (0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH):
-        return cur_dir
-
-    # LOOP HISTORY (dönüp durmayı engellemek için)
-    if not hasattr(pacman, "last_positions"):
-        pacman.last_positions = []          # sadece (col,row) tutacağız
-
-    pacman.last_positions.append((col, row))
-    # Son 20 adımı saklıyoruz(loop'ları görebilmesi icin)
-    if len(pacman.last_positions) > 20:
-        pacman.last_positions.pop(0)
-
-    # Tile merkezine çok uzaksa, önce merkeze yaklaş (yumuşak bir kilit)
-    center_x = col * TILE_SIZE + TILE_SIZE / 2
-    center_y = HUD_HEIGHT + row * TILE_SIZE + TILE_SIZE / 2
-    dist_to_center = ((px - center_x) ** 2 + (py - center_y) ** 2) ** 0.5
-    if dist_to_center > 3 and cur_dir != (0, 0):
-        # Şu anki yön fena değil, merkezlenme bitmeden yön değiştirme
-        return cur_dir
-
-    # Olası yönler ve legal yönler
-    all_dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-    legal_dirs = []
-
-    for dx, dy in all_dirs:
-        test_col = col + dx
-        test_row = row + dy
-
-        # Grid sınırı
-        if not (0 <= test_row < GRID_HEIGHT and 0 <= test_col < GRID_WIDTH):
-            continue
-        # Duvarsa geçersiz
-        if grid[test_row][test_col] == '#':
-            continue
-        # Pac-Man fiziksel olarak o yöne adım atabiliyor mu kontrol ediyoruz
-        if not pacman.can_move(dx, dy):
-            continue
-
-        legal_dirs.append((dx, dy))
-
-    if not legal_dirs:
-        # Hiçbir yere gidemiyorsa şu anki yönü koru
-        return cur_dir
-
-    # 180° ani geri dönüşleri mümkünse engelliyoruz aynı yönü gidip gelmemesi icin
-    candidate_dirs = [d for d in legal_dirs if d != reverse_dir]
-    if not candidate_dirs:
-        candidate_dirs = legal_dirs
-
-    best_dir = candidate_dirs[0]
-    best_score = -1e9
-
-    # Haritadaki pellet & power pellet listeleri
-    pellets = [
-        (c, r)
-        for r in range(GRID_HEIGHT)
-        for c in range(GRID_WIDTH)
-        if grid[r][c] == '.'
-    ]
-    powers = [
-        (c, r)
-        for r in range(GRID_HEIGHT)
-        for c in range(GRID_WIDTH)
-        if grid[r][c] == 'o'
-    ]
-
-    # Yardımcı: bir yönde ileriye bakıp
-    #           kaç adım içinde kaç yem/power var?
-    def pellets_ahead(start_c, start_r, dx, dy, steps=6):
-        p_count = 0
-        pow_count = 0
-        c, r = start_c, start_r
-        for _ in range(steps):
-            c += dx
-            r += dy
-            if not (0 <= r < GRID_HEIGHT and 0 <= c < GRID_WIDTH):
-                break
-            if grid[r][c] == '#':
-                break
-            if grid[r][c] == '.':
-                p_count += 1
-            elif grid[r][c] == 'o':
-                pow_count += 1
-        return p_count, pow_count
-
-    # Her aday yönde utility fayda hesabı
-    for dx, dy in candidate_dirs:
-        score = 0.0
-        test_col = col + dx
-        test_row = row + dy
-
-        # 1) Hayalet mesafeleri
-        nearest_danger = 9999  # normal (tehlikeli) hayaletler
-        nearest_fright = 9999  # frightened (yenebilir) hayaletler
-
-        for g in ghosts:
-            gx = g.x + g.size / 2
-            gy = g.y + g.size / 2
-
-            ghost_col = int(gx // TILE_SIZE)
-            ghost_row = int((gy - HUD_HEIGHT) // TILE_SIZE)
-
-            dist = abs(ghost_col - test_col) + abs(ghost_row - test_row)
-
-            if g.state == "frightened":
-                if dist < nearest_fright:
-                    nearest_fright = dist
-            else:
-                if dist < nearest_danger:
-                    nearest_danger = dist
-
-        if nearest_danger == 9999:
-            nearest_danger = 9999.0
-        if nearest_fright == 9999:
-            nearest_fright = 9999.0
-
-        # 1.a) NORMAL mod: hayatta kalma + kaçış
-        if not pacman.power_mode:
-            # Hayalet 10 tile'dan yakınsa agresif kaç
-            if nearest_danger < 10:
-                # Uzaklık azaldıkça ceza çok büyür
-                score -= 2600.0 / (nearest_danger + 0.1)
-            # Genel olarak hayaletten uzak olmak iyi, ama aşırı da abartmıyoruz
-            score += nearest_danger * 1.2
-
-
-        # 1.b) POWER mod: hayalet yeme İKİNCİ planda
-        else:
-            # Sadece çok yakın frightened hayalet varsa bonus ver
-            # (yolun üstündeyse / yakınsa ye, yoksa yemlere odaklan)
-            if nearest_fright < 4:
-                score += 550.0 / (nearest_fright + 0.1)
-
-            # POWER modda bile çok tehlikeli pozisyonlardan kaçın
-            if nearest_danger < 3:
-                score -= 600.0 / (nearest_danger + 0.1)
-
-        # 2) Yem & power pellet utility
-        #    Asıl amaç: tüm pellet'leri hızlı bir şekilde bitirmek
-        # Her durumda pellet toplamak ana hedef:
-        pellet_weight = 55.0 if not pacman.power_mode else 45.0
-
-        # Power pellet:
-        # - NORMAL modda: yüksek öncelik (kaçış/saldırı avantajı)
-        # - POWER modda: neredeyse önemsiz (süre zaten çalışıyor)
-        power_weight = 350.0 if not pacman.power_mode else 10.0
-
-        # En yakın pellet'e göre puan
-        if pellets:
-            pellet_dist = min(
-                abs(cx - test_col) + abs(ry - test_row) for cx, ry in pellets
-            )
-            if pellet_dist < 1:
-                pellet_dist = 1
-            score += pellet_weight / pellet_dist
-
-        # En yakın power pellet'e göre puan
-        if powers:
-            power_dist = min(
-                abs(cx - test_col) + abs(ry - test_row) for cx, ry in powers
-            )
-            if power_dist < 1:
-                power_dist = 1
-            score += power_weight / power_dist
-
-        # 3) Koridor boşluğu (tamamen boş yollardan kaçınma)
-        p_ahead, pow_ahead = pellets_ahead(col, row, dx, dy, steps=6)
-
-        # İleride hiç yem yok, power da yoksa → zaman kaybı gibi davran
-        if p_ahead == 0 and pow_ahead == 0:
-            score -= 90.0
-
-        # 4) Aynı yönde devam etme bonusu
-        #    (gereksiz zigzag'ları azaltır)
-        if (dx, dy) == cur_dir:
-            score += 5
-
-        # 5) LOOP CEZASI (aynı bölgede
-        #    dönüp durmayı azaltmak için)
-        if (test_col, test_row) in pacman.last_positions:
-            score -= 200.0
-
-        # En iyi yönü güncelle
-        if score > best_score:
-            best_score = score
-            best_dir = (dx, dy)
-
-    return best_dir
-
+_startup_end = time.perf_counter()
+print(f"Başlangıç: {(_startup_end - _startup_begin) * 1000:.0f} ms "
+      f"(sprite'lar {(_startup_end - _assets_begin) * 1000:.0f} ms, "
+      f"asset cache {assets.stats['hits']} hit / {assets.stats['misses']} miss)")
 
 # GLOBAL STATE
-PLAYER_TYPE = None # "human" veya "agent"
-pacman = None
-ghosts = []
-start_time = 0
-game_over = False
+PLAYER_TYPE = None # "human", "agent" veya "replay"
+game = None        # aktif GameState (oyun kuralları game.py'de)
 GAME_STATE = "menu"
 
+# Duvarlar bir kere çizilip cache'leniyor (harita / tile boyutu değişirse yenilenir)
+maze_layer = MazeLayer()
+
+# --dirty-rects: sadece değişen bölgeleri ekrana gönderen çizim modu
+DIRTY_RECTS = False
+renderer = None
+
+# Ses (--mute ile hiç açılmıyor) ve --log-events ile olay logu
+audio = None
+LOG_EVENTS = False
+
+# Agent modunda oynayan agent (--agent, --search-ms, --search-depth)
+AGENT_OPTS = {"name": "utility", "search_ms": None, "search_depth": None, "weights": None}
+
+# Hayaletler (--ghost-ai, --ghosts): zorluk ayarı, iki modda da geçerli
+GHOST_OPTS = {"ghost_ai": "random", "n_ghosts": None}
+
+# Oynanan harita (--map FILE; varsayılan klasik harita)
+LEVEL = LEVEL_MAP
+
+# Her yeni oyunun seed'i bu koşu üretecinden çekiliyor (--seed ile tekrar üretilebilir)
+run_rng = GameRng()
+
+# --record DIR: her oyunun replay'i buraya; --replay FILE: kayıt oynatma
+RECORD_DIR = None
+recorder = None
+player = None      # replay.ReplayPlayer (sadece replay modunda)
+
+# Replay'de ←/→ ile kaç tick atlanıyor (10 sn)
+SEEK_TICKS = 10 * TICK_RATE
+
+# Aktif hız (SPEED_STEPS'ten biri; TAB ile değişiyor) ve HUD'daki ölçülen çarpan
+SPEED = 1
+speed_label = ""
+
+# Faz profiler'ı (F3 ile HUD altında tablo); kapalıyken döngüye maliyeti yok denecek kadar az
+profiler = Profiler()
+profiler_overlay = ProfilerOverlay(profiler, small_font, HUD_HEIGHT + 2)
+PROFILE_OUT = None   # çıkışta ölçümlerin yazılacağı dosya (.json / .csv / .trace.json)
+
 # Son oyun sonuçlarını tutan sözlük
 last_results = {
     "human_score": None,
@@ -409,59 +137,186 @@ def reset_game(mode):
     mode: "human" → klavye ile,
           "agent" → utility-based Pac-Man
     """
-    global pacman, ghosts, grid, game_over, start_time, PLAYER_TYPE
+    global game, PLAYER_TYPE, player, recorder
 
     PLAYER_TYPE = mode
+    player = None
+    agent = make_agent(AGENT_OPTS["name"], AGENT_OPTS["search_ms"], AGENT_OPTS["search_depth"],
+                       AGENT_OPTS["weights"]) if mode == "agent" else None
+    game = GameState(mode, pacman_images=pacman_images, ghost_sprite=ghost_base_sprite,
+                     seed=run_rng.next_u64(), agent=agent, level_map=LEVEL, **GHOST_OPTS)
+
+    bus = game.bus
+    bus.subscribe(PacmanDied, on_game_end)
+    bus.subscribe(LevelCleared, on_game_end)
+    if RECORD_DIR is not None:
+        recorder = replay.Recorder(game)
+    attach_game(f"Yeni oyun ({mode}), seed={game.seed}")
+
+
+def start_replay(path):
+    #Kaydedilmiş bir oyunu oynatmaya başla
+    global game, PLAYER_TYPE, player, recorder
+
+    PLAYER_TYPE = "replay"
+    recorder = None
+    player = replay.ReplayPlayer(replay.load(path), pacman_images=pacman_images,
+                                 ghost_sprite=ghost_base_sprite, level_map=LEVEL)
+    game = player.game
+    attach_game(f"Replay: {path} ({player.replay.mode}), seed={game.seed}")
+
+
+def set_level(level):
+    #Haritayı değiştir; pencere haritanın boyutuna göre yeniden açılıyor
+    global LEVEL, screen, SCREEN_WIDTH, SCREEN_HEIGHT
+    LEVEL = level
+    SCREEN_WIDTH = len(level[0]) * TILE_SIZE
+    SCREEN_HEIGHT = HUD_HEIGHT + len(level) * TILE_SIZE
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    maze_layer.invalidate()
+
+
+def attach_game(title):
+    #Olay aboneleri: ses, log, dirty-rect HUD
+    global renderer
+
+    bus = game.bus
+    if audio is not None:
+        audio.attach(bus)
+    if LOG_EVENTS:
+        print(title)
+        bus.subscribe_all(log_event)
+
+    if DIRTY_RECTS:
+        if renderer is None:
+            renderer = DirtyRenderer(screen, maze_layer, TILE_SIZE, HUD_HEIGHT, draw_hud)
+            renderer.overlay = profiler_overlay.draw
+        renderer.attach(game)
+
+    # Profiler açıksa oyun içi fazlar (agent, Pac-Man, hayaletler, çarpışma)
+    profiler.instrument(game)
 
-    # Haritayı sıfırla (tüm pellet'ler geri gelsin)
-    grid = [list(row) for row in LEVEL_MAP]
+    # Yeni oyun sesi
+    if audio is not None:
+        audio.play_start()
 
-    # Pac-Man başlangıç konumu
-    pacman = Pacman(1, 1, TILE_SIZE, HUD_HEIGHT, grid, wall_rects,
-                    pacman_images=pacman_images, color=YELLOW)
 
-    # Ghost'lar ghost house içinde başlıyor
-    ghosts = [
-        Ghost(13, 15, RED,    TILE_SIZE, HUD_HEIGHT, wall_rects, FRIGHT_BLUE, base_sprite=ghost_base_sprite),
-        Ghost(14, 15, CYAN,   TILE_SIZE, HUD_HEIGHT, wall_rects, FRIGHT_BLUE, base_sprite=ghost_base_sprite),
-        Ghost(13, 16, PINK,   TILE_SIZE, HUD_HEIGHT, wall_rects, FRIGHT_BLUE, base_sprite=ghost_base_sprite),
-        Ghost(14, 16, ORANGE, TILE_SIZE, HUD_HEIGHT, wall_rects, FRIGHT_BLUE, base_sprite=ghost_base_sprite),
-    ]
+def on_game_end(ev):
+    #Ölüm ya da bölüm sonu → son sonuçlar tablosunu güncelle, replay'i kaydet
+    global recorder
+    record_result(last_results, PLAYER_TYPE, game.pacman.score, int(game.elapsed))
+    if recorder is not None:
+        os.makedirs(RECORD_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d_%H%M%S')}_{PLAYER_TYPE}_{game.seed}.pmr"
+        replay.save(os.path.join(RECORD_DIR, name), recorder.finish())
+        recorder = None
 
-    game_over = False
-    start_time = pygame.time.get_ticks()
 
-    # Yeni oyun sesi
-    start_sound.play()
+def finished():
+    #Oyun bitti mi (replay'de kayıt sonuna gelindiyse de bitmiş sayılıyor)
+    return game.game_over or (player is not None and player.at_end)
 
 
-# ÇİZİM FONKSİYONLARI
-def draw_grid(surface):
-    """Labirenti, pellet'leri ve üstteki skor/süre barını çizer."""
-    surface.fill(BLACK)
+def advance():
+    #Bir simülasyon tick'i (replay'de kayıttaki yönle)
+    if player is not None:
+        player.step()
+    else:
+        game.step(None, TICK_DT)
+
 
-    # Üst gri bar
+def log_event(ev):
+    print(f"[{game.elapsed:7.2f} sn] {ev!r}")
+
+
+def toggle_profiler():
+    #F3: tablo aç / kapa; ölçüm tablo açıkken ya da --profile-out verildiyse yapılıyor
+    visible = profiler_overlay.toggle()
+    profiler.enable(visible or PROFILE_OUT is not None)
+    if game is not None:
+        profiler.instrument(game)
+
+
+def quit_game():
+    if PROFILE_OUT is not None:
+        profiler.export(PROFILE_OUT)
+        print(f"Profiler: {PROFILE_OUT}")
+    pygame.quit()
+    sys.exit()
+
+
+class SpeedMeter:
+    """
+    Gerçekleşen hız çarpanı: simüle edilen süre / geçen gerçek süre.
+    Yarım saniyelik pencerelerle ölçülüyor ki HUD her frame titremesin.
+    """
+
+    WINDOW = 0.5
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+        self.value = None
+
+    def add(self, sim_time, wall_time):
+        #Pencere dolduysa yeni değeri döndürür, yoksa None
+        self.sim_time += sim_time
+        self.wall_time += wall_time
+        if self.wall_time < self.WINDOW:
+            return None
+        self.value = self.sim_time / self.wall_time
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+        return self.value
+
+
+def speed_text(speed):
+    return "Hız: x" + ("MAX" if speed == 0 else str(speed))
+
+
+def set_speed(speed):
+    global SPEED, speed_label
+    SPEED = speed
+    speed_meter.reset()
+    speed_label = "" if speed == 1 else speed_text(speed)
+    if renderer is not None:
+        renderer.refresh_hud()
+
+
+speed_meter = SpeedMeter()
+
+
+# ÇİZİM FONKSİYONLARI
+def draw_hud(surface):
+    #Üstteki skor / süre barı
     pygame.draw.rect(surface, GREY, (0, 0, SCREEN_WIDTH, HUD_HEIGHT))
 
     # Skor ve süre
-    elapsed = (pygame.time.get_ticks() - start_time) // 1000
-    s1 = font.render(f"Skor: {pacman.score}", True, WHITE)
+    elapsed = int(game.elapsed)
+    s1 = font.render(f"Skor: {game.pacman.score}", True, WHITE)
     s2 = font.render(f"Süre: {elapsed} sn", True, WHITE)
     surface.blit(s1, (10, 10))
     surface.blit(s2, (SCREEN_WIDTH - 150, 10))
 
-    # Harita içi pellet ve power pellet'ler
-    for r, row in enumerate(grid):
-        for c, t in enumerate(row):
-            if t == "#":
-                draw_wall(surface, r, c)
-            else:
-                x = c * TILE_SIZE
-                y = HUD_HEIGHT + r * TILE_SIZE
-                if t == ".":
-                    pygame.draw.circle(surface, WHITE, (x + 12, y + 12), 3)
-                elif t == "o":
-                    pygame.draw.circle(surface, WHITE, (x + 12, y + 12), 6)
+    # Hızlı ileri sarma göstergesi (sadece 1x dışında) + replay etiketi
+    label = " ".join(t for t in ("REPLAY" if player is not None else "", speed_label) if t)
+    if label:
+        s3 = font.render(label, True, (255, 215, 0))
+        surface.blit(s3, (SCREEN_WIDTH // 2 - s3.get_width() // 2, 10))
+
+
+def draw_grid(surface):
+    """Labirenti, pellet'leri ve üstteki skor/süre barını çizer."""
+    # Labirent: cache'lenmiş arka plan, tek blit
+    surface.blit(maze_layer.get(game.level_map, TILE_SIZE), (0, HUD_HEIGHT))
+
+    draw_hud(surface)
+
+    # Harita içi pellet ve power pellet'ler (sadece kalanlar, indeksten)
+    draw_pellets(surface, game.pellet_index, TILE_SIZE, HUD_HEIGHT)
 
 
 def draw_menu(surface):
@@ -478,7 +333,7 @@ def draw_menu(surface):
     # Seçenekler
     opt1 = menu_opt_font.render("1 - Human Player (klavye)", True, (255, 185, 100))
     opt2 = menu_opt_font.render("2 - Agent Player (yapay zeka)", True, (255, 140, 200))
-    info = menu_opt_font.render("ESC - Çıkış", True, (220, 220, 255))
+    info = menu_opt_font.render("ESC - Çıkış   |   TAB - Hız (oyunda)", True, (220, 220, 255))
 
     surface.blit(title, (center_x - title.get_width() // 2, center_y - 120))
     surface.blit(sub,   (center_x - sub.get_width()   // 2, center_y - 70))
@@ -516,35 +371,126 @@ def draw_menu(surface):
 
 
 # MAIN GAME LOOP
-def main():
-    global GAME_STATE, game_over
+def main(argv=None):
+    global GAME_STATE, DIRTY_RECTS, LOG_EVENTS, RECORD_DIR, audio, run_rng, speed_label, player
+    global PROFILE_OUT
+
+    parser = argparse.ArgumentParser(description="Pac-Man (Utility Agent)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="sadece değişen bölgeleri çiz (yazılım render'da daha az CPU)")
+    parser.add_argument("--mute", action="store_true",
+                        help="ses kapalı (mixer hiç açılmaz)")
+    parser.add_argument("--log-events", action="store_true",
+                        help="oyun olaylarını konsola yaz")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="koşu seed'i (aynı seed + aynı girdiler → aynı oyunlar)")
+    parser.add_argument("--speed", type=int, default=1,
+                        help="frame başına simülasyon hızı: K kat (0 = sınırsız); oyunda TAB ile değişir")
+    parser.add_argument("--agent", choices=AGENT_NAMES, default="utility",
+                        help="agent modunda oynayan agent (search: süre bütçeli expectimax)")
+    parser.add_argument("--search-ms", type=float, default=None,
+                        help="search agent: karar başına süre (ms); düşük → daha az gecikme, daha sığ arama")
+    parser.add_argument("--search-depth", type=int, default=None,
+                        help="search agent: en fazla derinlik (ply)")
+    parser.add_argument("--weights", metavar="FILE", default=None,
+                        help="agent ağırlık profili (JSON, optimize.py çıktısı)")
+    parser.add_argument("--ghost-ai", choices=GHOST_AI_NAMES, default="random",
+                        help="hayalet davranışı: random (orijinal) / classic (Blinky, Pinky, Inky, Clyde; daha zor)")
+    parser.add_argument("--ghosts", type=int, default=None,
+                        help="hayalet sayısı (varsayılan: haritadaki; fazlasında başlangıç yerleri / renkler tekrar eder)")
+    parser.add_argument("--map", metavar="FILE", default=None,
+                        help="harita dosyası (.txt / .json; maps.py generate ile üretilebilir)")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="her oyunun replay'ini bu klasöre kaydet (.pmr)")
+    parser.add_argument("--replay", metavar="FILE", default=None,
+                        help="kaydedilmiş oyunu oynat (←/→ 10 sn atla, HOME başa dön)")
+    parser.add_argument("--profile", action="store_true",
+                        help="faz profiler tablosu açık başla (oyunda F3 ile aç / kapa)")
+    parser.add_argument("--profile-out", metavar="FILE", default=None,
+                        help="çıkışta profiler ölçümlerini yaz (.json, .csv ya da Chrome için .trace.json)")
+    args = parser.parse_args(argv)
+    DIRTY_RECTS = args.dirty_rects
+    LOG_EVENTS = args.log_events
+    run_rng = GameRng(args.seed)
+    if args.speed < 0:
+        parser.error("--speed 0 (sınırsız) ya da pozitif olmalı")
+    set_speed(args.speed)
+    RECORD_DIR = args.record
+    AGENT_OPTS.update(name=args.agent, search_ms=args.search_ms, search_depth=args.search_depth,
+                      weights=WeightProfile.load(args.weights) if args.weights else None)
+    if args.ghosts is not None and args.ghosts < 1:
+        parser.error("--ghosts en az 1 olmalı")
+    if args.map:
+        try:
+            set_level(load_map(args.map))
+        except (OSError, ValueError) as e:
+            parser.error(f"harita yüklenemedi: {e}")
+    GHOST_OPTS.update(ghost_ai=args.ghost_ai, n_ghosts=args.ghosts)
+    if not args.mute:
+        audio = Audio()
+    PROFILE_OUT = args.profile_out
+    profiler.enable(PROFILE_OUT is not None)
+    if args.profile:
+        toggle_profiler()
 
     GAME_STATE = "menu"
+    accumulator = 0.0   # henüz simüle edilmemiş gerçek zaman (saniye)
+    if args.replay:
+        start_replay(args.replay)
+        GAME_STATE = "playing"
 
     while True:
-        dt = clock.tick(60) / 1000  
+        frame_time = min(clock.tick(FPS) / 1000, MAX_FRAME_TIME)
+        profiler.begin("frame")
 
+        profiler.begin("events")
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                quit_game()
+
+            # F3 her ekranda: profiler tablosu
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                toggle_profiler()
+                if renderer is not None:
+                    renderer.invalidate()
 
             # Menüdeyken tuşlar
             if GAME_STATE == "menu" and event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
+                    quit_game()
                 if event.key in (pygame.K_1, pygame.K_KP1):
                     reset_game("human")
                     GAME_STATE = "playing"
+                    accumulator = 0.0
                 if event.key in (pygame.K_2, pygame.K_KP2):
                     reset_game("agent")
                     GAME_STATE = "playing"
+                    accumulator = 0.0
 
             # Oyun bittiğinde ENTER ile menüye dön
-            if GAME_STATE == "playing" and game_over and event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    GAME_STATE = "menu"
+            if GAME_STATE == "playing" and finished() and event.type == pygame.KEYDOWN \
+                    and event.key == pygame.K_RETURN:
+                GAME_STATE = "menu"
+                player = None
+
+            # Replay'de ←/→ 10 sn geri / ileri, HOME başa
+            elif GAME_STATE == "playing" and player is not None and event.type == pygame.KEYDOWN \
+                    and event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_HOME):
+                if event.key == pygame.K_HOME:
+                    player.seek(0)
+                else:
+                    step = SEEK_TICKS if event.key == pygame.K_RIGHT else -SEEK_TICKS
+                    player.seek(player.tick + step)
+                accumulator = 0.0
+                if renderer is not None:
+                    renderer.rebuild(game)
+
+            # Oyunda TAB → bir sonraki hız (1x, 2x, ... MAX, tekrar 1x)
+            elif GAME_STATE == "playing" and event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+                steps = SPEED_STEPS if SPEED in SPEED_STEPS else [SPEED] + SPEED_STEPS
+                set_speed(steps[(steps.index(SPEED) + 1) % len(steps)])
+                accumulator = 0.0
+        profiler.end("events")
 
         # MENU STATE
         if GAME_STATE == "menu":
@@ -552,119 +498,68 @@ def main():
 
         # PLAYING STATE
         elif GAME_STATE == "playing":
-            keys = pygame.key.get_pressed()
-
-            if not game_over:
-                #1) Kontrol (human veya agent)
+            alpha = 1.0
+            if not finished():
+                #1) Kontrol: human modunda yön klavyeden, agent modunda game.step içinde seçiliyor
                 if PLAYER_TYPE == "human":
-                    pacman.set_direction_from_keys(keys)
-                elif PLAYER_TYPE == "agent":
-                    dx, dy = agent_choose_direction(pacman, ghosts)
-                    pacman.next_dir_x = dx
-                    pacman.next_dir_y = dy
-
-                    # Agent için sprite yönünü güncelle
-                    if   (dx, dy) == (1, 0):
-                        pacman.dir_name = "RIGHT"
-                    elif (dx, dy) == (-1, 0):
-                        pacman.dir_name = "LEFT"
-                    elif (dx, dy) == (0, -1):
-                        pacman.dir_name = "UP"
-                    elif (dx, dy) == (0, 1):
-                        pacman.dir_name = "DOWN"
-
-                # 2) Pac-Man update + sesler 
-                old_score = pacman.score
-                pacman.update(dt)
-                score_diff = pacman.score - old_score
-
-                # Power pellet yendiyse
-                if pacman.just_ate_power:
-                    pacman.power_mode = True
-                    pacman.power_timer = POWER_DURATION
-                    for g in ghosts:
-                        g.set_frightened()
-                    power_sound.play()
+                    game.pacman.set_direction_from_keys(pygame.key.get_pressed())
+
+                # 2) Sabit adımlı simülasyon: biriken süre kadar TICK_DT'lik tick
+                #    (ses / sonuçlar olay aboneleri üzerinden)
+                ticks_before = game.ticks
+                profiler.begin("sim")
+                if SPEED == 0:
+                    # Sınırsız: frame bütçesi dolana kadar tick, sonra bir kere çiz
+                    deadline = time.perf_counter() + UNCAPPED_BUDGET
+                    while not finished() and time.perf_counter() < deadline:
+                        advance()
                 else:
-                    # Normal pellet ile skor arttıysa chomp sesi
-                    if score_diff > 0:
-                        chomp_sound.play()
-
-                # Power süresi bittiğinde hayaletler normale dönsün
-                if not pacman.power_mode:
-                    for g in ghosts:
-                        if g.state != "normal":
-                            g.set_normal()
-
-                #3) Ghost update
-                for g in ghosts:
-                    g.update(dt)
-
-                #4) Pac-Man – Ghost çarpışma kontrolü 
-                for g in ghosts:
-                    if pacman.rect().colliderect(g.rect()):
-
-                        # Power modunda → hayalet yenir
-                        if pacman.power_mode and g.state == "frightened":
-                            eat_ghost_sound.play()
-                            pacman.score += 200
-                            g.to_home()
-
-                        # Normal mod → Pac-Man ölür
-                        else:
-                            death_sound.play()
-                            pacman.alive = False
-                            game_over = True
-
-                            # Oyun süresini hesapla
-                            elapsed_ms = pygame.time.get_ticks() - start_time
-                            elapsed_sec = int(elapsed_ms / 1000)
-
-                            # Sonuçları kaydet (human / agent)
-                            if PLAYER_TYPE == "human":
-                                last_results["human_score"] = pacman.score
-                                last_results["human_time"] = elapsed_sec
-                            elif PLAYER_TYPE == "agent":
-                                last_results["agent_score"] = pacman.score
-                                last_results["agent_time"] = elapsed_sec
-
-                            # Kazananı belirle (iki mod da oynandıysa)
-                            human_score = last_results["human_score"]
-                            agent_score = last_results["agent_score"]
-                            human_time = last_results["human_time"]
-                            agent_time = last_results["agent_time"]
-
-                            if human_score is not None and agent_score is not None:
-                                if human_score > agent_score:
-                                    last_results["winner"] = "Human"
-                                elif agent_score > human_score:
-                                    last_results["winner"] = "Agent"
-                                else:
-                                    # Skor eşitse süreye bak
-                                    if human_time is not None and agent_time is not None:
-                                        if 0 < human_time < agent_time:
-                                            last_results["winner"] = "Human"
-                                        elif 0 < agent_time < human_time:
-                                            last_results["winner"] = "Agent"
-                                        else:
-                                            last_results["winner"] = "Berabere"
-                                    else:
-                                        last_results["winner"] = "Berabere"
-                            else:
-                                # Yalnızca tek taraf oynadıysa kazanan göstermiyoruz
-                                last_results["winner"] = ""
-
-                        break  # Tek çarpışma yeterli
-
-            # 5) Oyun ekranını çizelim
+                    accumulator += frame_time * SPEED
+                    while accumulator >= TICK_DT and not finished():
+                        advance()
+                        accumulator -= TICK_DT
+
+                    # Çizim iki tick arasındaki ara konumda
+                    if not finished():
+                        alpha = accumulator / TICK_DT
+                profiler.end("sim")
+
+                # Gerçekleşen hız çarpanı HUD'a
+                if SPEED != 1:
+                    measured = speed_meter.add((game.ticks - ticks_before) * TICK_DT, frame_time)
+                    if measured is not None:
+                        speed_label = f"{speed_text(SPEED)} ({measured:.1f}x)"
+                        if renderer is not None:
+                            renderer.refresh_hud()
+
+            # 3) Oyun ekranını çizelim
+            if DIRTY_RECTS and not finished():
+                # Kendi display.update(rects) çağrısını yapıyor, flip yok
+                # (profiler tablosu da renderer.overlay üzerinden)
+                profiler.begin("render")
+                renderer.render(game, alpha)
+                profiler.end("render")
+                profiler.end("frame")
+                continue
+
+            profiler.begin("draw_grid")
             draw_grid(screen)
-            pacman.draw(screen)
-            for g in ghosts:
-                g.draw(screen)
+            profiler.end("draw_grid")
+            profiler.begin("sprites")
+            game.pacman.draw(screen, alpha)
+            for g in game.ghosts:
+                g.draw(screen, alpha)
+            profiler.end("sprites")
 
             # Game Over yazısı
-            if game_over:
-                text = big_font.render("GAME OVER", True, (255, 80, 80))
+            if finished():
+                if game.cause == "cleared":
+                    text = big_font.render("LEVEL CLEARED", True, (255, 215, 0))
+                elif game.cause == "ghost":
+                    text = big_font.render("GAME OVER", True, (255, 80, 80))
+                else:
+                    # Süre sınırıyla biten (turnuva) oyunun replay'i
+                    text = big_font.render("REPLAY SONU", True, (200, 200, 255))
                 info = font.render("Menüye dönmek için ENTER", True, (200, 200, 255))
 
                 screen.blit(
@@ -678,7 +573,11 @@ def main():
                      SCREEN_HEIGHT // 2 + 40)
                 )
 
+        profiler_overlay.draw(screen)
+        profiler.begin("flip")
         pygame.display.flip()
+        profiler.end("flip")
+        profiler.end("frame")
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
@@ -0,0 +1,369 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import json
+import time
+import argparse
+from collections import deque
+
+from rng import GameRng
+
+# Harita alt sistemi: dosyadan yükleme / kaydetme ve seed'li labirent üretici.
+# Eskiden harita, başlangıç tile'ları ve ghost house satırları (13..16) koda
+# gömülüydü; artık hepsi bir LevelMap nesnesinde. Haritadan türeyen her şey
+# (duvar tablosu, mesafe tablosu, hayalet next-hop tabloları, labirent
+# yüzeyi) zaten harita anahtarıyla cache'leniyor, yani harita başına kuruluyor.
+#
+# Metin biçimi (.txt): her satır bir harita satırı
+#   '#' duvar, '.' pellet, 'o' power pellet, ' ' boş, '-' ghost house kapısı
+#   'P' Pac-Man başlangıcı, 'G' hayalet başlangıcı, 'H' ghost house zemini
+#   (P / G / H boş tile olarak okunuyor; ghost house = G ve H'lerin sınır kutusu)
+#   ';' ile başlayan satırlar yorum, "; name: isim" haritanın adı
+# JSON biçimi: {"name", "rows", "pacman": [c, r], "ghosts": [[c, r], ...],
+#               "house": [c0, r0, c1, r1]}  (house: iç bölge, dahil; yoksa null)
+#
+#   python maps.py generate --size 200x200 --seed 7 --out buyuk.json
+#   python maps.py info buyuk.json --measure
+
+TILES = "#.o -"
+MIN_SIZE = 15          # üreticinin kabul ettiği en küçük genişlik / yükseklik
+BRAID = 0.5            # çıkmaz sokakların ne kadarı açılıp döngüye çevrilsin
+DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+class LevelMap:
+    """
+    Bir harita: satırlar + Pac-Man / hayalet başlangıç tile'ları + ghost house.
+    Satır listesi gibi davranıyor (len, [r], iter), eski LEVEL_MAP kullanan
+    kodlar (map_key, WallGrid, çizim) olduğu gibi çalışıyor.
+    house: ghost house'un iç bölgesi (c0, r0, c1, r1), ya da None
+    """
+
+    def __init__(self, rows, pacman_spawn, ghost_spawns, house=None, name="custom"):
+        self.rows = tuple(rows)
+        self.pacman_spawn = tuple(pacman_spawn)
+        self.ghost_spawns = [tuple(s) for s in ghost_spawns]
+        self.house = tuple(house) if house is not None else None
+        self.name = name
+        self.validate()
+
+    @property
+    def width(self):
+        return len(self.rows[0])
+
+    @property
+    def height(self):
+        return len(self.rows)
+
+    @property
+    def house_rows(self):
+        #Ghost kuralları için ghost house satırları (r0, r1), yoksa None
+        if self.house is None:
+            return None
+        return self.house[1], self.house[3]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        return self.rows[i]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def walkable(self, col, row):
+        return 0 <= row < self.height and 0 <= col < self.width and self.rows[row][col] != '#'
+
+    def validate(self):
+        #Bozuk haritada ValueError (oyun başlamadan, anlaşılır mesajla)
+        if not self.rows or not self.rows[0]:
+            raise ValueError("Harita boş")
+        if any(len(row) != self.width for row in self.rows):
+            raise ValueError("Harita satırlarının uzunlukları farklı")
+        bad = {t for row in self.rows for t in row} - set(TILES)
+        if bad:
+            raise ValueError(f"Haritada bilinmeyen tile: {''.join(sorted(bad))!r}")
+        if not self.ghost_spawns:
+            raise ValueError("Haritada hayalet başlangıcı yok")
+        for col, row in [self.pacman_spawn] + self.ghost_spawns:
+            if not self.walkable(col, row):
+                raise ValueError(f"Başlangıç tile'ı duvar / harita dışı: ({col}, {row})")
+
+        # Tüm yürünebilir tile'lar Pac-Man'den ulaşılabilir olmalı (yoksa yemler bitmez)
+        reached = flood(self.rows, self.pacman_spawn)
+        total = sum(t != '#' for row in self.rows for t in row)
+        if reached != total:
+            raise ValueError(f"Haritada Pac-Man'in ulaşamadığı {total - reached} tile var")
+
+    # Kayıt
+    def to_dict(self):
+        return {"name": self.name, "rows": list(self.rows), "pacman": list(self.pacman_spawn),
+                "ghosts": [list(s) for s in self.ghost_spawns],
+                "house": list(self.house) if self.house is not None else None}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["rows"], data["pacman"], data["ghosts"], data.get("house"),
+                   data.get("name", "custom"))
+
+    def to_text(self):
+        grid = [list(row) for row in self.rows]
+        if self.house is not None:
+            c0, r0, c1, r1 = self.house
+            for r in range(r0, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    if grid[r][c] == ' ':
+                        grid[r][c] = 'H'
+        for c, r in self.ghost_spawns:
+            grid[r][c] = 'G'
+        c, r = self.pacman_spawn
+        grid[r][c] = 'P'
+        return "\n".join([f"; name: {self.name}"] + ["".join(row) for row in grid]) + "\n"
+
+    @classmethod
+    def from_text(cls, text, name="custom"):
+        rows = []
+        pacman = None
+        ghosts = []
+        house_cells = []
+        for line in text.splitlines():
+            if line.startswith(";"):
+                key, _, value = line[1:].partition(":")
+                if key.strip() == "name":
+                    name = value.strip()
+                continue
+            if not line.strip():
+                continue
+            r = len(rows)
+            row = []
+            for c, t in enumerate(line):
+                if t == 'P':
+                    pacman = (c, r)
+                elif t == 'G':
+                    ghosts.append((c, r))
+                    house_cells.append((c, r))
+                elif t == 'H':
+                    house_cells.append((c, r))
+                row.append(' ' if t in "PGH" else t)
+            rows.append("".join(row))
+        if pacman is None:
+            raise ValueError("Haritada Pac-Man başlangıcı (P) yok")
+        house = None
+        if house_cells:
+            cols = [c for c, _ in house_cells]
+            rws = [r for _, r in house_cells]
+            house = (min(cols), min(rws), max(cols), max(rws))
+        return cls(rows, pacman, ghosts, house, name)
+
+    def __repr__(self):
+        return f"LevelMap({self.name!r}, {self.width}x{self.height}, {len(self.ghost_spawns)} hayalet)"
+
+
+def flood(rows, start):
+    #start'tan ulaşılabilen yürünebilir tile sayısı
+    h, w = len(rows), len(rows[0])
+    seen = [[False] * w for _ in range(h)]
+    c, r = start
+    seen[r][c] = True
+    queue = deque([start])
+    count = 0
+    while queue:
+        c, r = queue.popleft()
+        count += 1
+        for dx, dy in DIRS:
+            nc, nr = c + dx, r + dy
+            if 0 <= nr < h and 0 <= nc < w and not seen[nr][nc] and rows[nr][nc] != '#':
+                seen[nr][nc] = True
+                queue.append((nc, nr))
+    return count
+
+
+def load_map(path):
+    #Biçim dosya adından: .json → JSON, diğer → metin
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return LevelMap.from_dict(json.load(f))
+        name = os.path.splitext(os.path.basename(path))[0]
+        return LevelMap.from_text(f.read(), name)
+
+
+def save_map(level, path):
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            json.dump(level.to_dict(), f)
+        else:
+            f.write(level.to_text())
+
+
+# Üretici
+def generate_map(width=28, height=31, seed=None, braid=BRAID, name=None):
+    """
+    Seed'li labirent: aynı (boyut, seed, braid) → aynı harita.
+    1) Tek koordinatlı hücreler üzerinde rastgele DFS (her yer birbirine bağlı ağaç)
+    2) Çıkmaz sokakların braid oranı kadarı bir duvar kırılarak döngüye çevriliyor
+    3) Ortaya klasik ölçülerde ghost house (8x6, üstte kapı) ve etrafına koridor
+    4) Kalan koridorlar pellet, köşeler power pellet, Pac-Man evin altında
+    Koridor halkası evin kestiği yolları birbirine bağladığı için harita bağlı kalıyor.
+    """
+    if width < MIN_SIZE or height < MIN_SIZE:
+        raise ValueError(f"Harita en az {MIN_SIZE}x{MIN_SIZE} olmalı")
+    rng = GameRng(seed)
+    w, h = width, height
+    grid = [['#'] * w for _ in range(h)]
+    # Hücreler tek koordinatlarda; çift boyutta son sütun / satır duvar kalıyor
+    max_c = w - 2 if (w - 2) % 2 else w - 3
+    max_r = h - 2 if (h - 2) % 2 else h - 3
+
+    def cell_ok(c, r):
+        return 1 <= c <= max_c and 1 <= r <= max_r
+
+    # 1) Rastgele DFS (özyinelemesiz)
+    start = (1 + 2 * rng.randbelow((max_c + 1) // 2), 1 + 2 * rng.randbelow((max_r + 1) // 2))
+    grid[start[1]][start[0]] = ' '
+    stack = [start]
+    while stack:
+        c, r = stack[-1]
+        options = [(dx, dy) for dx, dy in DIRS
+                   if cell_ok(c + 2 * dx, r + 2 * dy) and grid[r + 2 * dy][c + 2 * dx] == '#']
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = rng.choice(options)
+        grid[r + dy][c + dx] = ' '
+        grid[r + 2 * dy][c + 2 * dx] = ' '
+        stack.append((c + 2 * dx, r + 2 * dy))
+
+    # 2) Braid: çıkmaz sokaklara bir çıkış daha
+    for r in range(1, max_r + 1, 2):
+        for c in range(1, max_c + 1, 2):
+            exits = sum(grid[r + dy][c + dx] != '#' for dx, dy in DIRS)
+            walls = [(dx, dy) for dx, dy in DIRS
+                     if grid[r + dy][c + dx] == '#' and cell_ok(c + 2 * dx, r + 2 * dy)]
+            if exits == 1 and walls and rng.random() < braid:
+                dx, dy = rng.choice(walls)
+                grid[r + dy][c + dx] = ' '
+
+    # 3) Ghost house: dış kutu 8x6, üst duvarda 2 tile kapı, etrafı 1 tile koridor
+    cx = w // 2
+    top = h // 2 - 3
+    left, right, bottom = cx - 4, cx + 3, top + 5
+    for r in range(top - 1, bottom + 2):
+        for c in range(left - 1, right + 2):
+            inside = left <= c <= right and top <= r <= bottom
+            on_edge = c in (left, right) or r in (top, bottom)
+            grid[r][c] = ('#' if on_edge else ' ') if inside else ' '
+    grid[top][cx - 1] = grid[top][cx] = '-'
+    house = (left + 1, top + 1, right - 1, bottom - 1)
+    ghosts = [(cx - 1, top + 3), (cx, top + 3), (cx - 1, top + 4), (cx, top + 4)]
+
+    # 4) Yemler
+    for r in range(h):
+        for c in range(w):
+            in_house = left <= c <= right and top <= r <= bottom
+            if grid[r][c] == ' ' and not in_house:
+                grid[r][c] = '.'
+    for c, r in ((1, 1), (max_c, 1), (1, max_r), (max_c, max_r)):
+        grid[r][c] = 'o'
+    pacman = (cx, bottom + 1)
+    grid[pacman[1]][pacman[0]] = ' '
+
+    name = name or f"gen-{w}x{h}-{seed}"
+    return LevelMap(["".join(row) for row in grid], pacman, ghosts, house, name)
+
+
+# Ölçüm
+def _timed(fn):
+    t0 = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - t0) * 1000
+
+
+def measure(level, sim_seconds=10.0, ghost_ai="classic", seed=0):
+    """
+    Haritadan türeyen verilerin kurulum süreleri (ms) ve bir agent oyununun
+    simülasyon hızı. Cache'ler (mesafe, next-hop, duvar) atlanıyor: soğuk maliyet.
+    """
+    from collision import WallGrid
+    from pellets import PelletIndex, PELLET
+    from maze_distance import MazeDistances
+    from ghost_ai import NavTable
+    from game import GameState, TILE_SIZE, HUD_HEIGHT, TICK_DT
+
+    report = {"map": level.name, "size": f"{level.width}x{level.height}",
+              "walkable": sum(t != '#' for row in level for t in row)}
+    report["validate_ms"] = _timed(level.validate)[1]
+    report["walls_ms"] = _timed(lambda: WallGrid(level, TILE_SIZE, HUD_HEIGHT))[1]
+    index, report["pellet_index_ms"] = _timed(lambda: PelletIndex([list(r) for r in level]))
+    report["pellet_field_ms"] = _timed(lambda: index.field(PELLET))[1]
+    distances, report["distances_ms"] = _timed(lambda: MazeDistances(level))
+    report["distances_dense"] = distances.dense
+    report["distance_row_ms"] = _timed(lambda: distances.matrix[len(distances.cells) // 2])[1]
+    nav, report["nav_table_ms"] = _timed(lambda: NavTable(level, distances))
+    report["nav_row_ms"] = _timed(lambda: nav.next_hop(0, 4, len(distances.cells) // 3))[1]
+    try:
+        import pygame
+        from render import build_maze_surface
+        report["maze_surface_ms"] = _timed(lambda: build_maze_surface(level, TILE_SIZE))[1]
+    except pygame.error:
+        pass   # ekran / surface açılamayan ortam
+
+    game, report["game_init_ms"] = _timed(lambda: GameState("agent", level_map=level, seed=seed,
+                                                            ghost_ai=ghost_ai))
+    t0 = time.perf_counter()
+    while not game.game_over and game.elapsed < sim_seconds:
+        game.step(None, TICK_DT)
+    wall = time.perf_counter() - t0
+    report["sim_seconds"] = round(game.elapsed, 2)
+    report["ticks_per_sec"] = game.ticks / wall if wall > 0 else 0.0
+    report["realtime_factor"] = game.elapsed / wall if wall > 0 else 0.0
+    return report
+
+
+def print_report(report):
+    for key, value in report.items():
+        if isinstance(value, float):
+            value = f"{value:.1f}"
+        print(f"  {key:18s} {value}")
+
+
+def parse_size(text):
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h or w)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pac-Man harita üretici / bilgi")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    gen = sub.add_parser("generate", help="seed'li labirent üret")
+    gen.add_argument("--size", type=parse_size, default=(28, 31), help="GENxYÜK (örn. 200x200)")
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--braid", type=float, default=BRAID, help="çıkmaz sokakların açılma oranı (0..1)")
+    gen.add_argument("--out", required=True, help="çıktı dosyası (.json ya da .txt)")
+    gen.add_argument("--measure", action="store_true", help="üretim + ön hesaplama sürelerini yaz")
+    info = sub.add_parser("info", help="haritayı yükle, doğrula ve ölç")
+    info.add_argument("path")
+    info.add_argument("--measure", action="store_true", help="ön hesaplama ve simülasyon süreleri")
+    for p in (gen, info):
+        p.add_argument("--sim-seconds", type=float, default=10.0,
+                       help="ölçümde oynatılan oyun süresi (simülasyon sn)")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "generate":
+        w, h = args.size
+        level, gen_ms = _timed(lambda: generate_map(w, h, args.seed, args.braid))
+        save_map(level, args.out)
+        print(f"{level} → {args.out} ({gen_ms:.1f} ms)")
+    else:
+        level = load_map(args.path)
+        print(level)
+    if args.measure:
+        report = measure(level, args.sim_seconds)
+        if args.cmd == "generate":
+            report = {"generate_ms": gen_ms, **report}
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import os
+import hashlib
+from collections import deque, OrderedDict
+
+import numpy as np
+
+# Labirentteki yürünebilir tile'lar arası GERÇEK (duvarların etrafından dolaşan)
+# en kısa yol mesafeleri. Harita başına bir kez BFS ile hesaplanıp
+# .cache/ altına haritanın hash'i ile kaydediliyor, sonraki açılışlarda
+# dosya memory-map ile okunuyor. Sorgu O(1): matrix[node(a), node(b)].
+# Büyük haritalarda (DENSE_LIMIT düğümden fazla, örn. 200x200 üretilmiş labirent)
+# tam matris sığmıyor (20 bin düğüm → 800 MB); orada satırlar ilk sorulduğunda
+# tek kaynaklı BFS ile hesaplanıp LRU cache'te tutuluyor (LazyDistanceRows).
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+UNREACHABLE = np.iinfo(np.uint16).max
+
+DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+DENSE_LIMIT = 4096      # bu kadar düğüme kadar tam matris (4096² × 2 byte = 32 MB)
+LAZY_ROWS = 256         # büyük haritada bellekte tutulan en fazla satır
+
+
+def map_key(level_map):
+    #Haritanın duvar düzeninden kısa bir hash (pellet'ler mesafeyi etkilemiyor)
+    layout = "\n".join("".join('#' if t == '#' else ' ' for t in row) for row in level_map)
+    return hashlib.sha1(layout.encode("utf-8")).hexdigest()[:16]
+
+
+def bfs_row(adj, src):
+    #src'den tüm düğümlere adım sayısı (liste, ulaşılamayan → UNREACHABLE)
+    row = [UNREACHABLE] * len(adj)
+    row[src] = 0
+    queue = deque([src])
+    while queue:
+        u = queue.popleft()
+        du = row[u] + 1
+        for v in adj[u]:
+            if row[v] == UNREACHABLE:
+                row[v] = du
+                queue.append(v)
+    return row
+
+
+class LazyDistanceRows:
+    """
+    Tam matrisin yerine geçen satır cache'i (büyük haritalar için).
+    rows[i] → i. satır (uint16 dizi), rows[i, j] → tek mesafe.
+    Mesafe simetrik: rows[i, j] için i'nin satırı yoksa ama j'ninki varsa o kullanılıyor.
+    """
+
+    def __init__(self, adj, limit=LAZY_ROWS):
+        self.adj = adj
+        self.limit = limit
+        self.rows = OrderedDict()
+        self.shape = (len(adj), len(adj))
+        self.built = 0          # kaç satır hesaplandı (ölçüm için)
+
+    def row(self, i):
+        rows = self.rows
+        r = rows.get(i)
+        if r is None:
+            r = np.array(bfs_row(self.adj, i), dtype=np.uint16)
+            rows[i] = r
+            self.built += 1
+            if len(rows) > self.limit:
+                rows.popitem(last=False)
+        else:
+            rows.move_to_end(i)
+        return r
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            a, b = key
+            r = self.rows.get(a)
+            if r is not None:
+                return r[b]
+            r = self.rows.get(b)
+            if r is not None:
+                return r[a]
+            return self.row(a)[b]
+        return self.row(key)
+
+    def __len__(self):
+        return self.shape[0]
+
+
+class MazeDistances:
+    """
+    - node_of[row][col]: tile'ın düğüm numarası (duvarsa -1)
+    - cells[i]: i. düğümün (col, row) konumu
+    - matrix[i, j]: i ile j arasındaki adım sayısı (uint16);
+      büyük haritalarda LazyDistanceRows (aynı indeksleme, satırlar istendikçe)
+    """
+
+    def __init__(self, level_map, matrix=None):
+        self.height = len(level_map)
+        self.width = len(level_map[0])
+
+        self.node_of = [[-1] * self.width for _ in range(self.height)]
+        self.cells = []
+        for r, row in enumerate(level_map):
+            for c, t in enumerate(row):
+                if t != '#':
+                    self.node_of[r][c] = len(self.cells)
+                    self.cells.append((c, r))
+
+        if matrix is None:
+            matrix = self._all_pairs_bfs() if self.dense else LazyDistanceRows(self._adjacency())
+        self.matrix = matrix
+
+    @property
+    def dense(self):
+        return len(self.cells) <= DENSE_LIMIT
+
+    def _adjacency(self):
+        return [list(self._neighbors(c, r)) for c, r in self.cells]
+
+    def _neighbors(self, c, r):
+        for dx, dy in DIRS:
+            nc, nr = c + dx, r + dy
+            if 0 <= nr < self.height and 0 <= nc < self.width and self.node_of[nr][nc] >= 0:
+                yield self.node_of[nr][nc]
+
+    def _all_pairs_bfs(self):
+        #Her düğümden bir BFS (~300 düğüm, tek seferlik iş)
+        n = len(self.cells)
+        adj = self._adjacency()
+        matrix = np.full((n, n), UNREACHABLE, dtype=np.uint16)
+        for src in range(n):
+            matrix[src] = bfs_row(adj, src)
+        return matrix
+
+    def node(self, col, row):
+        #(col, row) düğüm numarası; harita dışı ya da duvarsa -1
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.node_of[row][col]
+        return -1
+
+    def dist(self, c1, r1, c2, r2):
+        """
+        İki tile arasındaki labirent mesafesi.
+        Tile'lardan biri duvar / harita dışıysa ya da yol yoksa None.
+        """
+        a = self.node(c1, r1)
+        b = self.node(c2, r2)
+        if a < 0 or b < 0:
+            return None
+        d = int(self.matrix[a, b])
+        return None if d == UNREACHABLE else d
+
+
+def load_or_build(level_map, cache_dir=CACHE_DIR):
+    """
+    Mesafe tablosunu diskteki cache'ten memory-map ile açar,
+    yoksa hesaplayıp kaydeder. Büyük haritalarda (satırlar istendikçe) diske yazılmıyor.
+    """
+    if sum(t != '#' for row in level_map for t in row) > DENSE_LIMIT:
+        return MazeDistances(level_map)
+
+    path = os.path.join(cache_dir, f"maze_dist_{map_key(level_map)}.npy")
+    if os.path.exists(path):
+        try:
+            matrix = np.load(path, mmap_mode="r")
+            table = MazeDistances(level_map, matrix)
+            if matrix.shape == (len(table.cells), len(table.cells)):
+                return table
+        except (OSError, ValueError):
+            pass  # bozuk cache → yeniden hesapla
+
+    table = MazeDistances(level_map)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Aynı anda başka process de yazıyor olabilir: önce geçici dosya, sonra rename
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, table.matrix)
+        os.replace(tmp, path)
+        table.matrix = np.load(path, mmap_mode="r")
+    except OSError:
+        pass  # cache yazılamadıysa bellekteki tabloyla devam
+    return table
+
+
+# Process içinde de harita başına bir kere yüklüyoruz
+_tables = {}
+
+
+def get_maze_distances(level_map):
+    key = map_key(level_map)
+    table = _tables.get(key)
+    if table is None:
+        table = load_or_build(level_map)
+        _tables[key] = table
+    return table
@@ -0,0 +1,220 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tournament import play_game, MAX_GAME_TIME
+from weights import PARAMS, PROFILE_VERSION, WeightProfile, DEFAULT_WEIGHTS
+
+# Utility agent ağırlıklarını ekransız oyunlarla ayarlayan optimizer.
+# Yöntem: köşegen kovaryanslı CMA-ES (sep-CMA-ES). Parametreler PARAMS'taki
+# [alt, üst] sınırlarına göre [0, 1]'e normalize ediliyor; başlangıç ortalaması
+# mevcut profil. Her nesilde popülasyondaki her aday aynı seed kümesinde
+# oynanıyor (adaylar arası fark şanstan değil ağırlıklardan gelsin), tüm
+# (aday, seed) oyunları çekirdeklere dağıtılıyor. Her nesil sonunda checkpoint
+# yazılıyor; --resume ile kalınan yerden devam ediliyor. En iyi profil
+# WeightProfile.load ile yüklenebilen JSON olarak kaydediliyor.
+
+NAMES = list(PARAMS)
+LOW = np.array([PARAMS[k][1] for k in NAMES], dtype=np.float64)
+HIGH = np.array([PARAMS[k][2] for k in NAMES], dtype=np.float64)
+
+# 2: loop_history tile sayıyor ve sınırları değişti → eski normalize ES durumu geçersiz
+CHECKPOINT_VERSION = 2
+
+
+def to_unit(profile):
+    v = np.array([getattr(profile, k) for k in NAMES], dtype=np.float64)
+    return (v - LOW) / (HIGH - LOW)
+
+
+def from_unit(x):
+    x = np.clip(x, 0.0, 1.0)
+    return WeightProfile(**dict(zip(NAMES, (LOW + x * (HIGH - LOW)).tolist())))
+
+
+def fitness(results):
+    #Adayın puanı: oyunların ortalama skoru
+    return sum(r["score"] for r in results) / len(results)
+
+
+class SepCMA:
+    """
+    Köşegen kovaryanslı CMA-ES (Ros & Hansen 2008), minimum hali.
+    ask() → (λ, d) aday matrisi, tell(adaylar, puanlar) → dağılımı günceller
+    (puan büyük olan iyi). Tüm durum get_state() / set_state() ile JSON'a yazılabiliyor.
+    """
+
+    def __init__(self, mean, sigma, popsize=None, rng=None):
+        d = len(mean)
+        self.dim = d
+        self.lam = popsize or 4 + int(3 * np.log(d))
+        self.mu = self.lam // 2
+        w = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = w / w.sum()
+        self.mueff = 1.0 / (self.weights ** 2).sum()
+
+        # Adaptasyon sabitleri (sep-CMA: kovaryans öğrenme hızı d'ye göre büyütülmüş)
+        mueff = self.mueff
+        self.cs = (mueff + 2) / (d + mueff + 5)
+        self.ds = 1 + 2 * max(0.0, np.sqrt((mueff - 1) / (d + 1)) - 1) + self.cs
+        self.cc = (4 + mueff / d) / (d + 4 + 2 * mueff / d)
+        c1 = 2 / ((d + 1.3) ** 2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((d + 2) ** 2 + mueff))
+        scale = (d + 2) / 3
+        self.c1 = c1 * scale
+        self.cmu = min(1 - self.c1, cmu * scale)
+        self.chi = np.sqrt(d) * (1 - 1 / (4 * d) + 1 / (21 * d * d))
+
+        self.mean = np.array(mean, dtype=np.float64)
+        self.sigma = float(sigma)
+        self.diag = np.ones(d)
+        self.ps = np.zeros(d)
+        self.pc = np.zeros(d)
+        self.gen = 0
+        self.rng = rng or np.random.default_rng()
+
+    def ask(self):
+        z = self.rng.standard_normal((self.lam, self.dim))
+        return self.mean + self.sigma * np.sqrt(self.diag) * z
+
+    def tell(self, xs, scores):
+        order = np.argsort(-np.asarray(scores), kind="stable")[:self.mu]
+        y = (np.asarray(xs)[order] - self.mean) / self.sigma
+        step = self.weights @ y
+        self.mean = self.mean + self.sigma * step
+
+        # Adım boyu (CSA) ve kovaryans yolları
+        inv_sqrt = 1 / np.sqrt(self.diag)
+        self.ps = (1 - self.cs) * self.ps + np.sqrt(self.cs * (2 - self.cs) * self.mueff) * inv_sqrt * step
+        self.gen += 1
+        norm = np.linalg.norm(self.ps)
+        hsig = norm / np.sqrt(1 - (1 - self.cs) ** (2 * self.gen)) < (1.4 + 2 / (self.dim + 1)) * self.chi
+        self.pc = (1 - self.cc) * self.pc + hsig * np.sqrt(self.cc * (2 - self.cc) * self.mueff) * step
+
+        rank_mu = self.weights @ (y ** 2)
+        self.diag = ((1 - self.c1 - self.cmu) * self.diag + self.c1 * self.pc ** 2
+                     + self.cmu * rank_mu)
+        self.sigma *= np.exp(self.cs / self.ds * (norm / self.chi - 1))
+
+    def get_state(self):
+        return {
+            "popsize": self.lam,
+            "gen": self.gen,
+            "mean": self.mean.tolist(),
+            "sigma": self.sigma,
+            "diag": self.diag.tolist(),
+            "ps": self.ps.tolist(),
+            "pc": self.pc.tolist(),
+            "rng": self.rng.bit_generator.state,
+        }
+
+    def set_state(self, state):
+        self.gen = state["gen"]
+        self.mean = np.array(state["mean"])
+        self.sigma = state["sigma"]
+        self.diag = np.array(state["diag"])
+        self.ps = np.array(state["ps"])
+        self.pc = np.array(state["pc"])
+        self.rng.bit_generator.state = state["rng"]
+
+
+def evaluate(pool, profiles, seeds, max_time):
+    #Her profili aynı seed'lerde oynatır; (aday, seed) oyunları tek havuzda paralel
+    futures = [[pool.submit(play_game, seed, max_time, None, "utility", None, None, p)
+                for seed in seeds] for p in profiles]
+    return [[f.result() for f in row] for row in futures]
+
+
+def write_json(path, data):
+    #Atomik yazım (checkpoint yazılırken kesilirse eskisi bozulmasın)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def save_profile(path, best):
+    # WeightProfile.load "version" ve "weights" anahtarlarını okuyor; kalanı bilgi amaçlı
+    write_json(path, {"version": PROFILE_VERSION, "weights": best["weights"],
+                      "fitness": best["fitness"], "generation": best["generation"],
+                      "seeds": best["seeds"]})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Utility agent ağırlık optimizer'ı (sep-CMA-ES)")
+    parser.add_argument("--generations", type=int, default=30, help="kaç nesil çalışılsın (toplam)")
+    parser.add_argument("--popsize", type=int, default=None, help="nesil başına aday (varsayılan: 4 + 3 ln d)")
+    parser.add_argument("--games", type=int, default=32, help="aday başına oyun sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="ilk oyun seed'i (seed'ler ardışık)")
+    parser.add_argument("--sigma", type=float, default=0.15, help="başlangıç adım boyu (normalize uzayda)")
+    parser.add_argument("--workers", type=int, default=None, help="worker sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--max-time", type=float, default=MAX_GAME_TIME,
+                        help="oyun başına en fazla simülasyon süresi (sn)")
+    parser.add_argument("--start", metavar="FILE", default=None,
+                        help="başlangıç profili (varsayılan: orijinal sabitler)")
+    parser.add_argument("--checkpoint", default="optimize_checkpoint.json", help="checkpoint dosyası")
+    parser.add_argument("--resume", action="store_true", help="checkpoint'ten devam et")
+    parser.add_argument("--out", default="best_weights.json", help="en iyi profilin yazılacağı JSON")
+    args = parser.parse_args(argv)
+
+    start = WeightProfile.load(args.start) if args.start else DEFAULT_WEIGHTS
+    seeds = list(range(args.seed, args.seed + args.games))
+    es = SepCMA(to_unit(start), args.sigma, args.popsize, np.random.default_rng(args.seed))
+    best = None
+    history = []
+
+    if args.resume and os.path.exists(args.checkpoint):
+        with open(args.checkpoint, encoding="utf-8") as f:
+            ckpt = json.load(f)
+        if ckpt.get("version") != CHECKPOINT_VERSION or ckpt["params"] != NAMES:
+            parser.error("checkpoint bu sürümle uyumsuz")
+        seeds = ckpt["seeds"]
+        es = SepCMA(es.mean, args.sigma, ckpt["es"]["popsize"], es.rng)
+        es.set_state(ckpt["es"])
+        best = ckpt["best"]
+        history = ckpt["history"]
+        print(f"Checkpoint: {es.gen}. nesilden devam, en iyi={best['fitness']:.1f}", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count()) as pool:
+        if best is None:
+            # Referans: başlangıç profili aynı seed'lerde
+            base = fitness(evaluate(pool, [start], seeds, args.max_time)[0])
+            best = {"fitness": base, "weights": start.to_dict(), "generation": 0, "seeds": seeds}
+            print(f"Başlangıç profili: {base:.1f}", file=sys.stderr)
+
+        while es.gen < args.generations:
+            t0 = time.perf_counter()
+            xs = es.ask()
+            profiles = [from_unit(x) for x in xs]
+            scores = [fitness(r) for r in evaluate(pool, profiles, seeds, args.max_time)]
+            # Güncelleme sınırlara kırpılmış adaylarla (değerlendirilen noktalar)
+            es.tell(np.clip(xs, 0.0, 1.0), scores)
+
+            i = int(np.argmax(scores))
+            if scores[i] > best["fitness"]:
+                best = {"fitness": scores[i], "weights": profiles[i].to_dict(),
+                        "generation": es.gen, "seeds": seeds}
+                save_profile(args.out, best)
+            history.append({"gen": es.gen, "best": max(scores), "mean": float(np.mean(scores)),
+                            "sigma": es.sigma})
+            write_json(args.checkpoint, {"version": CHECKPOINT_VERSION, "params": NAMES,
+                                         "seeds": seeds, "es": es.get_state(),
+                                         "best": best, "history": history})
+            print(f"nesil {es.gen:3d}: en iyi={max(scores):8.1f}  ort={np.mean(scores):8.1f}  "
+                  f"sigma={es.sigma:.3f}  tüm zamanlar={best['fitness']:8.1f}  "
+                  f"({time.perf_counter() - t0:.1f} sn)", file=sys.stderr)
+
+    save_profile(args.out, best)
+    print(f"En iyi profil ({best['fitness']:.1f}, nesil {best['generation']}): {args.out}")
+    print(WeightProfile.from_dict(best["weights"]))
+
+
+if __name__ == "__main__":
+    main()
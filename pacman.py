@@ -1,4 +1,5 @@
 import pygame
+from pellets import PelletIndex
 
 class Pacman:
     """
@@ -11,21 +12,27 @@ class Pacman:
                  tile_size,
                  hud_height,
                  grid,
-                 wall_rects,
+                 walls,
                  pacman_images=None,
-                 color=(255, 255, 0)):
+                 color=(255, 255, 0),
+                 pellet_index=None):
 
         # Harita / çizim parametreleri
         self.tile_size = tile_size              
         self.hud_height = hud_height           
         self.grid = grid                        
-        self.wall_rects = wall_rects            
+        self.walls = walls                      # collision.WallGrid
         self.pacman_images = pacman_images     
         self.color = color                      
 
+        # Yem indeksi: sadece bir şey yediğimizde güncelleniyor (agent grid'i taramasın diye)
+        self.pellet_index = pellet_index if pellet_index is not None else PelletIndex(grid)
+
         # Pac-Man başlangıç pozisyonu (tile → pixel)
         self.x = col * tile_size
         self.y = hud_height + row * tile_size
+        self.prev_x = self.x    # önceki tick'teki konum (çizimde ara değer için)
+        self.prev_y = self.y
         self.size = tile_size - 4               
         self.speed = 120                      
 
@@ -91,6 +98,7 @@ class Pacman:
         - Yem/power pellet yeme
         - Power mod süresinin yönetimi
         """
+        self.prev_x, self.prev_y = self.x, self.y
         if not self.alive:
             return
 
@@ -122,11 +130,13 @@ class Pacman:
             # Normal küçük nokta
             if tile == '.':
                 self.grid[row][col] = ' '   # yemi sil
+                self.pellet_index.remove(col, row, tile)
                 self.score += 10
 
             # Power pellet
             elif tile == 'o':
                 self.grid[row][col] = ' '   # power'ı sil
+                self.pellet_index.remove(col, row, tile)
                 self.score += 50
                 self.just_ate_power = True  # main.py tarafında power_mode başlatılıyor hayaletler mavi olacak ve yavaslayacaklar.
 
@@ -148,36 +158,35 @@ class Pacman:
 
         test_x = self.x + dir_x * self.tile_size / 2
         test_y = self.y + dir_y * self.tile_size / 2
-        test_rect = pygame.Rect(test_x, test_y, self.size, self.size)
-
-        for wall in self.wall_rects:
-            if test_rect.colliderect(wall):
-                return False
-
-        return True
+        return not self.walls.hits(test_x, test_y, self.size, self.size)
 
     def collides_with_wall(self):
         #Şu anki konumda Pac-Man herhangi bir duvara çarpıyor mu?
-        rect = self.rect()
-        for wall in self.wall_rects:
-            if rect.colliderect(wall):
-                return True
-        return False
+        return self.walls.hits(self.x, self.y, self.size, self.size)
     
     # Çizim
-    def draw(self, surface):
+    def render_pos(self, alpha=1.0):
+        #Önceki tick ile şimdiki arasında ara konum (alpha: 0..1)
+        if alpha >= 1.0:
+            return self.x, self.y
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def draw(self, surface, alpha=1.0):
         """
         Pac-Man'i ekrana çizer.
         - Eğer sprite yüklüyse yönüne göre o resmi kullanır,
         - Aksi halde sarı daire olarak çizer.
+        alpha: sabit adımlı simülasyonda iki tick arası ara konum oranı.
         """
+        x, y = self.render_pos(alpha)
         if self.pacman_images is not None:
             img = self.pacman_images.get(self.dir_name, self.pacman_images["RIGHT"])
-            surface.blit(img, (self.x, self.y))
+            surface.blit(img, (x, y))
         else:
             pygame.draw.circle(
                 surface,
                 self.color,
-                (int(self.x + self.size / 2), int(self.y + self.size / 2)),
+                (int(x + self.size / 2), int(y + self.size / 2)),
                 self.size // 2
             )
@@ -0,0 +1,220 @@
+import heapq
+from collections import deque
+
+# Haritadaki yem ('.') ve power pellet ('o') indeksi.
+# Grid'i her karar için baştan taramak yerine, sadece Pac-Man bir şey yediğinde
+# güncelleniyor. Kalan sayılar O(1), en yakın yem sorgusu ise
+# BUCKET x BUCKET tile'lık kovalar üzerinden halka halka aranıyor.
+
+PELLET = '.'
+POWER = 'o'
+
+BUCKET = 4  # kova kenarı (tile)
+
+
+class PelletIndex:
+    """
+    - count(kind) / remaining: O(1) kalan sayısı
+    - nearest(col, row, kind): en yakın yemin Manhattan mesafesi ve konumu
+    - version: her yenen yemde artar, cache'leyen kodlar bunu anahtar olarak kullanabilir
+    - listeners: (col, row, kind) ile çağrılan fonksiyonlar
+    - field(kind): en yakın yeme labirent mesafesi alanı (O(1) sorgu)
+    """
+
+    def __init__(self, grid, bucket=BUCKET):
+        self.bucket = bucket
+        self.height = len(grid)
+        self.width = len(grid[0])
+        self.walkable = [t != '#' for row in grid for t in row]
+        self.bucket_cols = (self.width + bucket - 1) // bucket
+        self.bucket_rows = (self.height + bucket - 1) // bucket
+
+        self.cells = {PELLET: set(), POWER: set()}
+        self.buckets = {
+            kind: [[set() for _ in range(self.bucket_cols)] for _ in range(self.bucket_rows)]
+            for kind in self.cells
+        }
+        for r, row in enumerate(grid):
+            for c, t in enumerate(row):
+                if t in self.cells:
+                    self.cells[t].add((c, r))
+                    self.buckets[t][r // bucket][c // bucket].add((c, r))
+
+        self.version = 0
+        self.listeners = []
+        self.fields = {}  # kind → PelletDistanceField (field() ile kuruluyor)
+
+    def count(self, kind):
+        return len(self.cells[kind])
+
+    @property
+    def remaining(self):
+        #Kalan toplam yem + power pellet
+        return len(self.cells[PELLET]) + len(self.cells[POWER])
+
+    def remove(self, col, row, kind):
+        #Pac-Man (col, row)'daki yemi yedi.
+        cells = self.cells[kind]
+        if (col, row) not in cells:
+            return
+        cells.remove((col, row))
+        self.buckets[kind][row // self.bucket][col // self.bucket].discard((col, row))
+        self.version += 1
+        f = self.fields.get(kind)
+        if f is not None:
+            f.remove_source(col, row)
+        for fn in self.listeners:
+            fn(col, row, kind)
+
+    def nearest(self, col, row, kind):
+        """
+        (col, row)'a Manhattan olarak en yakın yemi bulur → (mesafe, (c, r)).
+        Hiç yem kalmadıysa (None, None).
+        Kovaları içten dışa halka halka geziyoruz; k. halkadaki bir hücre en az
+        (k-1)*bucket+1 uzakta olduğu için, bulunan en iyi mesafe bunun altındaysa duruyoruz.
+        """
+        if not self.cells[kind]:
+            return None, None
+
+        b = self.bucket
+        grid_buckets = self.buckets[kind]
+        qc, qr = col // b, row // b
+        max_ring = max(qc, qr, self.bucket_cols - 1 - qc, self.bucket_rows - 1 - qr)
+
+        best = None
+        best_cell = None
+        for k in range(max_ring + 1):
+            if best is not None and best <= (k - 1) * b + 1:
+                break
+            for br in range(qr - k, qr + k + 1):
+                if not (0 <= br < self.bucket_rows):
+                    continue
+                # Halkanın sadece kenarındaki kovalar
+                step = 1 if br in (qr - k, qr + k) else 2 * k
+                for bc in range(qc - k, qc + k + 1, max(step, 1)):
+                    if not (0 <= bc < self.bucket_cols):
+                        continue
+                    for c, r in grid_buckets[br][bc]:
+                        d = abs(c - col) + abs(r - row)
+                        if best is None or d < best:
+                            best = d
+                            best_cell = (c, r)
+        return best, best_cell
+
+    def field(self, kind):
+        """
+        kind için en yakın yeme labirent mesafesi alanı (PelletDistanceField).
+        İlk istekte kurulur, sonra her remove() ile kendini onarır.
+        """
+        f = self.fields.get(kind)
+        if f is None:
+            f = PelletDistanceField(self.walkable, self.width, self.height, self.cells[kind])
+            self.fields[kind] = f
+        return f
+
+
+INF = float("inf")
+
+
+class PelletDistanceField:
+    """
+    Her yürünebilir tile için en yakın kaynağa (yeme) labirent mesafesi.
+    Başta çok kaynaklı tek bir BFS; sonra bir yem yendiğinde sadece
+    o yemi en yakın kaynak olarak kullanan bölge yeniden hesaplanıyor.
+    Sorgu O(1): dist(col, row).
+    """
+
+    def __init__(self, walkable, width, height, sources):
+        self.width = width
+        self.height = height
+        self.walkable = walkable  # düz liste, index = row * width + col
+        self.sources = {r * width + c for c, r in sources}
+
+        n = width * height
+        self.neighbors = [[] for _ in range(n)]
+        for i in range(n):
+            if not walkable[i]:
+                continue
+            c, r = i % width, i // width
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nc, nr = c + dx, r + dy
+                if 0 <= nc < width and 0 <= nr < height and walkable[nr * width + nc]:
+                    self.neighbors[i].append(nr * width + nc)
+
+        self.d = [INF] * n
+        queue = deque()
+        for s in self.sources:
+            self.d[s] = 0
+            queue.append(s)
+        self._bfs(queue)
+
+    def _bfs(self, queue):
+        d = self.d
+        neighbors = self.neighbors
+        while queue:
+            u = queue.popleft()
+            du = d[u] + 1
+            for v in neighbors[u]:
+                if d[v] > du:
+                    d[v] = du
+                    queue.append(v)
+
+    def dist(self, col, row):
+        #(col, row)'dan en yakın kaynağa adım sayısı; yoksa / duvarsa INF
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.d[row * self.width + col]
+        return INF
+
+    def remove_source(self, col, row):
+        """
+        (col, row)'daki kaynak kalktı. Mesafeler sadece artabilir:
+        1) Kaldırılan kaynaktan, d[v] == derinlik olan hücreler boyunca yürüyüp
+           "bu kaynağı en yakın kaynak olarak kullanan" bölgeyi buluyoruz.
+        2) O bölgeyi INF yapıp, sınırındaki etkilenmemiş komşulardan
+           (onların mesafesi + 1) ile tekrar dolduruyoruz.
+        """
+        s = row * self.width + col
+        if s not in self.sources:
+            return
+        self.sources.remove(s)
+        d = self.d
+        neighbors = self.neighbors
+
+        if not self.sources:
+            for i in range(len(d)):
+                d[i] = INF
+            return
+
+        # 1) Etkilenen bölge
+        affected = {s}
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            nxt = d[u] + 1
+            for v in neighbors[u]:
+                if v not in affected and d[v] == nxt:
+                    affected.add(v)
+                    queue.append(v)
+
+        for v in affected:
+            d[v] = INF
+
+        # 2) Sınırdan tekrar doldur (başlangıç mesafeleri farklı → küçük bir heap)
+        heap = []
+        for v in affected:
+            best = INF
+            for u in neighbors[v]:
+                if u not in affected and d[u] + 1 < best:
+                    best = d[u] + 1
+            if best < INF:
+                d[v] = best
+                heap.append((best, v))
+        heapq.heapify(heap)
+        while heap:
+            dv, v = heapq.heappop(heap)
+            if dv > d[v]:
+                continue
+            for u in neighbors[v]:
+                if dv + 1 < d[u]:
+                    d[u] = dv + 1
+                    heapq.heappush(heap, (dv + 1, u))
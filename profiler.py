@@ -0,0 +1,265 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+# Frame / tick fazlarının süre ölçümü.
+# Kapalıyken maliyet neredeyse sıfır: phase() hep aynı boş context manager'ı
+# döndürüyor, oyunun içindeki fazlar (agent, Pac-Man, hayaletler, çarpışma)
+# ise sadece instrument() ile açıkken sarılıyor (kapalıyken hiç dokunulmuyor).
+# Her faz için son WINDOW ölçümün p50 / p95 / p99'u; ham olaylar da sınırlı bir
+# tamponda tutuluyor ve JSON / CSV / Chrome trace (chrome://tracing, Perfetto)
+# olarak yazılabiliyor.
+
+WINDOW = 1000            # yüzdelikler için faz başına son kaç ölçüm
+TRACE_LIMIT = 200_000    # trace tamponunda en fazla kaç olay (eskiler düşüyor)
+PERCENTILES = (50, 95, 99)
+
+# GameState.step içindeki fazlar: (faz adı, nesne seçici, metot adı)
+GAME_PHASES = (
+    ("agent", lambda game: game, "agent"),
+    ("pacman", lambda game: game.pacman, "update"),
+    ("ghosts", lambda game: game, "update_ghosts"),
+    ("collision", lambda game: game, "check_collisions"),
+)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+def percentile(sorted_values, p):
+    #Sıralı listede p. yüzdelik (en yakın sıra)
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class Profiler:
+    """
+    with profiler.phase("draw"): ...   → "draw" fazının süresi
+    begin("sim") ... end("sim")        → aynısı, blok dışında
+    profiler.instrument(game)           → GameState.step içindeki fazlar
+    stats()                             → {faz: {"count", "mean_ms", "p50_ms", ...}}
+    export(path)                        → .csv / .trace.json (Chrome) / .json
+    """
+
+    def __init__(self, window=WINDOW, trace_limit=TRACE_LIMIT):
+        self.enabled = False
+        self.window = window
+        self.samples = {}                            # faz → deque(süre ns)
+        self.counts = {}                             # faz → toplam ölçüm sayısı
+        self.trace = deque(maxlen=trace_limit)       # (faz, başlangıç ns, süre ns)
+        self.origin = time.perf_counter_ns()
+        self._instrumented = []                      # (nesne, metot adı) — geri almak için
+        self._open = {}                              # begin() ile açılmış fazlar
+
+    def enable(self, on=True):
+        self.enabled = on
+        self._open.clear()
+        if not on:
+            self.uninstrument()
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return _Phase(self, name)
+
+    def begin(self, name):
+        #with bloğuna sığmayan fazlar için (ana döngü): begin(name) ... end(name)
+        if self.enabled:
+            self._open[name] = time.perf_counter_ns()
+
+    def end(self, name):
+        if self.enabled:
+            start = self._open.pop(name, None)
+            # Açıkken etkinleştirildiyse başlangıcı yok, o ölçüm atlanıyor
+            if start is not None:
+                self.add(name, start, time.perf_counter_ns() - start)
+
+    def add(self, name, start_ns, dur_ns):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+            self.counts[name] = 0
+        samples.append(dur_ns)
+        self.counts[name] += 1
+        self.trace.append((name, start_ns, dur_ns))
+
+    def reset(self):
+        self.samples.clear()
+        self.counts.clear()
+        self.trace.clear()
+
+    # Oyun içi fazlar
+    def instrument(self, game):
+        """
+        game'in step() içinde çağırdığı metotları (agent, pacman.update,
+        update_ghosts, check_collisions) süre ölçen sarmalayıcılarla değiştirir.
+        Sadece profiler açıkken; uninstrument() eski haline getirir.
+        """
+        self.uninstrument()
+        if not self.enabled:
+            return
+        for name, owner_of, attr in GAME_PHASES:
+            owner = owner_of(game)
+            setattr(owner, attr, self._wrap(name, getattr(owner, attr)))
+            self._instrumented.append((owner, attr))
+
+    def uninstrument(self):
+        for owner, attr in self._instrumented:
+            # Instance'a yazılan sarmalayıcıyı silince sınıfın metodu geri geliyor;
+            # game.agent gibi zaten instance alanı olanlarda orijinal fonksiyonu koy
+            wrapped = owner.__dict__[attr]
+            if hasattr(type(owner), attr):
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, wrapped.__wrapped__)
+        self._instrumented = []
+
+    def _wrap(self, name, fn):
+        add = self.add
+        clock = time.perf_counter_ns
+
+        def timed(*args):
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                add(name, start, clock() - start)
+
+        timed.__wrapped__ = fn
+        return timed
+
+    # Sonuçlar
+    def stats(self):
+        out = {}
+        for name, samples in self.samples.items():
+            values = sorted(samples)
+            row = {"count": self.counts[name],
+                   "mean_ms": sum(values) / len(values) / 1e6}
+            for p in PERCENTILES:
+                row[f"p{p}_ms"] = percentile(values, p) / 1e6
+            row["max_ms"] = values[-1] / 1e6
+            out[name] = row
+        return out
+
+    def export(self, path):
+        #Biçim dosya adından: .csv, .trace.json (Chrome trace), diğer → JSON
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        elif path.endswith(".trace.json"):
+            self.export_chrome(path)
+        else:
+            self.export_json(path)
+
+    def _events_us(self):
+        origin = self.origin
+        return [(name, (start - origin) / 1000, dur / 1000) for name, start, dur in self.trace]
+
+    def export_json(self, path):
+        data = {
+            "window": self.window,
+            "phases": self.stats(),
+            "events": [[name, round(ts, 3), round(dur, 3)] for name, ts, dur in self._events_us()],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "start_us", "duration_us"])
+            for name, ts, dur in self._events_us():
+                writer.writerow([name, f"{ts:.3f}", f"{dur:.3f}"])
+
+    def export_chrome(self, path):
+        # Trace Event Format: "X" (complete) olayları; iç içe fazlar zamanlarından iç içe görünüyor
+        events = [{"name": name, "ph": "X", "ts": ts, "dur": dur, "pid": 0, "tid": 0}
+                  for name, ts, dur in self._events_us()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+class ProfilerOverlay:
+    """
+    HUD barının hemen altında faz tablosu (p50 / p95 / p99, ms).
+    Tablo yazısı REFRESH saniyede bir yeniden üretiliyor; arada sadece blit.
+    draw(surface) çizdiği Rect'i döndürür (dirty-rect modu için).
+    """
+
+    REFRESH = 0.5
+
+    def __init__(self, profiler, font, top, left=4):
+        self.profiler = profiler
+        self.font = font
+        self.top = top
+        self.left = left
+        self.visible = False
+        self.surface = None
+        self.next_refresh = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.surface = None
+        return self.visible
+
+    def _build(self):
+        rows = [("faz (ms)", "p50", "p95", "p99")]
+        for name, row in sorted(self.profiler.stats().items()):
+            rows.append((name, f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}", f"{row['p99_ms']:.2f}"))
+        if len(rows) == 1:
+            rows.append(("(ölçüm yok)", "", "", ""))
+
+        # Sütunlar ayrı ayrı: isim sola, sayılar sağa dayalı (font eş aralıklı olmayabilir)
+        cells = [[self.font.render(text, True, (230, 230, 230)) for text in row] for row in rows]
+        widths = [max(r[k].get_width() for r in cells) for k in range(4)]
+        line_h = self.font.get_linesize()
+        gap = 10
+        panel = pygame.Surface((sum(widths) + 3 * gap + 8, len(rows) * line_h + 6), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        y = 3
+        for r in cells:
+            x = 4
+            for k, s in enumerate(r):
+                panel.blit(s, (x if k == 0 else x + widths[k] - s.get_width(), y))
+                x += widths[k] + gap
+            y += line_h
+        return panel
+
+    def draw(self, surface):
+        if not self.visible:
+            return None
+        now = time.perf_counter()
+        if self.surface is None or now >= self.next_refresh:
+            self.surface = self._build()
+            self.next_refresh = now + self.REFRESH
+        return surface.blit(self.surface, (self.left, self.top))
@@ -0,0 +1,204 @@
+import pygame
+
+from events import PelletEaten, PowerStarted
+
+# Çizim yardımcıları.
+# Duvarlar hiç değişmediği için labirent bir kere arka plan Surface'ine
+# çiziliyor, her frame'de tek bir blit ile ekrana basılıyor.
+
+BLACK = (0, 0, 0)
+BLUE = (50, 100, 255)
+
+
+def draw_wall(surface, grid, row, col, tile_size, top=0):
+    #Labirentteki duvar çizimi (top: haritanın surface üzerindeki y başlangıcı)
+    x = col * tile_size
+    y = top + row * tile_size
+
+    inset = 4
+    thick = 3
+
+    height = len(grid)
+    width = len(grid[0])
+    up = (row > 0 and grid[row - 1][col] == '#')
+    down = (row < height - 1 and grid[row + 1][col] == '#')
+    left = (col > 0 and grid[row][col - 1] == '#')
+    right = (col < width - 1 and grid[row][col + 1] == '#')
+
+    if not up:
+        pygame.draw.line(surface, BLUE, (x, y + inset), (x + tile_size, y + inset), thick)
+    if not down:
+        pygame.draw.line(surface, BLUE, (x, y + tile_size - inset), (x + tile_size, y + tile_size - inset), thick)
+    if not left:
+        pygame.draw.line(surface, BLUE, (x + inset, y), (x + inset, y + tile_size), thick)
+    if not right:
+        pygame.draw.line(surface, BLUE, (x + tile_size - inset, y), (x + tile_size - inset, y + tile_size), thick)
+
+
+def build_maze_surface(level_map, tile_size):
+    #Siyah zemin + tüm duvarlar; HUD'suz, haritanın kendi boyutunda.
+    width = len(level_map[0]) * tile_size
+    height = len(level_map) * tile_size
+    surf = pygame.Surface((width, height))
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert()   # ekran formatında → blit daha hızlı
+    surf.fill(BLACK)
+
+    for r, row in enumerate(level_map):
+        for c, t in enumerate(row):
+            if t == "#":
+                draw_wall(surf, level_map, r, c, tile_size)
+    return surf
+
+
+class MazeLayer:
+    """
+    Labirent arka planı cache'i.
+    Sadece harita ya da tile boyutu değişince yeniden çiziliyor.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.surface = None
+
+    def get(self, level_map, tile_size):
+        key = (tuple(level_map), tile_size)
+        if key != self.key:
+            self.surface = build_maze_surface(level_map, tile_size)
+            self.key = key
+        return self.surface
+
+    def invalidate(self):
+        self.key = None
+        self.surface = None
+
+
+WHITE = (240, 240, 240)
+
+# Pellet yarıçapları
+PELLET_RADIUS = {'.': 3, 'o': 6}
+
+
+def draw_pellets(surface, pellet_index, tile_size, top=0):
+    #Kalan pellet ve power pellet'leri indeksten çizer (tüm grid'i gezmeden)
+    half = tile_size // 2
+    for kind, radius in PELLET_RADIUS.items():
+        for c, r in pellet_index.cells[kind]:
+            x = c * tile_size
+            y = top + r * tile_size
+            pygame.draw.circle(surface, WHITE, (x + half, y + half), radius)
+
+
+def entity_rect(entity, alpha=1.0):
+    #Pac-Man / ghost'un ekranda kapladığı alan (1 px pay ile)
+    x, y = entity.render_pos(alpha)
+    return pygame.Rect(int(x) - 1, int(y) - 1, entity.size + 2, entity.size + 2)
+
+
+class DirtyRenderer:
+    """
+    Sadece değişen bölgeleri ekrana basan çizim modu.
+    - bg: labirent + kalan pellet'ler (pellet yendikçe sadece o tile siliniyor)
+    - Her frame: eski entity kutuları bg'den geri yükleniyor, entity'ler yeni
+      yerlerine çiziliyor; HUD sadece skor ya da saniye değişince.
+    - pygame.display.update(rects) ile sadece bu dikdörtgenler gönderiliyor.
+    """
+
+    def __init__(self, screen, maze_layer, tile_size, hud_height, draw_hud):
+        self.screen = screen
+        self.maze_layer = maze_layer
+        self.tile_size = tile_size
+        self.hud_height = hud_height
+        self.draw_hud = draw_hud          # draw_hud(surface) → HUD barını çizer
+        self.hud_rect = pygame.Rect(0, 0, screen.get_width(), hud_height)
+
+        self.bg = None
+        self.maze = None
+        self.prev_rects = []
+        self.pending = []                 # yenen pellet tile'ları
+        self.hud_key = None
+        self.full = True
+        self.overlay = None               # overlay(surface) → çizdiği Rect ya da None (profiler)
+
+    def attach(self, game):
+        #Yeni oyun: arka planı baştan kur, yenen pellet'leri olaylardan dinle.
+        self.rebuild(game)
+        game.bus.subscribe(PelletEaten, self.on_pellet_eaten)
+        game.bus.subscribe(PowerStarted, self.on_pellet_eaten)
+
+    def rebuild(self, game):
+        #Arka planı oyunun şu anki yemleriyle yeniden kur (replay'de atlama sonrası vb.)
+        self.maze = self.maze_layer.get(game.level_map, self.tile_size)
+        self.bg = pygame.Surface(self.screen.get_size())
+        if pygame.display.get_surface() is not None:
+            self.bg = self.bg.convert()
+        self.bg.blit(self.maze, (0, self.hud_height))
+        draw_pellets(self.bg, game.pellet_index, self.tile_size, self.hud_height)
+        self.invalidate()
+
+    def invalidate(self):
+        #Bir sonraki frame'de tüm ekranı çiz (menü dönüşü, overlay vb.)
+        self.full = True
+        self.prev_rects = []
+        self.pending = []
+
+    def refresh_hud(self):
+        #Skor / süre dışında HUD'da bir şey değişti (hız göstergesi vb.)
+        self.hud_key = None
+
+    def on_pellet_eaten(self, ev):
+        # bg'de o tile'ı temiz labirent görüntüsüyle ez
+        col, row = ev.col, ev.row
+        t = self.tile_size
+        src = pygame.Rect(col * t, row * t, t, t)
+        dst = pygame.Rect(col * t, self.hud_height + row * t, t, t)
+        self.bg.blit(self.maze, dst, src)
+        self.pending.append(dst)
+
+    def _draw_entities(self, game, alpha):
+        rects = []
+        game.pacman.draw(self.screen, alpha)
+        rects.append(entity_rect(game.pacman, alpha))
+        for g in game.ghosts:
+            g.draw(self.screen, alpha)
+            rects.append(entity_rect(g, alpha))
+        return rects
+
+    def _draw_overlay(self):
+        # Overlay de entity gibi: sonraki frame'de kutusu bg'den geri yükleniyor
+        if self.overlay is None:
+            return []
+        rect = self.overlay(self.screen)
+        return [rect] if rect else []
+
+    def render(self, game, alpha=1.0):
+        screen = self.screen
+        hud_key = (game.pacman.score, int(game.elapsed))
+
+        if self.full:
+            screen.blit(self.bg, (0, 0))
+            self.draw_hud(screen)
+            self.prev_rects = self._draw_entities(game, alpha) + self._draw_overlay()
+            self.pending = []
+            self.hud_key = hud_key
+            self.full = False
+            pygame.display.flip()
+            return
+
+        dirty = []
+        # Eski entity yerlerini ve yenen pellet'leri arka plandan geri yükle
+        for r in self.prev_rects + self.pending:
+            screen.blit(self.bg, r, r)
+            dirty.append(r)
+        self.pending = []
+
+        if hud_key != self.hud_key:
+            self.draw_hud(screen)
+            dirty.append(self.hud_rect)
+            self.hud_key = hud_key
+
+        new_rects = self._draw_entities(game, alpha) + self._draw_overlay()
+        dirty.extend(new_rects)
+        self.prev_rects = new_rects
+
+        pygame.display.update(dirty)
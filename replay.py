@@ -0,0 +1,296 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import zlib
+import struct
+import argparse
+
+from game import GameState, LEVEL_MAP, TICK_RATE, TICK_DT, CAUSES, GHOST_SPAWNS
+from maps import load_map
+from ghost_ai import GHOST_AI_NAMES
+from maze_distance import map_key
+from events import EventBus
+from rng import MASK64
+
+# Replay kaydı ve oynatma.
+# Oyun deterministik olduğu için (seed'li RNG + sabit tick) seed ve her tick'te
+# Pac-Man'e verilen yön yeterli; hayaletler aynı seed'den aynı seçimleri yapıyor.
+# Belirli aralıklarla tam durum (keyframe) da saklanıyor ki istenen tick'e
+# en fazla KEYFRAME_INTERVAL tick simüle ederek atlayabilelim.
+# Dosya: sabit başlık + zlib(yönler + keyframe'ler); 10 dakikalık oyun birkaç KB.
+
+MAGIC = b"PMRP"
+VERSION = 2           # 2: başlığa hayalet AI ve hayalet sayısı eklendi (1 hâlâ okunuyor)
+
+KEYFRAME_INTERVAL = 1800   # tick (60 Hz'de 30 sn)
+
+# Tick başına tek byte yön kodu (Pac-Man'in next_dir'i)
+DIRS = [(0, 0), (1, 0), (-1, 0), (0, -1), (0, 1)]
+DIR_CODES = {d: i for i, d in enumerate(DIRS)}
+
+MODES = ["human", "agent"]
+
+# magic, sürüm, mod, seed, tick hızı, harita anahtarı, keyframe aralığı,
+# tick sayısı, son skor, bitiş nedeni
+HEADER = struct.Struct("<4sBBQH16sIIiB")
+# Sürüm 2 eki: hayalet AI kodu (GHOST_AI_NAMES), hayalet sayısı
+HEADER_V2 = struct.Struct("<BH")
+
+# Keyframe parçaları (game.GameState.snapshot() alanları)
+KF_HEAD = struct.Struct("<IdQHBBB")     # ticks, elapsed, rng, ghosts_eaten, game_over, cause, hayalet sayısı
+KF_PACMAN = struct.Struct("<ddbbbbBi??d?")
+KF_GHOST = struct.Struct("<ddbb?")
+KF_LEN = struct.Struct("<H")
+
+
+def _map_id(level_map):
+    return map_key(level_map)[:16].encode("ascii")
+
+
+def pack_keyframe(snap, n_food):
+    ghosts = snap["ghosts"]
+    parts = [
+        KF_HEAD.pack(snap["ticks"], snap["elapsed"], snap["rng"], snap["ghosts_eaten"],
+                     snap["game_over"], snap["cause"], len(ghosts)),
+        KF_PACMAN.pack(*snap["pacman"]),
+    ]
+    parts.extend(KF_GHOST.pack(*g) for g in ghosts)
+    parts.append(snap["pellets"].to_bytes((n_food + 7) // 8, "little"))
+    return b"".join(parts)
+
+
+def unpack_keyframe(data):
+    ticks, elapsed, rng, ghosts_eaten, game_over, cause, n_ghosts = KF_HEAD.unpack_from(data, 0)
+    off = KF_HEAD.size
+    pacman = KF_PACMAN.unpack_from(data, off)
+    off += KF_PACMAN.size
+    ghosts = []
+    for _ in range(n_ghosts):
+        ghosts.append(KF_GHOST.unpack_from(data, off))
+        off += KF_GHOST.size
+    return {
+        "ticks": ticks,
+        "elapsed": elapsed,
+        "rng": rng,
+        "ghosts_eaten": ghosts_eaten,
+        "game_over": bool(game_over),
+        "cause": cause,
+        "pacman": pacman,
+        "ghosts": ghosts,
+        "pellets": int.from_bytes(data[off:], "little"),
+    }
+
+
+class Replay:
+    """
+    Bir oyunun kaydı.
+    inputs[t]: t. tick'te Pac-Man'e verilen yönün kodu (DIRS)
+    keyframes: [(tick, paketlenmiş durum)], her KEYFRAME_INTERVAL tick'te bir
+    """
+
+    def __init__(self, mode, seed, inputs=b"", keyframes=None,
+                 keyframe_interval=KEYFRAME_INTERVAL, final_score=0, cause=None,
+                 level_map=LEVEL_MAP, tick_rate=TICK_RATE, ghost_ai="random",
+                 n_ghosts=len(GHOST_SPAWNS)):
+        self.mode = mode
+        self.seed = seed
+        self.inputs = bytes(inputs)
+        self.keyframes = keyframes or []
+        self.keyframe_interval = keyframe_interval
+        self.final_score = final_score
+        self.cause = cause
+        self.map_id = _map_id(level_map)
+        self.tick_rate = tick_rate
+        self.ghost_ai = ghost_ai
+        self.n_ghosts = n_ghosts
+
+    @property
+    def n_ticks(self):
+        return len(self.inputs)
+
+    def to_bytes(self):
+        body = [self.inputs, struct.pack("<I", len(self.keyframes))]
+        for tick, data in self.keyframes:
+            body.append(struct.pack("<I", tick))
+            body.append(KF_LEN.pack(len(data)))
+            body.append(data)
+        header = HEADER.pack(MAGIC, VERSION, MODES.index(self.mode), self.seed & MASK64,
+                             self.tick_rate, self.map_id, self.keyframe_interval,
+                             self.n_ticks, self.final_score, CAUSES.index(self.cause))
+        header += HEADER_V2.pack(GHOST_AI_NAMES.index(self.ghost_ai), self.n_ghosts)
+        return header + zlib.compress(b"".join(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, mode, seed, tick_rate, map_id, interval,
+         n_ticks, final_score, cause) = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Replay dosyası değil")
+        if version not in (1, VERSION):
+            raise ValueError(f"Desteklenmeyen replay sürümü: {version}")
+
+        # Sürüm 1: ek yok, orijinal hayaletler (rastgele, 4 tane)
+        ghost_ai, n_ghosts = "random", len(GHOST_SPAWNS)
+        off = HEADER.size
+        if version >= 2:
+            ai_code, n_ghosts = HEADER_V2.unpack_from(data, off)
+            ghost_ai = GHOST_AI_NAMES[ai_code]
+            off += HEADER_V2.size
+
+        body = zlib.decompress(data[off:])
+        inputs = body[:n_ticks]
+        off = n_ticks
+        (count,) = struct.unpack_from("<I", body, off)
+        off += 4
+        keyframes = []
+        for _ in range(count):
+            (tick,) = struct.unpack_from("<I", body, off)
+            (length,) = KF_LEN.unpack_from(body, off + 4)
+            off += 4 + KF_LEN.size
+            keyframes.append((tick, body[off:off + length]))
+            off += length
+
+        replay = cls(MODES[mode], seed, inputs, keyframes, interval,
+                     final_score, CAUSES[cause], tick_rate=tick_rate,
+                     ghost_ai=ghost_ai, n_ghosts=n_ghosts)
+        replay.map_id = map_id
+        return replay
+
+
+def save(path, replay):
+    #Atomik yazım (yarım kalmış dosya bırakmasın)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(replay.to_bytes())
+    os.replace(tmp, path)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return Replay.from_bytes(f.read())
+
+
+class Recorder:
+    """
+    GameState'e bağlanıp her tick'in yönünü ve periyodik keyframe'leri toplar.
+    Oyunun en başında (tick 0) bağlanmalı.
+    """
+
+    def __init__(self, game, keyframe_interval=KEYFRAME_INTERVAL):
+        if game.ticks != 0:
+            raise ValueError("Recorder oyunun başında bağlanmalı")
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.inputs = bytearray()
+        self.keyframes = []
+        game.recorder = self
+
+    def on_tick(self, game):
+        # game.step() içinden, kontrol kararından hemen sonra çağrılıyor
+        tick = game.ticks
+        if tick % self.keyframe_interval == 0:
+            self.keyframes.append((tick, pack_keyframe(game.snapshot(), len(game.food))))
+        p = game.pacman
+        self.inputs.append(DIR_CODES[(p.next_dir_x, p.next_dir_y)])
+
+    def finish(self):
+        game = self.game
+        game.recorder = None
+        return Replay(game.mode, game.seed, self.inputs, self.keyframes,
+                      self.keyframe_interval, game.pacman.score, game.cause,
+                      level_map=game.level_map, ghost_ai=game.ghost_ai_name,
+                      n_ghosts=len(game.ghosts))
+
+
+class ReplayPlayer:
+    """
+    Kaydı oynatır: step() bir tick ilerletir, seek(tick) istenen tick'e atlar
+    (en yakın önceki keyframe'den en fazla keyframe_interval tick simülasyon).
+    Atlarken olaylar gönderilmiyor (ses vb. susuyor).
+    """
+
+    def __init__(self, replay, pacman_images=None, ghost_sprite=None, level_map=LEVEL_MAP):
+        if _map_id(level_map) != replay.map_id:
+            raise ValueError("Replay başka bir harita ile kaydedilmiş")
+        if replay.tick_rate != TICK_RATE:
+            raise ValueError(f"Replay {replay.tick_rate} Hz ile kaydedilmiş, oyun {TICK_RATE} Hz")
+        self.replay = replay
+        self.game = GameState(replay.mode, level_map=level_map, pacman_images=pacman_images,
+                              ghost_sprite=ghost_sprite, seed=replay.seed,
+                              ghost_ai=replay.ghost_ai, n_ghosts=replay.n_ghosts)
+        self._keyframes = [(tick, unpack_keyframe(data)) for tick, data in replay.keyframes]
+
+    @property
+    def tick(self):
+        return self.game.ticks
+
+    @property
+    def at_end(self):
+        return self.game.game_over or self.game.ticks >= self.replay.n_ticks
+
+    def step(self):
+        #Bir tick oynat, olay listesini döndür
+        if self.at_end:
+            return []
+        return self.game.step(DIRS[self.replay.inputs[self.game.ticks]], TICK_DT)
+
+    def seek(self, tick):
+        tick = max(0, min(tick, self.replay.n_ticks))
+        game = self.game
+
+        # İleri doğru ve keyframe'den daha yakınsa olduğumuz yerden devam et
+        base = None
+        for kf_tick, snap in self._keyframes:
+            if kf_tick <= tick:
+                base = (kf_tick, snap)
+        if base is not None and not (base[0] <= game.ticks <= tick):
+            game.restore(base[1])
+
+        bus = game.bus
+        game.bus = EventBus()
+        try:
+            while game.ticks < tick and not self.at_end:
+                self.step()
+        finally:
+            game.bus = bus
+
+
+def verify(replay, level_map=LEVEL_MAP):
+    #Kaydı baştan sona oynatıp kayıttaki sonuçla aynı mı bakar
+    player = ReplayPlayer(replay, level_map=level_map)
+    while not player.at_end:
+        player.step()
+    game = player.game
+    return (game.ticks == replay.n_ticks and game.pacman.score == replay.final_score
+            and game.cause == replay.cause)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pac-Man replay bilgisi / doğrulama")
+    parser.add_argument("paths", nargs="+", help="replay dosyaları (.pmr)")
+    parser.add_argument("--verify", action="store_true",
+                        help="baştan oynatıp kayıttaki sonuçla karşılaştır")
+    parser.add_argument("--map", metavar="FILE", default=None,
+                        help="kaydın oynandığı harita dosyası (varsayılan klasik harita)")
+    args = parser.parse_args(argv)
+    level_map = load_map(args.map) if args.map else LEVEL_MAP
+
+    failed = 0
+    for path in args.paths:
+        replay = load(path)
+        line = (f"{path}: {replay.mode}, seed={replay.seed}, {replay.n_ticks} tick "
+                f"({replay.n_ticks / replay.tick_rate:.1f} sn), skor={replay.final_score}, "
+                f"bitiş={replay.cause or 'timeout'}, hayalet={replay.ghost_ai}×{replay.n_ghosts}, "
+                f"{len(replay.keyframes)} keyframe, "
+                f"{os.path.getsize(path)} byte")
+        if args.verify:
+            ok = verify(replay, level_map)
+            failed += not ok
+            line += "  OK" if ok else "  UYUŞMUYOR"
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import os
+
+# Oyun başına rastgele sayı üreteci (SplitMix64).
+# Global random modülü yerine her GameState kendi üretecini taşıyor:
+# aynı seed + aynı girdiler → her makinede aynı oyun.
+# Durum tek bir 64-bit int; kopyalamak / kaydetmek bedava.
+
+MASK64 = (1 << 64) - 1
+
+
+def new_seed():
+    #Seed verilmediyse işletim sisteminden rastgele bir tane (sonradan tekrar oynatmak için saklanıyor)
+    return int.from_bytes(os.urandom(8), "little")
+
+
+class GameRng:
+    __slots__ = ("state",)
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = new_seed()
+        self.state = seed & MASK64
+
+    def next_u64(self):
+        self.state = z = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        return z ^ (z >> 31)
+
+    def randbelow(self, n):
+        #[0, n) arası tam sayı (çarp-kaydır, n küçükken sapma ihmal edilebilir)
+        return (self.next_u64() * n) >> 64
+
+    def choice(self, seq):
+        return seq[self.randbelow(len(seq))]
+
+    def random(self):
+        #[0, 1) arası float
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
@@ -0,0 +1,267 @@
+import time
+from itertools import product
+
+from agent import position_utility, agent_choose_direction
+from weights import DEFAULT_WEIGHTS
+from compact import CompactState
+from maze_distance import DIRS
+from pellets import PELLET, POWER, INF
+
+# Süre bütçeli arama agent'ı (expectimax).
+# Model: compact.CompactState (tile seviyesinde, bir ply = Pac-Man'in bir tile'ı).
+# - Pac-Man düğümleri: en iyi yön (max)
+# - Hayalet düğümleri: bu ply'da tile atlayan her hayaletin seçenekleri eşit
+#   olasılıklı (ghost.py'deki random.choice ile aynı), olasılıkların ortalaması
+# - Yaprak: agent.position_utility (utility agent'ın kendi fonksiyonu) +
+#   en yakın yeme doğrusal mesafe cezası + yol boyunca kazanılan skor.
+#   Yem mesafeleri yaprağın kendi bitboard'larından: yolda yenen yem hem skorda
+#   hem de "en yakın yem" olarak iki kere sayılmasın
+# Derinlik 1'den başlayıp süre bitene kadar artıyor (iterative deepening);
+# aynı durumlar transposition table'dan geliyor. Süre dolarsa en son
+# tamamlanan derinliğin kararı kullanılıyor; derinlik 1 süreden bağımsız her
+# zaman tamamlanıyor (yoksa karar rastgele bir legal yön olurdu).
+
+SEARCH_BUDGET_MS = 8.0   # karar başına süre (60 FPS'te 16 ms'lik frame'in yarısı)
+SEARCH_MAX_DEPTH = 12    # en fazla kaç ply ileri bakılsın
+
+SCORE_WEIGHT = 5.0       # aramada kazanılan 1 puanın utility karşılığı
+FOOD_DIST_WEIGHT = 3.0   # yaprakta en yakın yeme her tile için ceza (uzak yemlere sabit eğim)
+DEATH_PENALTY = 2e4
+CLEAR_BONUS = 1e5
+
+# Bütçeden ayrılan pay: saat aşımı fark edildikten sonra aramanın çözülmesi ve
+# tick'in geri kalanı (hayaletler, çarpışma) için. CompactState.from_game ise
+# bütçenin içinde (süre ondan önce başlıyor).
+SEARCH_RESERVE_MS = 1.0
+SEARCH_MIN_BUDGET_MS = 0.25   # pay düşüldükten sonra kalan en kısa arama süresi
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _LeafDistance:
+    #position_utility'nin alan arayüzü (dist(col, row)); yaprak hücresi için hesaplanmış değer
+    __slots__ = ("d",)
+
+    def __init__(self, d):
+        self.d = d
+
+    def dist(self, col, row):
+        return self.d
+
+
+class SearchAgent:
+    """
+    GameState için agent: agent(game) → (dx, dy)
+    budget_ms: karar başına süre sınırı (None / 0 → sadece derinlik sınırı,
+               sonuç makineden bağımsız olur)
+    max_depth: ply cinsinden en fazla derinlik
+    Derinlik ↔ gecikme ayarı bu iki değerle yapılıyor.
+    weights: yaprakta kullanılan utility ağırlıkları (weights.WeightProfile)
+    """
+
+    def __init__(self, budget_ms=SEARCH_BUDGET_MS, max_depth=SEARCH_MAX_DEPTH,
+                 weights=DEFAULT_WEIGHTS):
+        # "Bütçe yok" kararı verilen değere göre; pay düşülünce çok küçük bütçeler
+        # sıfıra inip sınırsız aramaya dönmesin
+        if budget_ms:
+            self.budget = max(budget_ms - SEARCH_RESERVE_MS, SEARCH_MIN_BUDGET_MS) / 1000
+        else:
+            self.budget = None
+        self.max_depth = max_depth
+        self.weights = weights
+
+        # Aynı tile merkezindeki ardışık tick'lerde kararı tekrar kullanmak için
+        self.last_tile = None
+        self.last_tick = None
+        self.last_action = None
+
+        # Son kararın istatistikleri (HUD / benchmark için)
+        self.last_depth = 0
+        self.last_nodes = 0
+        self.last_time = 0.0
+
+    def __call__(self, game):
+        pacman = game.pacman
+        t = pacman.tile_size
+        px = pacman.x + pacman.size / 2
+        py = pacman.y + pacman.size / 2
+        col = int(px // t)
+        row = int((py - pacman.hud_height) // t)
+        cur_dir = (pacman.dir_x, pacman.dir_y)
+
+        # Tile merkezine varmadan yön değiştirmiyoruz (utility agent'la aynı kilit)
+        center_x = col * t + t / 2
+        center_y = pacman.hud_height + row * t + t / 2
+        if ((px - center_x) ** 2 + (py - center_y) ** 2) ** 0.5 > 3 and cur_dir != (0, 0):
+            return cur_dir
+
+        # Aynı tile'ın merkezindeyken (birkaç tick) kararı bir kere veriyoruz
+        if (col, row) == self.last_tile and game.ticks == self.last_tick + 1:
+            self.last_tick = game.ticks
+            return self.last_action
+        self.last_action = self.decide(game)
+        self.last_tile = (col, row)
+        self.last_tick = game.ticks
+        return self.last_action
+
+    def decide(self, game):
+        start = time.perf_counter()
+        root = CompactState.from_game(game)
+        actions = root.legal_actions()
+        if not actions:
+            return (game.pacman.dir_x, game.pacman.dir_y)
+
+        self.board = root.board
+        self.distances = game.distances
+        self.pellet_field = game.pellet_index.field(PELLET)
+        self.power_field = game.pellet_index.field(POWER)
+        self.root_food = (root.pellets, root.powers)
+        self.root_score = root.score
+        deadline = start + self.budget if self.budget is not None else None
+        self.deadline = None   # derinlik 1 süre kontrolü olmadan
+        self.nodes = 0
+        self.tt = {}
+        self.leaf_cache = {}
+
+        best = actions[0]   # sadece ilk derinlikteki sıralama / eşitlik için
+        depth_done = 0
+        if len(actions) > 1:
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    best = self._root(root, depth, actions, best)
+                except _Timeout:
+                    break
+                depth_done = depth
+                self.deadline = deadline
+            if depth_done == 0:
+                best = self._fallback(game, root, actions)
+
+        self.last_depth = depth_done
+        self.last_nodes = self.nodes
+        self.last_time = time.perf_counter() - start
+        return DIRS[best]
+
+    def _fallback(self, game, root, actions):
+        # Hiç derinlik tamamlanmadıysa (max_depth 0): mevcut yön legal ise o,
+        # değilse utility agent'ın seçimi (DIRS sırasındaki ilk yön geri dönüş olabilir)
+        if root.pac_dir in actions:
+            return root.pac_dir
+        choice = agent_choose_direction(game.pacman, game.ghosts, game.distances, self.weights)
+        if choice in DIRS and DIRS.index(choice) in actions:
+            return DIRS.index(choice)
+        return actions[0]
+
+    def _tick(self):
+        self.nodes += 1
+        self._check_time()
+
+    def _check_time(self):
+        # Saate her düğümde bakılıyor (perf_counter bir düğümün maliyetinin yanında önemsiz)
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _Timeout()
+
+    def _root(self, state, depth, actions, prev_best):
+        # Önceki derinliğin en iyisi önce (eşitlikte o kalsın)
+        ordered = [prev_best] + [a for a in actions if a != prev_best]
+        best, best_val = prev_best, None
+        for a in ordered:
+            v = self._chance(state, a, depth)
+            if best_val is None or v > best_val:
+                best, best_val = a, v
+        return best
+
+    def _max(self, state, depth):
+        # Tüm değerler "durum değeri + SCORE_WEIGHT * yolda kazanılan skor" biçiminde
+        self._tick()
+        gained = SCORE_WEIGHT * (state.score - self.root_score)
+        if state.dead or self._caught(state):
+            return gained - DEATH_PENALTY
+        if not (state.pellets | state.powers):
+            return gained + CLEAR_BONUS
+        if depth == 0:
+            return gained + self._evaluate(state)
+
+        # key() skoru içermiyor; tabloda yoldan bağımsız kısım tutuluyor
+        key = (state.key(), depth)
+        v = self.tt.get(key)
+        if v is not None:
+            return v + gained
+
+        best = None
+        for a in state.legal_actions():
+            v = self._chance(state, a, depth)
+            if best is None or v > best:
+                best = v
+        self.tt[key] = best - gained
+        return best
+
+    def _chance(self, state, action, depth):
+        # Sadece ufuk içinde Pac-Man'e yetişebilecek hayaletleri dallandır
+        b = self.board
+        pc, pr = b.col_row(state.pac)
+        reach = 2 * depth + 1
+        choices = []
+        for i, (cell, _, _, _) in enumerate(state.ghosts):
+            opts = state.ghost_options(i)
+            if len(opts) > 1:
+                gc, gr = b.col_row(cell)
+                if abs(gc - pc) + abs(gr - pr) <= reach:
+                    choices.append(opts)
+                    continue
+            choices.append((None,))
+
+        total = 0.0
+        n = 0
+        for combo in product(*choices):
+            # Çok hayaletli bir şans düğümünün kombinasyonları da bütçeyi aşmasın
+            if n:
+                self._check_time()
+            undo = state.apply(action, combo)
+            total += self._max(state, depth - 1)
+            state.undo(undo)
+            n += 1
+        return total / n
+
+    def _caught(self, state):
+        # Model tile seviyesinde, oyunda çarpışma piksel kutularıyla: normal bir hayalet
+        # bitişik tile'daysa da yakalanmış sayıyoruz (temkinli taraf)
+        pac = state.pac
+        nbrs = self.board.step[pac]
+        for cell, _, frightened, _ in state.ghosts:
+            if not frightened and (cell == pac or cell in nbrs):
+                return True
+        return False
+
+    def _evaluate(self, state):
+        #Yaprak: utility agent'ın tile faydası (aynı durum tekrar gelirse cache'ten)
+        key = state.key()
+        util = self.leaf_cache.get(key)
+        if util is None:
+            b = self.board
+            col, row = b.col_row(state.pac)
+            ghost_tiles = [b.col_row(cell) + (frightened,)
+                           for cell, _, frightened, _ in state.ghosts]
+            eaten_bonus = 0.0
+            if (state.pellets, state.powers) == self.root_food:
+                # Yolda bir şey yenmedi → kökteki O(1) alanlar geçerli
+                pellet_field, power_field = self.pellet_field, self.power_field
+            else:
+                pellet_d, power_d = b.food_distances(state.pac, state.pellets, state.powers)
+                pellet_field, power_field = _LeafDistance(pellet_d), _LeafDistance(power_d)
+                # Yenen yemin kendi utility terimi (w / mesafe) yaprakta kayboluyor ve en yakın
+                # yem uzaklaşıyor; yemeyi cezalandırmasın diye her yenen yeme bir kere mesafe-1 değeri
+                root_pellets, root_powers = self.root_food
+                w = self.weights
+                eaten_bonus = (w.pellet * bin(root_pellets & ~state.pellets).count("1")
+                               + w.power * bin(root_powers & ~state.powers).count("1"))
+            util = eaten_bonus + position_utility(col, row, ghost_tiles, state.power_left > 0,
+                                                  pellet_field, power_field, self.distances,
+                                                  self.weights)
+            # utility'nin 55/d terimi uzakta neredeyse düz; son yemler için doğrusal eğim
+            food = min(pellet_field.dist(col, row), power_field.dist(col, row))
+            if food != INF:
+                util -= FOOD_DIST_WEIGHT * food
+            self.leaf_cache[key] = util
+        return util
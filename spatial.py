@@ -0,0 +1,152 @@
+# Varlıklar (hayaletler) için tek tip grid indeksi (spatial hash).
+# Harita bucket x bucket tile'lık kovalara bölünüyor; her varlık merkezinin
+# düştüğü kovada duruyor ve hareket ettikçe move() ile güncelleniyor (kova
+# değişmediyse hiçbir şey yapılmıyor). Sorgular sadece ilgili kovalara
+# bakıyor, yani maliyet toplam varlık sayısıyla değil komşulukla büyüyor:
+#   within(col, row, k)     → k tile (Manhattan) içindekiler
+#   overlapping(x, y, w, h) → çarpışma kutusu kesişenler (pygame.Rect.colliderect kuralı)
+#   rings(col, row)         → yakından uzağa kova halkaları (en yakın arama için)
+# Sonuçlar handle (insert sırası) olarak dönüyor; hayaletlerde handle = listedeki indeks.
+
+BUCKET = 4   # kova kenarı (tile)
+
+
+class SpatialHash:
+    """
+    insert(entity) → handle; entity'nin x, y (sol üst, piksel) ve size alanları olmalı.
+    move(handle) her konum değişikliğinden sonra; version her tile değişiminde artar.
+    """
+
+    def __init__(self, width, height, tile_size, top=0, bucket=BUCKET):
+        self.tile_size = tile_size
+        self.top = top
+        self.bucket = bucket
+        self.bucket_cols = (width + bucket - 1) // bucket
+        self.bucket_rows = (height + bucket - 1) // bucket
+
+        self.entities = []   # handle → entity
+        self.tiles = []      # handle → merkezin tile'ı (col, row)
+        self.keys = []       # handle → kova (bx, by)
+        self.buckets = {}    # (bx, by) → handle set'i
+        self.version = 0
+
+    def __len__(self):
+        return len(self.entities)
+
+    def tile_of(self, entity):
+        #Merkezin tile'ı (agent'ın hayalet tile hesabıyla aynı)
+        half = entity.size / 2
+        t = self.tile_size
+        return int((entity.x + half) // t), int((entity.y + half - self.top) // t)
+
+    def _key(self, col, row):
+        # Harita dışındakiler kenar kovasına (mesafe alt sınırları yine geçerli)
+        b = self.bucket
+        bx = min(max(col // b, 0), self.bucket_cols - 1)
+        by = min(max(row // b, 0), self.bucket_rows - 1)
+        return bx, by
+
+    def insert(self, entity):
+        handle = len(self.entities)
+        tile = self.tile_of(entity)
+        key = self._key(*tile)
+        self.entities.append(entity)
+        self.tiles.append(tile)
+        self.keys.append(key)
+        self.buckets.setdefault(key, set()).add(handle)
+        self.version += 1
+        return handle
+
+    def move(self, handle):
+        tile = self.tile_of(self.entities[handle])
+        if tile == self.tiles[handle]:
+            return
+        self.tiles[handle] = tile
+        self.version += 1
+        key = self._key(*tile)
+        old = self.keys[handle]
+        if key != old:
+            self.buckets[old].discard(handle)
+            self.buckets.setdefault(key, set()).add(handle)
+            self.keys[handle] = key
+
+    def move_all(self):
+        for handle in range(len(self.entities)):
+            self.move(handle)
+
+    # Sorgular
+    def _collect(self, bx0, by0, bx1, by1):
+        buckets = self.buckets
+        out = []
+        for by in range(max(by0, 0), min(by1, self.bucket_rows - 1) + 1):
+            for bx in range(max(bx0, 0), min(bx1, self.bucket_cols - 1) + 1):
+                handles = buckets.get((bx, by))
+                if handles:
+                    out.extend(handles)
+        return out
+
+    def within(self, col, row, k):
+        #Merkez tile'ı (col, row)'a Manhattan mesafesi <= k olan handle'lar (sıralı)
+        b = self.bucket
+        tiles = self.tiles
+        found = [h for h in self._collect((col - k) // b, (row - k) // b,
+                                          (col + k) // b, (row + k) // b)
+                 if abs(tiles[h][0] - col) + abs(tiles[h][1] - row) <= k]
+        found.sort()
+        return found
+
+    def overlapping(self, x, y, w, h):
+        """
+        Kutusu (x, y, w, h) ile kesişen handle'lar (sıralı).
+        pygame.Rect gibi: koordinatlar int'e kesiliyor, kenar teması sayılmıyor.
+        Varlıklar bir tile'dan küçük: merkezleri kutunun 1 tile yakınındaki kovalarda.
+        """
+        t = self.tile_size
+        b = self.bucket
+        ix, iy = int(x), int(y)
+        c0 = (ix - t) // t
+        c1 = (ix + w + t) // t
+        r0 = (iy - self.top - t) // t
+        r1 = (iy - self.top + h + t) // t
+        entities = self.entities
+        found = []
+        for handle in self._collect(c0 // b, r0 // b, c1 // b, r1 // b):
+            e = entities[handle]
+            ex, ey, s = int(e.x), int(e.y), e.size
+            if ix < ex + s and ex < ix + w and iy < ey + s and ey < iy + h:
+                found.append(handle)
+        found.sort()
+        return found
+
+    def rings(self, col, row):
+        """
+        (alt sınır, handle'lar) çiftleri, yakın kovalardan uzağa halka halka.
+        j. halkadaki her varlığın merkezi (col, row)'dan en az alt sınır tile
+        (Manhattan, dolayısıyla labirent mesafesi de) uzakta; en yakın arama
+        alt sınır bulunan en iyi mesafeyi geçince durabilir.
+        """
+        b = self.bucket
+        cols, rows = self.bucket_cols, self.bucket_rows
+        bx, by = self._key(col, row)
+        last = max(bx, cols - 1 - bx, by, rows - 1 - by)
+        buckets = self.buckets
+        yield 0, list(buckets.get((bx, by), ()))
+        for j in range(1, last + 1):
+            # Halkanın harita içindeki kısmı: üst / alt satır, sol / sağ sütun
+            x0, x1 = max(bx - j, 0), min(bx + j, cols - 1)
+            y0, y1 = max(by - j + 1, 0), min(by + j - 1, rows - 1)
+            cells = []
+            if by - j >= 0:
+                cells += [(x, by - j) for x in range(x0, x1 + 1)]
+            if by + j < rows:
+                cells += [(x, by + j) for x in range(x0, x1 + 1)]
+            if bx - j >= 0:
+                cells += [(bx - j, y) for y in range(y0, y1 + 1)]
+            if bx + j < cols:
+                cells += [(bx + j, y) for y in range(y0, y1 + 1)]
+            handles = []
+            for key in cells:
+                found = buckets.get(key)
+                if found:
+                    handles.extend(found)
+            yield (j - 1) * b + 1, handles
@@ -0,0 +1,29 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import GameState, TICK_DT
+from search_agent import SearchAgent, SEARCH_MAX_DEPTH
+
+
+def test_tiny_budget_returns_within_a_frame():
+    # 1 ms'lik bütçe sınırsız aramaya dönmemeli (60 FPS'te bir frame 16 ms)
+    game = GameState("agent", seed=0)
+    for _ in range(120):
+        game.step(None, TICK_DT)
+    agent = SearchAgent(budget_ms=1, max_depth=SEARCH_MAX_DEPTH)
+    agent.decide(game)   # ilk çağrı: alanlar / tablolar ısınsın
+
+    times = []
+    for _ in range(20):
+        start = time.perf_counter()
+        agent.decide(game)
+        times.append(time.perf_counter() - start)
+    assert agent.budget is not None and agent.budget > 0
+    times.sort()
+    assert times[len(times) // 2] < 0.008
+    assert agent.last_depth < SEARCH_MAX_DEPTH
@@ -0,0 +1,54 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from weights import WeightProfile, DEFAULT_WEIGHTS, PROFILE_VERSION
+
+
+def write(tmp_path, data, name="profile.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_v1_profile_is_converted_on_load(tmp_path):
+    # Sürüm 1 (version anahtarı yok): loop_history frame sayıyordu, 12 frame = 1 tile
+    path = write(tmp_path, {"loop_history": 60, "pellet": 80.0})
+    profile = WeightProfile.load(path)
+    assert profile.loop_history == 5
+    assert profile.pellet == 80.0
+
+
+def test_v1_optimizer_output_is_converted_on_load(tmp_path):
+    # optimize.py'nin eski çıktısı: {"weights": {...}, "fitness": ...}
+    path = write(tmp_path, {"weights": {"loop_history": 20}, "fitness": 1234.5})
+    assert WeightProfile.load(path).loop_history == 2
+
+
+def test_v1_conversion_is_clamped_to_bounds(tmp_path):
+    assert WeightProfile.load(write(tmp_path, {"loop_history": 2})).loop_history == 1
+
+
+def test_current_profile_round_trips(tmp_path):
+    path = str(tmp_path / "saved.json")
+    profile = WeightProfile(loop_history=7, danger=3000.0)
+    profile.save(path)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["version"] == PROFILE_VERSION
+    assert WeightProfile.load(path) == profile
+    DEFAULT_WEIGHTS.save(path)
+    assert WeightProfile.load(path) == DEFAULT_WEIGHTS
+
+
+@pytest.mark.parametrize("data", [
+    {"version": PROFILE_VERSION, "loop_history": 45},
+    {"version": PROFILE_VERSION, "weights": {"pellet": -5.0}},
+    {"version": PROFILE_VERSION + 1, "pellet": 80.0},
+])
+def test_invalid_profiles_are_rejected(tmp_path, data):
+    with pytest.raises(ValueError):
+        WeightProfile.load(write(tmp_path, data))
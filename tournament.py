@@ -0,0 +1,218 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game import GameState, TICK_DT, AGENT_NAMES, GHOST_AI_NAMES, LEVEL_MAP, make_agent
+from maps import load_map
+from weights import WeightProfile
+import replay
+
+# Ekransız turnuva modu:
+# binlerce seed'li agent oyununu tüm çekirdeklere dağıtıp sonuçları
+# satır satır (JSONL) diske yazıyor ve sonunda istatistik çıkarıyoruz.
+# Kullanım:
+#   python tournament.py --games 2000 --out sonuc.jsonl
+#   python tournament.py --games 2000 --baseline eski_sonuc.jsonl
+
+MAX_GAME_TIME = 600.0    # bir oyunun en fazla süresi (simülasyon saniyesi)
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+def play_game(seed, max_time=MAX_GAME_TIME, replay_dir=None, agent="utility",
+              search_ms=None, search_depth=None, weights=None, ghost_ai="random",
+              n_ghosts=None, level_map=LEVEL_MAP):
+    """
+    Tek bir agent oyununu ekransız oynatır ve sonucunu sözlük olarak döndürür.
+    Seed oyunun kendi üretecine gidiyor; aynı seed her makinede aynı sonucu veriyor.
+    replay_dir verilirse oyunun replay'i <replay_dir>/<seed>.pmr olarak kaydediliyor.
+    agent / search_ms / search_depth / weights: game.make_agent parametreleri.
+    ghost_ai / n_ghosts / level_map: GameState parametreleri (zorluk, harita).
+    """
+    game = GameState("agent", seed=seed,
+                     agent=make_agent(agent, search_ms, search_depth, weights),
+                     ghost_ai=ghost_ai, n_ghosts=n_ghosts, level_map=level_map)
+    recorder = replay.Recorder(game) if replay_dir else None
+
+    while not game.game_over and game.elapsed < max_time:
+        game.step(None, TICK_DT)
+
+    if recorder is not None:
+        replay.save(os.path.join(replay_dir, f"{seed}.pmr"), recorder.finish())
+
+    return {
+        "seed": seed,
+        "score": game.pacman.score,
+        "survival_time": round(game.elapsed, 3),
+        "pellets_left": game.pellets_left(),
+        "ghosts_eaten": game.ghosts_eaten,
+        "cause": game.cause or "timeout",
+    }
+
+
+def run_tournament(seeds, workers=None, max_time=MAX_GAME_TIME, on_result=None,
+                   replay_dir=None, agent="utility", search_ms=None, search_depth=None,
+                   weights=None, ghost_ai="random", n_ghosts=None, level_map=LEVEL_MAP):
+    """
+    Seed listesini ProcessPoolExecutor ile paralel oynatır (varsayılan: çekirdek başına 1 worker).
+    Her oyun bittiğinde sonucu on_result'a verir, tüm sonuçları liste olarak döndürür.
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(play_game, seed, max_time, replay_dir, agent,
+                               search_ms, search_depth, weights, ghost_ai, n_ghosts, level_map)
+                   for seed in seeds]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            if on_result is not None:
+                on_result(res)
+    return results
+
+
+def percentile(sorted_values, p):
+    #Sıralı listede p. yüzdelik (lineer interpolasyon)
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(results, baseline=None):
+    """
+    Sonuç listesinden ortalama / yüzdelik istatistikleri hesaplar.
+    baseline verilirse (seed → sonuç) aynı seed'lerde skorları karşılaştırıp
+    kazanma oranını da ekler.
+    """
+    summary = {"games": len(results)}
+
+    for key in ("score", "survival_time", "pellets_left", "ghosts_eaten"):
+        values = sorted(r[key] for r in results)
+        summary[key] = {
+            "mean": sum(values) / len(values) if values else None,
+            **{f"p{p}": percentile(values, p) for p in PERCENTILES},
+        }
+
+    causes = {}
+    for r in results:
+        causes[r["cause"]] = causes.get(r["cause"], 0) + 1
+    summary["causes"] = causes
+
+    if baseline:
+        wins = ties = losses = 0
+        for r in results:
+            base = baseline.get(r["seed"])
+            if base is None:
+                continue
+            if r["score"] > base["score"]:
+                wins += 1
+            elif r["score"] < base["score"]:
+                losses += 1
+            else:
+                ties += 1
+        compared = wins + ties + losses
+        summary["vs_baseline"] = {
+            "compared": compared,
+            "wins": wins,
+            "ties": ties,
+            "losses": losses,
+            # Beraberlikleri yarım galibiyet sayıyoruz
+            "win_rate": (wins + 0.5 * ties) / compared if compared else None,
+        }
+
+    return summary
+
+
+def load_results(path):
+    #JSONL sonuç dosyasını seed → sonuç sözlüğü olarak okur.
+    results = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                r = json.loads(line)
+                results[r["seed"]] = r
+    return results
+
+
+def print_summary(summary):
+    print(f"\nOyun sayısı: {summary['games']}")
+    for key in ("score", "survival_time", "pellets_left", "ghosts_eaten"):
+        s = summary[key]
+        pcts = "  ".join(f"p{p}={s[f'p{p}']:.1f}" for p in PERCENTILES)
+        print(f"{key:>14}: ort={s['mean']:.2f}  {pcts}")
+    print("   Bitiş nedeni:", ", ".join(f"{k}={v}" for k, v in sorted(summary["causes"].items())))
+
+    vs = summary.get("vs_baseline")
+    if vs:
+        rate = "-" if vs["win_rate"] is None else f"{vs['win_rate'] * 100:.1f}%"
+        print(f"Baseline'a karşı: {vs['wins']}G / {vs['ties']}B / {vs['losses']}M "
+              f"({vs['compared']} oyun) → kazanma oranı {rate}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekransız agent turnuvası")
+    parser.add_argument("--games", type=int, default=1000, help="oynanacak oyun sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="ilk seed (seed'ler ardışık)")
+    parser.add_argument("--workers", type=int, default=None, help="worker sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--max-time", type=float, default=MAX_GAME_TIME,
+                        help="oyun başına en fazla simülasyon süresi (sn)")
+    parser.add_argument("--out", default="tournament_results.jsonl", help="oyun sonuçlarının yazılacağı JSONL")
+    parser.add_argument("--summary", default=None, help="özet istatistiklerin yazılacağı JSON")
+    parser.add_argument("--baseline", default=None, help="karşılaştırılacak önceki JSONL sonuç dosyası")
+    parser.add_argument("--replays", metavar="DIR", default=None,
+                        help="her oyunun replay'ini DIR/<seed>.pmr olarak kaydet")
+    parser.add_argument("--agent", choices=AGENT_NAMES, default="utility", help="oynayacak agent")
+    parser.add_argument("--search-ms", type=float, default=None,
+                        help="search agent: karar başına süre (ms); 0 → sadece derinlik, sonuç makineden bağımsız")
+    parser.add_argument("--search-depth", type=int, default=None,
+                        help="search agent: en fazla derinlik (ply)")
+    parser.add_argument("--weights", metavar="FILE", default=None,
+                        help="agent ağırlık profili (JSON, optimize.py çıktısı)")
+    parser.add_argument("--ghost-ai", choices=GHOST_AI_NAMES, default="random",
+                        help="hayalet davranışı: random (orijinal) / classic (hedefli, daha zor)")
+    parser.add_argument("--ghosts", type=int, default=None,
+                        help="hayalet sayısı (varsayılan: haritadaki başlangıç sayısı)")
+    parser.add_argument("--map", metavar="FILE", default=None,
+                        help="harita dosyası (.txt / .json, bkz. maps.py); varsayılan klasik harita")
+    args = parser.parse_args(argv)
+    if args.replays:
+        os.makedirs(args.replays, exist_ok=True)
+
+    weights = WeightProfile.load(args.weights) if args.weights else None
+    level_map = load_map(args.map) if args.map else LEVEL_MAP
+    baseline = load_results(args.baseline) if args.baseline else None
+    seeds = range(args.seed, args.seed + args.games)
+
+    start = time.perf_counter()
+    done = [0]
+    with open(args.out, "w", encoding="utf-8") as out:
+        def on_result(res):
+            # Sonuçları geldikçe yaz; gece boyu süren koşuda yarıda kalsa bile veri kaybolmasın
+            out.write(json.dumps(res) + "\n")
+            out.flush()
+            done[0] += 1
+            if done[0] % 50 == 0 or done[0] == args.games:
+                rate = done[0] / (time.perf_counter() - start)
+                print(f"\r{done[0]}/{args.games} oyun ({rate:.1f} oyun/sn)", end="", file=sys.stderr)
+
+        results = run_tournament(seeds, args.workers, args.max_time, on_result, args.replays,
+                                 args.agent, args.search_ms, args.search_depth, weights,
+                                 args.ghost_ai, args.ghosts, level_map)
+    print(file=sys.stderr)
+
+    summary = summarize(results, baseline)
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
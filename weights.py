@@ -0,0 +1,110 @@
+import json
+
+# Utility agent'ın ağırlıkları.
+# Eskiden agent.py'de sabit sayılardı; artık bir profil nesnesinde duruyor,
+# JSON olarak kaydedilip yüklenebiliyor ve optimize.py ile ayarlanabiliyor.
+# Varsayılan değerler elle ayarlanmış orijinal sabitler.
+
+# isim: (varsayılan, optimizer alt sınırı, üst sınır)
+PARAMS = {
+    # Normal modda hayaletten kaçış
+    "danger_radius":       (10,     3,     20),     # bu mesafeden yakın hayalet → büyük ceza
+    "danger":              (2600.0, 200.0, 8000.0),  # ceza: danger / (mesafe + 0.1)
+    "ghost_distance":      (1.2,    0.0,   10.0),    # hayaletten uzak olmanın genel faydası (tile başına)
+    # Power modda
+    "fright_radius":       (4,      1,     12),      # bu mesafedeki frightened hayalet → bonus
+    "fright":              (550.0,  0.0,   3000.0),  # bonus: fright / (mesafe + 0.1)
+    "power_danger_radius": (3,      1,     10),
+    "power_danger":        (600.0,  0.0,   4000.0),
+    # Yemler
+    "pellet":              (55.0,   1.0,   400.0),   # en yakın pellet: pellet / mesafe
+    "pellet_power_mode":   (45.0,   1.0,   400.0),
+    "power":               (350.0,  0.0,   2000.0),  # en yakın power pellet: power / mesafe
+    "power_power_mode":    (10.0,   0.0,   500.0),
+    # Yön seçimi ekstraları
+    "lookahead_steps":     (6,      1,     15),      # koridorda kaç tile ileri yem sayılıyor
+    "empty_corridor":      (90.0,   0.0,   500.0),   # ileride hiç yem yoksa ceza
+    "same_dir":            (5.0,    0.0,   100.0),   # aynı yönde devam bonusu
+    "loop":                (200.0,  0.0,   1000.0),  # son gidilen tile'lara dönme cezası
+    "loop_history":        (3,      1,     30),      # kaç tile geriye bakılıyor (girilen son tile'lar)
+}
+
+# Tam sayı olması gereken parametreler (mesafe / adım sayıları)
+INT_PARAMS = {"danger_radius", "fright_radius", "power_danger_radius",
+              "lookahead_steps", "loop_history"}
+
+# Profil dosyası sürümü ("version" anahtarı; yoksa 1).
+# 1: loop_history agent çağrısı (frame) sayıyordu (varsayılan 20, sınırlar 2..60)
+# 2: loop_history girilen tile sayısı
+# Pac-Man 120 px/sn → 60 Hz'de frame başına 2 px; 24 px'lik tile = 12 frame
+PROFILE_VERSION = 2
+V1_CALLS_PER_TILE = 24 / 2
+
+
+def upgrade(data, version):
+    #Eski sürüm ağırlıklarını güncel anlamlarına çevirir (yeni dict)
+    if version > PROFILE_VERSION:
+        raise ValueError(f"Profil sürümü {version} bu koddan yeni (en fazla {PROFILE_VERSION})")
+    data = dict(data)
+    if version < 2 and "loop_history" in data:
+        _, low, high = PARAMS["loop_history"]
+        tiles = round(data["loop_history"] / V1_CALLS_PER_TILE)
+        data["loop_history"] = min(max(tiles, low), high)
+    return data
+
+
+class WeightProfile:
+    """
+    WeightProfile()            → orijinal sabitler
+    WeightProfile(pellet=80.0) → tek tek değiştirilmiş
+    load(path) / save(path)    → JSON (PROFILE_VERSION'lı; eski sürümler çevriliyor)
+    from_dict(data)            → değerler PARAMS sınırları dışındaysa ValueError
+    """
+
+    __slots__ = tuple(PARAMS)
+
+    def __init__(self, **values):
+        unknown = set(values) - set(PARAMS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen ağırlık: {', '.join(sorted(unknown))}")
+        for name, (default, _, _) in PARAMS.items():
+            value = values.get(name, default)
+            setattr(self, name, int(round(value)) if name in INT_PARAMS else float(value))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in PARAMS}
+
+    @classmethod
+    def from_dict(cls, data):
+        # Dosyadan gelen değerler optimizer'ın aralığında olmalı (anlamı değişmiş
+        # ya da elle bozulmuş bir profil sessizce kullanılmasın)
+        for name, value in data.items():
+            if name in PARAMS:
+                _, low, high = PARAMS[name]
+                if not low <= value <= high:
+                    raise ValueError(f"Ağırlık sınır dışında: {name}={value} ({low}..{high})")
+        return cls(**data)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": PROFILE_VERSION, **self.to_dict()}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        version = data.get("version", 1)
+        # optimize.py çıktısı {"version": ..., "weights": {...}, ...} biçiminde de olabilir
+        weights = data.get("weights", data)
+        weights = {k: v for k, v in weights.items() if k != "version"}
+        return cls.from_dict(upgrade(weights, version))
+
+    def __eq__(self, other):
+        return isinstance(other, WeightProfile) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        changed = {k: v for k, v in self.to_dict().items() if v != PARAMS[k][0]}
+        return f"WeightProfile({', '.join(f'{k}={v!r}' for k, v in changed.items())})"
+
+
+DEFAULT_WEIGHTS = WeightProfile()